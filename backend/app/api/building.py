@@ -1,8 +1,13 @@
 # app/api/building.py
+import json
+import logging
 from fastapi import APIRouter, HTTPException, Query
-from app.services.building_service import fetch_nearby_buildings
+from fastapi.responses import StreamingResponse
+from app.services.building_service import fetch_nearby_buildings, stream_nearby_buildings, get_cache_stats
 from app.services import naver_api # 디버깅용 테스트를 위해 필요
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/building", tags=["building"])
 
 @router.get("/nearby-buildings")
@@ -17,9 +22,54 @@ async def get_nearby_buildings(latitude: float, longitude: float):
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         # 로그 남기기 권장
-        print(f"Error in get_nearby_buildings: {e}")
+        logger.exception("Error in get_nearby_buildings: %s", e)
         raise HTTPException(status_code=500, detail="서버 내부 오류 발생")
     
+@router.get("/nearby-buildings/stream")
+async def get_nearby_buildings_stream(
+    latitude: float,
+    longitude: float,
+    format: str = Query("ndjson", pattern="^(ndjson|sse)$", description="ndjson 또는 sse(Server-Sent Events)")
+):
+    """
+    nearby-buildings의 스트리밍 버전
+    카테고리 검색이 끝나는 대로 건물 결과를 한 줄(이벤트)씩 보내고, 마지막에 전체 요약(summary)을 보냅니다.
+    """
+    events = stream_nearby_buildings(latitude, longitude)
+    try:
+        # 주소 확인까지는 응답 시작 전에 수행 (실패 시 404)
+        first_event = await events.__anext__()
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.exception("Error in get_nearby_buildings_stream: %s", e)
+        raise HTTPException(status_code=500, detail="서버 내부 오류 발생")
+
+    def encode(event: dict) -> str:
+        data = json.dumps(event, ensure_ascii=False)
+        if format == "sse":
+            return f"event: {event['event']}\ndata: {data}\n\n"
+        return data + "\n"
+
+    async def body():
+        yield encode(first_event)
+        try:
+            async for event in events:
+                yield encode(event)
+        except Exception as e:
+            logger.exception("Error in get_nearby_buildings_stream: %s", e)
+            yield encode({"event": "error", "detail": "서버 내부 오류 발생"})
+
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(body(), media_type=media_type, headers={"Cache-Control": "no-cache"})
+
+@router.get("/cache-stats")
+async def get_nearby_cache_stats():
+    """
+    [모니터링] 역지오코딩 / 카테고리 검색 캐시의 적중/미스 통계를 반환합니다.
+    """
+    return get_cache_stats()
+
 @router.get("/test/gangnam")
 async def test_gangnam_nearby_buildings():
     """
@@ -29,7 +79,7 @@ async def test_gangnam_nearby_buildings():
     test_lat = 37.498095
     test_lon = 127.027610
     
-    print(f"🧪 테스트 실행: 강남역 인근 (Lat: {test_lat}, Lon: {test_lon})")
+    logger.info("🧪 테스트 실행: 강남역 인근 (Lat: %s, Lon: %s)", test_lat, test_lon)
     return await get_nearby_buildings(test_lat, test_lon)
 
 # --- [디버깅용] Search API 독립 테스트 ---
@@ -38,6 +88,6 @@ async def test_search_api_only(keyword: str = Query(..., description="검색할
     """
     [디버깅용] 다른 로직 없이 오직 네이버 검색 API만 테스트합니다.
     """
-    print(f"[DEBUG] 🧪 독립 검색 테스트 요청: Keyword='{keyword}'")
+    logger.debug("🧪 독립 검색 테스트 요청: Keyword='%s'", keyword)
     results = await naver_api.search_places(keyword)
     return {"keyword": keyword, "count": len(results), "results": results}
\ No newline at end of file
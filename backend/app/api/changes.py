@@ -0,0 +1,34 @@
+# app/api/changes.py
+import logging
+from fastapi import APIRouter, HTTPException, Query, Response, status
+
+from app.core.config import settings
+from app.services import change_service
+from app.utils import streaming
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["changes"])
+
+@router.get("/changes")
+async def get_changes(
+    since: int = Query(0, ge=0, description="마지막으로 받은 revision (0이면 전체)"),
+    datasets: str = Query("zones,addresses", description="zones, addresses 중 쉼표로 구분"),
+    limit: int = Query(settings.CHANGES_PAGE_SIZE, ge=1, le=settings.CHANGES_PAGE_SIZE, description="데이터셋별 최대 행 수"),
+):
+    """
+    since 이후 제한 구역(zones) / 소매점(addresses)의 추가·수정·삭제 내역
+    - 응답의 revision을 다음 요청의 since로 사용 (has_more=true면 바로 이어서 요청)
+    - reset=true면 since가 너무 오래되어 전체를 다시 보낸 것이므로 로컬 데이터를 버리고 새로 받은 내용으로 교체
+    """
+    names = [name.strip() for name in datasets.split(",") if name.strip()]
+    unknown = [name for name in names if name not in change_service.DATASETS]
+    if not names or unknown:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"datasets는 {', '.join(change_service.DATASETS)} 중에서 선택하세요: {unknown}")
+    try:
+        changes = await change_service.get_changes(since, list(dict.fromkeys(names)), limit)
+    except Exception as e:
+        logger.exception("Error in get_changes: %s", e)
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="변경 내역을 조회할 수 없습니다.")
+    return Response(content=streaming.dumps(changes), media_type="application/json")
@@ -1,51 +1,159 @@
 # app/api/coordinates.py
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy import text
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import asyncio
-import json
+import logging
 
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_db, stream_partitions
+from app.utils import streaming, http_cache
+from app.utils.points import parse_points, parse_bbox, read_points_body, too_many_points
 from app.services.naver_api import get_coordinates_from_address
+from app.services import geocode_cache, db_service, zone_index, coverage_service, eligibility_service, dataset_version
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["coordinates"])
 sub_router = APIRouter(prefix="/getcoordinates")
 
+FORMAT_QUERY = Query(None, pattern="^(json|ndjson)$", description="응답 형식 (json: JSON 배열, ndjson: 한 줄에 한 항목), 생략 시 Accept 헤더")
+
+async def _empty():
+    return
+    yield
+
+async def _address_point_segments(fmt: str):
+    # x, y가 -1.0(유효하지 않음)이 아닌 데이터만 조회
+    query = text("SELECT x, y FROM address WHERE x != -1 AND y != -1")
+    async for partition in stream_partitions(query):
+        # 결과 변환 (경도: x, 위도: y)
+        yield streaming.join_items([{"x": row[0], "y": row[1]} for row in partition], fmt)
+
 @sub_router.get("/toORS")
-async def get_coordinates_to_ORS(db: Session = Depends(get_db)):
+async def get_coordinates_to_ORS(request: Request, format: str | None = FORMAT_QUERY):
     """
     DB에서 유효한(변환된) WGS84 좌표(x:경도, y:위도) 목록을 조회하여 반환합니다.
     OpenRouteService 등 외부 API 활용을 위한 데이터 추출용입니다.
+    - 서버 측 커서로 읽은 행을 바로 JSON 배열(또는 NDJSON)로 스트리밍합니다.
+    - 소매점 데이터 버전으로 ETag를 붙이고, 같은 버전의 응답은 메모리 캐시/304로 처리합니다.
     """
+    fmt = streaming.negotiate_format(request, format)
+    etag = dataset_version.etag(dataset_version.ADDRESSES, "toORS", fmt)
+    cached = http_cache.lookup(request, etag, fmt)
+    if cached is not None:
+        return cached
+
     try:
-        # x, y가 -1.0(유효하지 않음)이 아닌 데이터만 조회
-        query = text("SELECT x, y FROM address WHERE x != -1 AND y != -1")
-        # 동기 DB 실행을 비동기로 감쌈
-        rows = await asyncio.to_thread(lambda: db.execute(query).fetchall())
-        
-        # 결과 변환 (경도: x, 위도: y)
-        results = [{"x": row[0], "y": row[1]} for row in rows]
-        return results
+        segments = await streaming.prefetch(_address_point_segments(fmt))
     except Exception as e:
-        print(f"Error in get_coordinates_to_ORS: {e}")
-        # 에러 발생 시 빈 리스트 반환 또는 HTTPException 발생 고려
-        return []
+        logger.exception("Error in get_coordinates_to_ORS: %s", e)
+        # 에러 발생 시 빈 리스트 반환 (캐시하지 않음)
+        return streaming.streaming_response(request, streaming.frame(_empty(), fmt), fmt)
+    return http_cache.caching_response(request, etag, fmt, streaming.frame(segments, fmt))
+
+async def _index_polygon_segments(ids, polygons, fmt: str):
+    size = settings.STREAM_FETCH_ROWS
+    for start in range(0, len(polygons), size):
+        items = [{"id": zone_id, "parts": parts}
+                 for zone_id, parts in zip(ids[start:start + size], polygons[start:start + size])]
+        yield streaming.join_items(items, fmt)
+
+async def _db_polygon_segments(area, fmt: str):
+    # vertices(JSONB)는 텍스트 그대로 받아 다시 파싱/직렬화하지 않음 (외곽선 하나를 조각 하나로 감쌈)
+    if area is None:
+        query, params = text("SELECT id, vertices::text FROM impossible"), {}
+    else:
+        query = text("""
+            SELECT id, vertices::text FROM impossible
+            WHERE polygon_geom && ST_MakeEnvelope(:minx, :miny, :maxx, :maxy, 4326)
+        """)
+        minx, miny, maxx, maxy = area
+        params = {"minx": minx, "miny": miny, "maxx": maxx, "maxy": maxy}
+    async for partition in stream_partitions(query, params):
+        # vertices가 없는(NULL) 구역은 그릴 수 없으므로 건너뜀 (스트리밍 도중 실패해 응답이 잘리지 않도록)
+        fragments = [b'{"id":%d,"parts":[%s]}' % (row[0], row[1].encode())
+                     for row in partition if row[1] is not None]
+        yield streaming.join_fragments(fragments, fmt)
 
+def _polygon_head(level) -> bytes:
+    return b'{"tolerance_meter":%s,"zones":[' % streaming.dumps(level)
 
 @sub_router.get("/getPolygon")
-async def get_impossible_polygons(db: Session = Depends(get_db)):
+async def get_impossible_polygons(
+    request: Request,
+    bbox: str | None = Query(None, description="화면 범위 minx,miny,maxx,maxy (경도/위도)"),
+    zoom: int | None = Query(None, ge=0, le=22, description="지도 줌 레벨 (단순화 단계 선택)"),
+    tolerance: float | None = Query(None, ge=0, description="단순화 허용 오차(미터), zoom보다 우선"),
+    format: str | None = FORMAT_QUERY,
+):
     """
-    DB의 impossible 테이블에 있는 모든 다각형 좌표(vertices) 반환
+    impossible 테이블의 제한 구역 다각형 좌표(vertices) 반환
     지도에 다각형 그리기용
+    - bbox를 주면 화면 범위와 겹치는 구역만 반환
+    - zoom/tolerance를 주면 제한 구역 적재 시 미리 계산해 둔 단순화 단계 중 맞는 것을 사용
+    - 구역 하나당 {"id", "parts": [외곽선 좌표, ...]} 하나 (MultiPolygon 조각은 parts에 함께 들어감)
+    - format=json이면 {"tolerance_meter", "zones": [...]}, format=ndjson이면 한 줄에 구역 하나씩 스트리밍
+      (인덱스가 없어 DB 원본 좌표를 쓸 때도 같은 형식, tolerance_meter는 0.0)
+    - 제한 구역 데이터 버전으로 ETag를 붙이고, 같은 버전의 응답은 메모리 캐시/304로 처리합니다.
     """
     try:
-        query = text("SELECT vertices FROM impossible")
-        rows = await asyncio.to_thread(lambda: db.execute(query).fetchall())
-        polygons = [row[0] for row in rows]
-        return {"polygons": polygons}
+        area = parse_bbox(bbox) if bbox else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"bbox 형식 오류: {e}")
+    if tolerance is None and zoom is not None:
+        tolerance = zone_index.tolerance_for_zoom(zoom)
+    fmt = streaming.negotiate_format(request, format)
+
+    if not zone_index.is_loaded():
+        await zone_index.reload()
+    index = zone_index.get_index()
+    level = zone_index.select_level(tolerance) if index is not None else None
+    etag = dataset_version.etag(dataset_version.ZONES, "getPolygon", area, level, fmt)
+    cached = http_cache.lookup(request, etag, fmt)
+    if cached is not None:
+        return cached
+
+    if index is not None:
+        ids, polygons, level = await asyncio.to_thread(index.polygons, area, tolerance)
+        chunks = streaming.frame(_index_polygon_segments(ids, polygons, fmt), fmt, head=_polygon_head(level), tail=b"]}")
+        return http_cache.caching_response(request, etag, fmt, chunks)
+
+    # 인덱스를 만들 수 없는 경우 DB 원본 좌표 사용 (단순화 없음)
+    try:
+        segments = await streaming.prefetch(_db_polygon_segments(area, fmt))
     except Exception as e:
-        print(f"Error in get_impossible_polygons: {e}")
-        return {"polygons": []}
+        logger.exception("Error in get_impossible_polygons: %s", e)
+        # 에러 발생 시 빈 목록 반환 (캐시하지 않음)
+        chunks = streaming.frame(_empty(), fmt, head=_polygon_head(0.0), tail=b"]}")
+        return streaming.streaming_response(request, chunks, fmt)
+    chunks = streaming.frame(segments, fmt, head=_polygon_head(0.0), tail=b"]}")
+    return http_cache.caching_response(request, etag, fmt, chunks)
+
+@sub_router.get("/cache-stats")
+async def get_response_cache_stats():
+    """
+    getPolygon / toORS 응답 캐시 사용 현황
+    """
+    return http_cache.get_cache_stats()
+
+@sub_router.get("/coverage")
+async def get_coverage(
+    zoom: int | None = Query(None, ge=0, le=22, description="지도 줌 레벨 (단순화 단계 선택)"),
+    tolerance: float | None = Query(None, ge=0, description="단순화 허용 오차(미터), zoom보다 우선"),
+):
+    """
+    겹치는 제한 구역을 하나로 합친 전체 제한 구역(MultiPolygon)을 GeoJSON Feature로 반환
+    지도에 단일 오버레이로 그리기용
+    """
+    if not coverage_service.is_loaded():
+        await coverage_service.load()
+    if not coverage_service.is_loaded():
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="제한 구역 합집합이 준비되지 않았습니다.")
+    if tolerance is None and zoom is not None:
+        tolerance = zone_index.tolerance_for_zoom(zoom)
+    feature = await asyncio.to_thread(coverage_service.to_geojson, tolerance)
+    return Response(content=feature, media_type="application/geo+json")
 
 # 서브 라우터를 메인 라우터에 포함시킴
 router.include_router(sub_router)
@@ -55,12 +163,19 @@ router.include_router(sub_router)
 async def check_impossible(
     x: float = Query(..., description="경도 (Longitude)"),
     y: float = Query(..., description="위도 (Latitude)"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     입력 좌표(x:경도, y:위도)가 DB의 impossible 다각형 중
     하나라도 포함되는지 확인하여 boolean 반환
+    (제한 구역 합집합 또는 메모리 인덱스가 준비되어 있으면 DB를 조회하지 않음)
     """
+    if coverage_service.is_loaded():
+        return {"is_inside": coverage_service.contains(x, y)}
+    index = zone_index.get_index()
+    if index is not None:
+        return {"is_inside": index.contains(x, y)}
+    
     try:
         query = text("""
             SELECT EXISTS(
@@ -72,14 +187,54 @@ async def check_impossible(
                 )
             )
         """)
-        result = await asyncio.to_thread(lambda: db.execute(query, {"x": x, "y": y}).scalar())
+        result = (await db.execute(query, {"x": x, "y": y})).scalar()
         return {"is_inside": result}
     except Exception as e:
-        print(f"Error in check_impossible: {e}")
+        logger.exception("Error in check_impossible: %s", e)
         return {"is_inside": False}
 
+async def _batch_result_segments(xs, ys, inside, zone_ids, fmt: str):
+    # 전체 결과를 dict 목록으로 만들지 않고 STREAM_FETCH_ROWS개씩 잘라 직렬화
+    size = settings.STREAM_FETCH_ROWS
+    for start in range(0, len(xs), size):
+        end = start + size
+        items = [
+            {"x": x, "y": y, "is_inside": is_inside, "zone_ids": ids}
+            for x, y, is_inside, ids in zip(xs[start:end].tolist(), ys[start:end].tolist(),
+                                            inside[start:end].tolist(), zone_ids[start:end])
+        ]
+        yield streaming.join_items(items, fmt)
+
+@router.post("/checkImpossible/batch")
+async def check_impossible_batch(request: Request, format: str | None = FORMAT_QUERY):
+    """
+    여러 좌표(x:경도, y:위도)를 한 번에 받아 각 좌표가 impossible 다각형에 포함되는지와
+    포함하는 제한 구역 id 목록을 반환 (메모리 인덱스 기반 일괄 판정)
+    - 결과는 묶음 단위로 JSON({"count", "inside_count", "results": [...]}) 또는 NDJSON(한 줄에 좌표 하나)으로 스트리밍
+    """
+    body = await read_points_body(request, settings.BATCH_CHECK_MAX_POINTS)
+    try:
+        xs, ys = await asyncio.to_thread(parse_points, body, request.headers.get("content-type", ""))
+    except (ValueError, KeyError, TypeError, IndexError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"좌표 데이터 형식 오류: {e}")
+    
+    if len(xs) > settings.BATCH_CHECK_MAX_POINTS:
+        raise too_many_points(settings.BATCH_CHECK_MAX_POINTS)
+    
+    if not zone_index.is_loaded():
+        await zone_index.reload()
+    index = zone_index.get_index()
+    if index is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="제한 구역 인덱스가 준비되지 않았습니다.")
+    
+    inside, zone_ids = await asyncio.to_thread(index.query_points, xs, ys)
+    fmt = streaming.negotiate_format(request, format)
+    head = b'{"count":%d,"inside_count":%d,"results":[' % (len(xs), int(inside.sum()))
+    chunks = streaming.frame(_batch_result_segments(xs, ys, inside, zone_ids, fmt), fmt, head=head, tail=b"]}")
+    return streaming.streaming_response(request, chunks, fmt)
+
 @router.get("/geocode")
-async def geocode_address(db: Session = Depends(get_db)):
+async def geocode_address(db: AsyncSession = Depends(get_db)):
     """
     [테스트/유틸리티] DB의 상위 12개 주소에 대해 네이버 지도 API를 호출하여
     실제 좌표(WGS84 경도/위도)를 실시간으로 조회합니다.
@@ -88,7 +243,7 @@ async def geocode_address(db: Session = Depends(get_db)):
     try:
         # 테스트를 위해 상위 12개만 조회
         query = text("SELECT landlot_address, road_name_address, x, y FROM address LIMIT 12")
-        rows = await asyncio.to_thread(lambda: db.execute(query).fetchall())
+        rows = (await db.execute(query)).fetchall()
         
         if not rows:
             return {"message": "DB에서 데이터를 찾지 못했습니다."}
@@ -124,39 +279,59 @@ async def geocode_address(db: Session = Depends(get_db)):
         return {"count": len(results), "results": results}
     
     except Exception as e:
-        print(f"NAVER Maps API 좌표 변환 중 오류 발생: {e}")
+        logger.error("NAVER Maps API 좌표 변환 중 오류 발생: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"NAVER Maps API 좌표 변환 중 서버 오류 발생: {e}")
 
+@router.get("/geocode/cache-stats")
+async def get_geocode_cache_stats():
+    """
+    [모니터링] 지오코딩 캐시(메모리 LRU + DB)의 적중/미스 통계를 반환합니다.
+    """
+    return geocode_cache.get_stats()
+
+@router.get("/geocode/backfill-status")
+async def get_backfill_status():
+    """
+    [모니터링] 비어 있는 좌표 백필 작업의 진행 상황을 반환합니다.
+    """
+    return db_service.backfill_progress
+
 @router.get("/check-location/{latitude}/{longitude}")
-async def check_location_eligibility(
-    latitude: float,
-    longitude: float,
-    db: Session = Depends(get_db) # DB 연결 의존성 예시
-):
+async def check_location_eligibility(latitude: float, longitude: float):
     """
-    [입지 분석 예상] 주어진 좌표(위도, 경도)가 담배소매인 지정 가능 위치인지 확인합니다.
-    현재는 더미(Dummy) 로직으로 무조건 '가능'을 반환합니다.
-    추후 OSMnx, GeoPandas 등을 활용한 실제 분석 로직 구현이 필요합니다.
+    [입지 분석] 주어진 좌표(위도, 경도)가 담배소매인 지정 가능 위치인지 확인합니다.
+    - 제한 구역(impossible) 포함 여부 + 가장 가까운 기존 소매점까지의 거리(보행 그래프가 있으면 도보 거리)
+    - 입점 가능하면 status "Access", 불가능하면 400 Bad Request (detail에 판정 이유와 가까운 소매점 포함)
     """
-    # TODO: 실제 입지 분석 로직 구현 필요 (OSMnx, GeoPandas 등 활용)
-    print(f"Checking location eligibility: Lat={latitude}, Lon={longitude}")
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="유효하지 않은 좌표입니다.")
     
-    # --- 더미 로직 ---
-    is_eligible = True 
+    try:
+        verdict = await eligibility_service.check_location(latitude, longitude)
+    except Exception as e:
+        logger.exception("Error in check_location_eligibility: %s", e)
+        raise HTTPException(status_code=500, detail="입점 가능 여부 판정 중 서버 내부 오류 발생")
     
-    if is_eligible:
-        return {"status": "Access", "message": "해당 위치는 입점 가능합니다."}
+    if verdict["eligible"]:
+        return {"status": "Access", "message": "해당 위치는 입점 가능합니다.", **verdict}
     else:
         # 입점 불가능 시 400 Bad Request 반환
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, 
-            detail="해당 위치는 입점 제한 구역입니다 (예: 학교 정화구역 내)."
+            detail={"status": "Denied", "message": "해당 위치는 입점 제한 구역입니다.", **verdict}
         )
 
+@router.get("/check-location/cache-stats")
+async def get_check_location_cache_stats():
+    """
+    [모니터링] 입점 가능 여부 판정 캐시의 적중/미스 통계를 반환합니다.
+    """
+    return eligibility_service.get_cache_stats()
+
 @router.get("/restricted-zones")
-async def get_restricted_zones(db: Session = Depends(get_db)):
+async def get_restricted_zones(db: AsyncSession = Depends(get_db)):
     """
     [데이터 제공 예상] 지도에 표시할 모든 '입점 제한 구역'의 폴리곤 데이터를 반환합니다.
     프론트엔드에서 시각화할 때 사용됩니다. 현재는 더미 데이터를 반환합니다.
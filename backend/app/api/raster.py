@@ -0,0 +1,51 @@
+# app/api/raster.py
+import asyncio
+from fastapi import APIRouter, HTTPException, Query, Response, status
+
+from app.core.config import settings
+from app.services import raster_service, tile_service
+
+router = APIRouter(prefix="/raster", tags=["raster"])
+
+def _require_raster():
+    if raster_service.get_raster() is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                            detail="입점 가능 여부 래스터가 아직 없습니다. POST /raster/jobs로 생성하세요.")
+
+@router.post("/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def start_raster_job(full: bool = Query(True, description="false면 저장된 래스터의 변경 범위만 갱신")):
+    """
+    address / impossible 전체 범위의 입점 가능 여부 래스터 계산을 백그라운드에서 시작합니다.
+    """
+    return raster_service.start_build(full=full or raster_service.get_raster() is None)
+
+@router.get("/status")
+async def get_raster_status():
+    """
+    래스터 계산 진행 상황과 래스터 정보(크기, 범위, 상태별 셀 수)를 반환합니다.
+    """
+    return await asyncio.to_thread(raster_service.get_status)
+
+@router.get("/heatmap.png")
+async def get_raster_heatmap(max_size: int = Query(1024, ge=16, le=settings.RASTER_MAX_PNG_SIZE)):
+    """
+    래스터 전체 히트맵 PNG (초록: 입점 가능, 빨강: 제한 구역, 주황: 기존 소매점 최소 거리 이내)
+    - EPSG:5179 격자 그대로의 이미지이므로, 지도에 정확히 겹칠 때는 /raster/tiles 사용
+    """
+    _require_raster()
+    png = await asyncio.to_thread(raster_service.render_overview, max_size)
+    return Response(content=png, media_type="image/png")
+
+@router.get("/tiles/{z}/{x}/{y}.png")
+async def get_raster_tile(z: int, x: int, y: int):
+    """
+    히트맵 XYZ 타일 (256px PNG, 래스터 밖의 타일은 204 No Content)
+    """
+    if not tile_service.is_valid_tile(z, x, y):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="유효하지 않은 타일 좌표입니다.")
+    _require_raster()
+    png = await asyncio.to_thread(raster_service.render_tile, z, x, y)
+    headers = {"Cache-Control": f"public, max-age={settings.TILE_HTTP_MAX_AGE}"}
+    if not png:
+        return Response(status_code=status.HTTP_204_NO_CONTENT, headers=headers)
+    return Response(content=png, media_type="image/png", headers=headers)
@@ -1,19 +1,20 @@
-import asyncio
 import json
-import datetime
-import pandas as pd
-from fastapi import APIRouter, Request, HTTPException, status
+import logging
+import os
+from fastapi import APIRouter, Request, HTTPException, Query, status
 from fastapi.responses import HTMLResponse, FileResponse
 from fastapi.templating import Jinja2Templates
 
 from app.core.config import settings
-from app.services.ors_api import get_isochrone_polygon
+from app.services import zone_job
 from app.services.db_service import (
     get_valid_address, 
     is_empty_impossible_table, 
     get_restricted_zone
 )
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/restricted-zone", tags=["restricted-zone"])
 templates = Jinja2Templates(directory="app/templates")
 
@@ -48,7 +49,7 @@ async def test_map(request: Request):
             })
     
     except Exception as e:
-        print(f"[test-map] 위치 데이터/제한 구역 데이터 조회 실패: {e}")
+        logger.error("[test-map] 위치 데이터/제한 구역 데이터 조회 실패: %s", e)
         stores = []
         zones = []
     
@@ -68,62 +69,74 @@ async def calculate_restricted_zone():
     [제한 구역 계산]
     DB의 address 테이블에 저장된 데이터를 조회하여 ORS를 통해 제한 구역을 계산합니다.
     계산한 전체 제한 구역 정보를 CSV 파일로 반환합니다.
+    (ORS 호출은 ORS_RATE_PER_MIN 속도 제한 안에서 병렬로 실행되고, 완료된 행은 즉시 CSV에 기록됩니다.)
     """
     try:
-        # address 테이블 데이터 조회
+        # address 테이블 데이터 존재 여부 확인
         rows = await get_valid_address()
         
         if not rows:
             return {"message": "address 테이블에서 데이터를 찾지 못했습니다."}
         
-        print(f"[restricted zone] address 테이블에서 총 {len(rows)}개의 위치 데이터를 가져왔습니다.")
+        logger.info("[restricted zone] address 테이블에서 총 %s개의 위치 데이터를 가져왔습니다.", len(rows))
         
         # impossible 테이블 데이터 존재 여부 확인
         if not await is_empty_impossible_table():
             return {"message": "이미 제한 구역 데이터가 존재합니다. 기존 데이터 삭제 후 다시 시도하세요."}
         
-        csv_results = []
-        
-        for landlot_addr, longitude, latitude in rows:
-            await asyncio.sleep(4)
-            
-            # ORS를 사용해 Polygon 계산 (Shapely 객체)
-            shapely_poly = await get_isochrone_polygon(latitude, longitude)
-        
-            if shapely_poly is None:
-                print(f"[restricted zone] 제한 구역 계산 실패: address={landlot_addr}")
-                continue
-            
-            centroid = shapely_poly.centroid
-            vertices = json.dumps(list(shapely_poly.exterior.coords))
-            csv_results.append({
-                "landlot_address": landlot_addr,
-                "centroid_x": centroid.x,
-                "centroid_y": centroid.y,
-                "polygon_geom": shapely_poly.wkt,
-                "vertices": vertices
-            })
-        
-        if not csv_results:
-            return {"message": "생성된 제한 구역 데이터가 없습니다."}
-
-        # CSV 파일 생성
-        df = pd.DataFrame(csv_results)
-        timestmap = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"restricted_zone_{timestmap}.csv"
+        job = await zone_job.run_zone_job(zone_job.new_job_id(), sink="csv")
         
-        # UTF-8-SIG(엑셀 한글 깨짐 방지)로 저장
-        df.to_csv(filename, index=False, encoding='utf-8-sig')
+        if job["state"] != "completed" or job["done"] == 0:
+            return {"message": "생성된 제한 구역 데이터가 없습니다.", "job": job}
         
+        filename = os.path.basename(job["path"])
         return FileResponse(
-            path=filename, 
+            path=job["path"], 
             filename=filename, 
             media_type='text/csv'
         )
     
     except Exception as e:
-        print(f"[restricted zone] 제한 구역 계산 중 오류 발생: {e}")
+        logger.error("[restricted zone] 제한 구역 계산 중 오류 발생: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"제한 구역 계산 중 서버 오류 발생: {e}"
-        )
\ No newline at end of file
+        )
+
+@router.post("/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def start_restricted_zone_job(
+    sink: str = Query("csv", description="결과 저장 위치 (csv: CSV 파일에 기록, db: impossible 테이블에 저장)"),
+    job_id: str | None = Query(None, description="이어서 계산할 기존 작업 ID (없으면 새 작업)")
+):
+    """
+    [제한 구역 계산 작업]
+    제한 구역 계산을 백그라운드 작업으로 시작합니다.
+    중단된 작업은 같은 job_id로 다시 요청하면 완료된 주소를 건너뛰고 이어서 계산합니다.
+    """
+    try:
+        return zone_job.start_zone_job(job_id, sink)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+@router.get("/jobs/{job_id}")
+async def get_restricted_zone_job(job_id: str):
+    """
+    [제한 구역 계산 작업] 작업 진행 상황을 반환합니다.
+    """
+    job = zone_job.jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="작업을 찾을 수 없습니다.")
+    return job
+
+@router.get("/jobs/{job_id}/download")
+async def download_restricted_zone_job(job_id: str):
+    """
+    [제한 구역 계산 작업] 지금까지 기록된 CSV 파일을 반환합니다. (진행 중인 작업도 완료된 행까지 다운로드 가능)
+    """
+    try:
+        path = zone_job.job_csv_path(job_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if not os.path.exists(path):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="작업 결과 파일을 찾을 수 없습니다.")
+    return FileResponse(path=path, filename=os.path.basename(path), media_type='text/csv')
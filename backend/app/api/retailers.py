@@ -0,0 +1,65 @@
+# app/api/retailers.py
+import asyncio
+import numpy as np
+from fastapi import APIRouter, HTTPException, Query, Request, status
+
+from app.core.config import settings
+from app.services import retailer_index
+from app.utils.points import parse_points, read_points_body, too_many_points
+
+router = APIRouter(prefix="/retailers", tags=["retailers"])
+
+async def _get_index():
+    await retailer_index.ensure_loaded()
+    index = retailer_index.get_index()
+    if index is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="소매점 인덱스가 준비되지 않았습니다.")
+    return index
+
+@router.get("/nearest")
+async def get_nearest_retailers(
+    latitude: float,
+    longitude: float,
+    k: int = Query(5, ge=1, le=settings.RETAILER_KNN_MAX_K, description="조회할 소매점 수"),
+    max_distance: float | None = Query(None, gt=0, description="최대 거리(미터)"),
+):
+    """
+    좌표(위도, 경도)에서 가장 가까운 기존 소매점 k개와 거리(미터, EPSG:5179 기준)를 반환
+    """
+    index = await _get_index()
+    results = index.nearest(longitude, latitude, k, max_distance)
+    return {"latitude": latitude, "longitude": longitude, "count": len(results), "results": results}
+
+def _batch_results(index, xs, ys, k, max_distance):
+    distances, indices = index.query_many(xs, ys, k, max_distance)
+    return [
+        {
+            "x": x,
+            "y": y,
+            "neighbors": [index.record(i, d) for d, i in zip(row_d, row_i) if np.isfinite(d)],
+        }
+        for x, y, row_d, row_i in zip(xs.tolist(), ys.tolist(), distances.tolist(), indices.tolist())
+    ]
+
+@router.post("/nearest/batch")
+async def get_nearest_retailers_batch(
+    request: Request,
+    k: int = Query(5, ge=1, le=settings.RETAILER_KNN_MAX_K, description="좌표마다 조회할 소매점 수"),
+    max_distance: float | None = Query(None, gt=0, description="최대 거리(미터)"),
+):
+    """
+    여러 좌표(x:경도, y:위도)의 최근접 소매점 k개를 한 번에 조회
+    (본문 형식은 /checkImpossible/batch와 같음: 좌표 배열, {"points": [...]}, GeoJSON, NDJSON)
+    """
+    body = await read_points_body(request, settings.RETAILER_BATCH_MAX_POINTS)
+    try:
+        xs, ys = await asyncio.to_thread(parse_points, body, request.headers.get("content-type", ""))
+    except (ValueError, KeyError, TypeError, IndexError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"좌표 데이터 형식 오류: {e}")
+
+    if len(xs) > settings.RETAILER_BATCH_MAX_POINTS:
+        raise too_many_points(settings.RETAILER_BATCH_MAX_POINTS)
+
+    index = await _get_index()
+    results = await asyncio.to_thread(_batch_results, index, xs, ys, k, max_distance)
+    return {"count": len(results), "results": results}
@@ -0,0 +1,76 @@
+# app/api/sites.py
+import asyncio
+import json
+import shapely
+from fastapi import APIRouter, HTTPException, Query, Request, status
+
+from app.core.config import settings
+from app.services import coverage_service, retailer_index, site_finder
+from app.utils.points import parse_bbox
+
+router = APIRouter(prefix="/sites", tags=["sites"])
+
+def _region_from_body(data):
+    """
+    요청 본문을 영역 geometry로 변환
+    - {"bbox": "minx,miny,maxx,maxy" 또는 [minx, miny, maxx, maxy]}
+    - GeoJSON Polygon / MultiPolygon / Feature, 또는 {"polygon": GeoJSON geometry}
+    """
+    if isinstance(data, dict) and "bbox" in data and data.get("type") is None:
+        bbox = data["bbox"]
+        return shapely.box(*parse_bbox(bbox if isinstance(bbox, str) else ",".join(map(str, bbox))))
+    if isinstance(data, dict) and "polygon" in data:
+        data = data["polygon"]
+    if isinstance(data, dict) and data.get("type") == "Feature":
+        data = data.get("geometry") or {}
+    region = shapely.from_geojson(json.dumps(data))
+    if region.geom_type not in ("Polygon", "MultiPolygon") or region.is_empty:
+        raise ValueError("영역은 Polygon 또는 MultiPolygon이어야 합니다.")
+    return shapely.make_valid(region)
+
+async def _search(region, limit, resolution, min_separation, distance_weight, density_weight):
+    if not coverage_service.is_loaded():
+        await coverage_service.load()
+    await retailer_index.ensure_loaded()
+    try:
+        return await asyncio.to_thread(site_finder.find_sites, region, limit, resolution,
+                                       min_separation, distance_weight, density_weight)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+@router.get("/candidates")
+async def get_candidate_sites(
+    bbox: str = Query(..., description="탐색 범위 minx,miny,maxx,maxy (경도/위도)"),
+    limit: int = Query(20, ge=1, le=settings.SITE_MAX_RESULTS, description="반환할 후보 수"),
+    resolution: float | None = Query(None, ge=1, description="가장 작은 셀 크기(미터)"),
+    min_separation: float | None = Query(None, ge=0, description="후보끼리 최소 간격(미터)"),
+    distance_weight: float | None = Query(None, ge=0, description="최근접 소매점 거리 점수 가중치"),
+    density_weight: float | None = Query(None, ge=0, description="주변 소매점 밀도 점수 가중치"),
+):
+    """
+    bbox 안에서 입점 가능한 후보 지점을 점수 순으로 반환
+    (점수: 가장 가까운 기존 소매점과의 거리 + 주변 상권 밀도)
+    """
+    try:
+        region = shapely.box(*parse_bbox(bbox))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"bbox 형식 오류: {e}")
+    return await _search(region, limit, resolution, min_separation, distance_weight, density_weight)
+
+@router.post("/candidates")
+async def find_candidate_sites(
+    request: Request,
+    limit: int = Query(20, ge=1, le=settings.SITE_MAX_RESULTS, description="반환할 후보 수"),
+    resolution: float | None = Query(None, ge=1, description="가장 작은 셀 크기(미터)"),
+    min_separation: float | None = Query(None, ge=0, description="후보끼리 최소 간격(미터)"),
+    distance_weight: float | None = Query(None, ge=0, description="최근접 소매점 거리 점수 가중치"),
+    density_weight: float | None = Query(None, ge=0, description="주변 소매점 밀도 점수 가중치"),
+):
+    """
+    다각형(GeoJSON) 또는 bbox 영역 안에서 입점 가능한 후보 지점을 점수 순으로 반환
+    """
+    try:
+        region = _region_from_body(json.loads(await request.body()))
+    except (ValueError, TypeError, shapely.errors.GEOSException) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"영역 형식 오류: {e}")
+    return await _search(region, limit, resolution, min_separation, distance_weight, density_weight)
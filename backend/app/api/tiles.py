@@ -0,0 +1,39 @@
+# app/api/tiles.py
+import logging
+from fastapi import APIRouter, HTTPException, Response, status
+from app.core.config import settings
+from app.services import tile_service
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/tiles", tags=["tiles"])
+
+MVT_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+
+@router.get("/cache-stats")
+async def get_tile_cache_stats():
+    """
+    [모니터링] 벡터 타일 캐시의 적중/미스 통계를 반환합니다.
+    """
+    return tile_service.get_cache_stats()
+
+@router.get("/{z}/{x}/{y}.mvt")
+async def get_tile(z: int, x: int, y: int):
+    """
+    제한 구역(restricted_zones) / 소매점 위치(retailers) 레이어의 Mapbox Vector Tile
+    - 소매점 레이어는 TILE_RETAILER_MIN_ZOOM 이상에서만 포함
+    - 데이터가 없는 타일은 204 No Content
+    """
+    if not tile_service.is_valid_tile(z, x, y):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="유효하지 않은 타일 좌표입니다.")
+
+    try:
+        tile = await tile_service.get_tile(z, x, y)
+    except Exception as e:
+        logger.exception("Error in get_tile(%s/%s/%s): %s", z, x, y, e)
+        raise HTTPException(status_code=500, detail="타일 생성 중 서버 내부 오류 발생")
+
+    headers = {"Cache-Control": f"public, max-age={settings.TILE_HTTP_MAX_AGE}"}
+    if not tile:
+        return Response(status_code=status.HTTP_204_NO_CONTENT, headers=headers)
+    return Response(content=tile, media_type=MVT_MEDIA_TYPE, headers=headers)
@@ -9,6 +9,13 @@ class Settings(BaseSettings):
     ZONE_CSV_PATH: str = "/app/data/restricted_zone.csv"
     IMPOSSIBLE_CSV_PATH: str = "/app/data/impossible.csv"
 
+    # DB 커넥션 풀 설정 (asyncpg)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800                # 초 단위, 오래된 커넥션 재생성
+    DB_STATEMENT_CACHE_SIZE: int = 256         # 커넥션별 prepared statement 캐시 크기
+
     # 네이버 API 설정
     NAVER_CLIENT_ID: str | None = os.getenv("NAVER_CLIENT_ID")
     NAVER_CLIENT_SECRET: str | None = os.getenv("NAVER_CLIENT_SECRET")
@@ -24,4 +31,123 @@ class Settings(BaseSettings):
     # 검색 반경 (미터)
     SEARCH_RADIUS_METER: float = 50.0
 
+    # 일괄 제한 구역 판정 최대 좌표 수
+    BATCH_CHECK_MAX_POINTS: int = 100_000
+    # 일괄 좌표 요청에서 좌표 하나당 허용하는 본문 크기 (바이트, GeoJSON Feature 기준 여유 포함) -> 본문 상한 = 최대 좌표 수 x 이 값
+    BATCH_BYTES_PER_POINT: int = 256
+
+    # asyncio.to_thread가 쓰는 기본 스레드 풀 크기 (asyncio 기본값과 같은 계산)
+    THREAD_POOL_WORKERS: int = min(32, (os.cpu_count() or 1) + 4)
+
+    # 업스트림 HTTP 클라이언트 설정 (커넥션 풀 / 타임아웃(초))
+    HTTP_MAX_CONNECTIONS: int = 50
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_CONNECT_TIMEOUT: float = 3.0
+    HTTP2_ENABLED: bool = True
+    NAVER_MAPS_TIMEOUT: float = 5.0
+    NAVER_SEARCH_TIMEOUT: float = 10.0
+    ORS_TIMEOUT: float = 10.0
+
+    # 지오코딩 캐시 설정 (메모리 LRU 크기 / 정상 결과 TTL(일) / 결과 없음 TTL(시간))
+    GEOCODE_CACHE_MEMORY_SIZE: int = 50_000
+    GEOCODE_CACHE_TTL_DAYS: float = 180.0
+    GEOCODE_NEGATIVE_TTL_HOURS: float = 24.0
+
+    # 좌표 백필 설정 (Geocoding API 쿼터에 맞춘 초당 요청 수 / 동시 요청 수 / 일괄 UPDATE 크기)
+    NAVER_GEOCODE_RATE_PER_SEC: float = 10.0
+    NAVER_GEOCODE_BURST: float = 10.0
+    BACKFILL_CONCURRENCY: int = 8
+    BACKFILL_BATCH_SIZE: int = 500
+    BACKFILL_IN_BACKGROUND: bool = True   # True면 앱 시작을 막지 않고 백그라운드에서 실행
+
+    # 제한 구역 계산 작업 설정 (ORS 분당 요청 수 / 동시 요청 수 / 결과 CSV 저장 경로)
+    ORS_RATE_PER_MIN: float = 15.0
+    ZONE_JOB_CONCURRENCY: int = 4
+    ZONE_JOB_DIR: str = "/app/data/jobs"
+
+    # 제한 구역 계산 엔진 ("ors": OpenRouteService API, "local": OSM 추출 파일 기반 오프라인 엔진)
+    ISOCHRONE_ENGINE: str = "ors"
+    OSM_EXTRACT_PATH: str = "/app/data/pedestrian.osm"
+    ISOCHRONE_RANGE_METER: float = 100.0
+    ISOCHRONE_BUFFER_METER: float = 15.0   # 도달 가능한 도로 구간에 씌우는 버퍼 폭
+    ISOCHRONE_SNAP_METER: float = 200.0    # 출발점을 도로망에 붙일 수 있는 최대 거리
+    ISOCHRONE_WORKERS: int = 4
+    ISOCHRONE_BATCH_SIZE: int = 200
+
+    # 상가 검색 캐시 설정
+    REVERSE_GEOCODE_GRID_DEG: float = 0.0005             # 역지오코딩 격자 셀 크기 (약 50m)
+    NEARBY_ADDRESS_CACHE_SIZE: int = 20_000
+    NEARBY_ADDRESS_CACHE_TTL_SEC: float = 7 * 86400
+    NEARBY_SEARCH_CACHE_SIZE: int = 10_000
+    NEARBY_SEARCH_CACHE_TTL_SEC: float = 6 * 3600
+    NEARBY_SEARCH_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+
+    # 제한 구역 다각형 단순화 단계 (미터, 제한 구역 적재 시 한 번 계산)
+    POLYGON_LOD_TOLERANCES_METER: list[float] = [1.0, 4.0, 16.0, 64.0]
+
+    # 입점 가능 여부 판정 설정
+    ELIGIBILITY_MIN_DISTANCE_METER: float = 50.0   # 기존 소매점과의 최소 거리 (도보 거리, 그래프가 없으면 직선 거리)
+    ELIGIBILITY_NEAREST_COUNT: int = 5              # 응답에 포함할 가장 가까운 소매점 수
+    ELIGIBILITY_CELL_DEG: float = 0.0001            # 소매점 후보 캐시 격자 셀 크기 (약 10m)
+    ELIGIBILITY_CACHE_SIZE: int = 50_000
+    ELIGIBILITY_CACHE_TTL_SEC: float = 3600.0
+
+    # 최근접 소매점(KNN) 조회 설정
+    RETAILER_KNN_MAX_K: int = 50
+    RETAILER_BATCH_MAX_POINTS: int = 100_000
+
+    # 입점 가능 여부 래스터(히트맵) 설정
+    RASTER_CELL_METER: float = 10.0
+    RASTER_WORKERS: int = 4
+    RASTER_CHUNK_ROWS: int = 256
+    RASTER_PATH: str = "/app/data/eligibility_raster.npz"
+    RASTER_MAX_PNG_SIZE: int = 2048
+    RASTER_TILE_CACHE_SIZE: int = 2_000
+    RASTER_AUTO_BUILD: bool = False   # True면 래스터 파일이 없을 때 앱 시작 시 백그라운드에서 생성
+
+    # 대용량 응답 스트리밍 설정
+    STREAM_FETCH_ROWS: int = 5_000      # 서버 측 커서에서 한 번에 가져와 직렬화할 행 수
+    STREAM_GZIP_LEVEL: int = 6
+    STREAM_BROTLI_QUALITY: int = 4
+
+    # 조건부 GET / 응답 캐시 설정 (제한 구역·소매점 대용량 응답)
+    DATASET_HTTP_CACHE_CONTROL: str = "no-cache"   # 브라우저는 보관하되 매번 ETag로 재검증
+    RESPONSE_CACHE_SIZE: int = 256
+    RESPONSE_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    RESPONSE_CACHE_MAX_ITEM_BYTES: int = 64 * 1024 * 1024
+
+    # 델타 동기화(/changes) 설정
+    CHANGES_PAGE_SIZE: int = 5_000        # 한 번에 돌려줄 최대 변경 행 수 (데이터셋별)
+    CHANGES_RETENTION_DAYS: int = 30      # 삭제 기록(tombstone) 보관 기간
+
+    # 입점 후보지 탐색 설정
+    SITE_RESOLUTION_METER: float = 10.0        # 가장 작은 셀 크기
+    SITE_MIN_SEPARATION_METER: float = 100.0   # 후보끼리 최소 간격
+    SITE_DISTANCE_CAP_METER: float = 300.0     # 이 거리 이상은 거리 점수 만점
+    SITE_DENSITY_RADIUS_METER: float = 500.0   # 상권 밀도(주변 소매점 수) 반경
+    SITE_DENSITY_CAP: int = 30                 # 이 수 이상은 밀도 점수 만점
+    SITE_DISTANCE_WEIGHT: float = 0.5
+    SITE_DENSITY_WEIGHT: float = 0.5
+    SITE_MAX_RESULTS: int = 100
+    SITE_MAX_CELLS: int = 200_000              # 요청 하나에서 검사할 최대 셀 수
+    SITE_MAX_AREA_KM2: float = 400.0
+
+    # 로그 설정 (레벨 / 출력 형식(json, text) / 모듈별 레벨 / DEBUG 로그 샘플링 비율(모듈별))
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"
+    LOG_LEVELS: dict[str, str] = {"httpx": "WARNING", "httpcore": "WARNING"}
+    LOG_DEBUG_SAMPLE_RATE: float = 1.0
+    LOG_SAMPLE_RATES: dict[str, float] = {}
+
+    # 벡터 타일(MVT) 설정
+    TILE_MAX_ZOOM: int = 22
+    TILE_EXTENT: int = 4096
+    TILE_BUFFER: int = 64
+    TILE_SIMPLIFY_PIXELS: float = 0.5        # 줌 레벨별 단순화 허용 오차 (화면 픽셀 단위)
+    TILE_RETAILER_MIN_ZOOM: int = 14         # 소매점 점 레이어를 포함하는 최소 줌
+    TILE_CACHE_SIZE: int = 20_000
+    TILE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    TILE_HTTP_MAX_AGE: int = 300
+
 settings = Settings()
\ No newline at end of file
@@ -1,28 +1,56 @@
 # app/core/database.py
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
-from typing import Generator
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import declarative_base
+from typing import AsyncGenerator
 from app.core.config import settings
+from app.core.metrics import instrument_engine
+
+# --- SQLAlchemy 비동기 엔진 및 세션 설정 (asyncpg) ---
+# 쿼리가 기본 스레드 풀(asyncio.to_thread)을 점유하지 않도록 이벤트 루프에서 직접 실행합니다.
+# 동시 요청 수는 스레드 수가 아니라 아래 커넥션 풀 크기로 제한됩니다.
+def to_async_url(url: str) -> str:
+    """
+    postgresql:// (psycopg2) URL을 asyncpg 드라이버 URL로 변환
+    """
+    parsed = make_url(url)
+    if parsed.drivername in ("postgresql", "postgres", "postgresql+psycopg2", "postgresql+psycopg"):
+        parsed = parsed.set(drivername="postgresql+asyncpg")
+    # SQLAlchemy asyncpg 방언의 연결별 prepared statement 캐시 크기
+    parsed = parsed.update_query_dict({"prepared_statement_cache_size": str(settings.DB_STATEMENT_CACHE_SIZE)})
+    return parsed.render_as_string(hide_password=False)
 
-# --- SQLAlchemy 엔진 및 세션 설정 (FastAPI 비동기 환경에 맞게 조정) ---
-# 동기 엔진 생성 (FastAPI에서 직접 사용하지 않고, asyncio.to_thread로 감싸서 사용)
 DATABASE_URL = settings.DATABASE_URL
-sync_engine = create_engine(DATABASE_URL) 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=sync_engine)
+ASYNC_DATABASE_URL = to_async_url(DATABASE_URL)
+
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=True,
+)
+instrument_engine(async_engine.sync_engine) # 쿼리 실행 시간 -> /metrics
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False, autoflush=False)
 
 Base = declarative_base()
 
 # --- DB 의존성 주입 함수 (실제 DB 연결 사용) ---
-def get_db():
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
-    SQLAlchemy 세션 객체를 제공하고 요청 완료 후 닫습니다.
-    비동기 컨텍스트에서 동기 DB 작업을 위해 asyncio.to_thread를 사용합니다.
+    SQLAlchemy 비동기 세션 객체를 제공하고 요청 완료 후 닫습니다.
+    (커넥션은 첫 쿼리 실행 시점에 풀에서 가져옵니다.)
     """
-    db = SessionLocal()
-    try:
-        # 이 시점에서 DB 연결이 실제로 이루어짐 (session.connection() 등)
-        print("Database session acquired.")
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
-        print("Database session closed.")
\ No newline at end of file
+
+async def stream_partitions(query, params: dict | None = None, size: int | None = None):
+    """
+    서버 측 커서로 쿼리 결과를 size행씩 묶어서 내보냅니다. (전체 결과를 메모리에 올리지 않음)
+    """
+    size = size or settings.STREAM_FETCH_ROWS
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(query.execution_options(yield_per=size), params or {})
+        async for partition in result.partitions():
+            yield partition
@@ -0,0 +1,76 @@
+# app/core/http_client.py
+import importlib.util
+import httpx
+import logging
+from app.core.config import settings
+from app.core.metrics import InstrumentedTransport
+
+logger = logging.getLogger(__name__)
+
+# --- 업스트림별 공유 HTTP 클라이언트 ---
+# 요청마다 AsyncClient를 새로 만들면 매번 TCP+TLS 핸드셰이크가 발생하므로,
+# 업스트림(네이버 지도 / 네이버 검색 / ORS)마다 하나의 클라이언트를 앱 수명 동안 재사용합니다.
+NAVER_MAPS = "naver_maps"
+NAVER_SEARCH = "naver_search"
+ORS = "ors"
+
+_clients: dict[str, httpx.AsyncClient] = {}
+
+# h2 패키지가 설치된 경우에만 HTTP/2 사용 (없으면 HTTP/1.1 keep-alive)
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def _upstream_timeout(name: str) -> float:
+    return {
+        NAVER_MAPS: settings.NAVER_MAPS_TIMEOUT,
+        NAVER_SEARCH: settings.NAVER_SEARCH_TIMEOUT,
+        ORS: settings.ORS_TIMEOUT,
+    }[name]
+
+
+def _create_client(name: str) -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+    )
+    timeout = httpx.Timeout(_upstream_timeout(name), connect=settings.HTTP_CONNECT_TIMEOUT)
+    # 업스트림별 응답 시간/상태/타임아웃을 /metrics에 기록하도록 전송 계층을 감쌈
+    transport = httpx.AsyncHTTPTransport(limits=limits, http2=settings.HTTP2_ENABLED and HTTP2_AVAILABLE)
+    return httpx.AsyncClient(
+        timeout=timeout,
+        transport=InstrumentedTransport(transport, name),
+    )
+
+
+async def init_clients():
+    """
+    [앱 시작 시 실행]
+    업스트림별 공유 AsyncClient를 생성합니다.
+    """
+    for name in (NAVER_MAPS, NAVER_SEARCH, ORS):
+        if name not in _clients or _clients[name].is_closed:
+            _clients[name] = _create_client(name)
+    logger.info("🌐 HTTP 클라이언트 생성 완료 (HTTP/2: %s)", settings.HTTP2_ENABLED and HTTP2_AVAILABLE)
+
+
+async def close_clients():
+    """
+    [앱 종료 시 실행]
+    공유 AsyncClient의 커넥션 풀을 정리합니다.
+    """
+    for client in _clients.values():
+        await client.aclose()
+    _clients.clear()
+
+
+def get_client(name: str) -> httpx.AsyncClient:
+    """
+    업스트림 이름에 해당하는 공유 AsyncClient를 반환합니다.
+    lifespan 밖(테스트, 스크립트)에서 호출된 경우에는 그 자리에서 생성합니다.
+    """
+    client = _clients.get(name)
+    if client is None or client.is_closed:
+        client = _create_client(name)
+        _clients[name] = client
+    return client
@@ -0,0 +1,167 @@
+# app/core/log.py
+import datetime
+import logging
+import os
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+import orjson
+
+from app.core.config import settings
+
+# --- 비차단 구조화 로그 ---
+# 요청 처리 코드는 로그 레코드를 큐에 넣기만 하고, 직렬화(JSON)와 stdout 쓰기는 백그라운드 스레드(QueueListener)가 합니다.
+# - 레벨: LOG_LEVEL (전체) + LOG_LEVELS (모듈별, 예: {"app.services.naver_api": "DEBUG"})
+# - 샘플링: 자주 찍히는 DEBUG 로그는 LOG_SAMPLE_RATES 비율만큼만 큐에 넣음 (예: 0.1 -> 10건 중 1건)
+# 모듈에서는 표준 logging.getLogger(__name__)을 그대로 사용합니다.
+
+# LogRecord 기본 속성 (나머지는 extra={...}로 넘긴 구조화 필드)
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener: QueueListener | None = None
+_handler: QueueHandler | None = None
+_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    한 줄짜리 JSON 로그 (ts, level, logger, message + extra 필드)
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return orjson.dumps(entry, default=str).decode()
+
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+
+
+def _create_formatter() -> logging.Formatter:
+    return JsonFormatter() if settings.LOG_FORMAT == "json" else logging.Formatter(TEXT_FORMAT)
+
+
+def _longest_prefix(name: str, table: dict):
+    """
+    'a.b.c' -> table['a.b.c'] / table['a.b'] / table['a'] 중 가장 구체적인 값 (없으면 None)
+    """
+    while name:
+        if name in table:
+            return table[name]
+        name = name.rpartition(".")[0]
+    return None
+
+
+class SamplingFilter(logging.Filter):
+    """
+    DEBUG 이하 로그를 로거별 비율로 솎아냄 (호출 위치마다 N건 중 1건, 결정적)
+    """
+
+    def __init__(self, rates: dict[str, float], default: float = 1.0):
+        super().__init__()
+        self._rates = rates
+        self._default = default
+        self._every: dict[str, int] = {}
+        self._counts: dict[tuple, int] = {}
+
+    def _every_for(self, name: str) -> int:
+        every = self._every.get(name)
+        if every is None:
+            rate = _longest_prefix(name, self._rates)
+            rate = self._default if rate is None else rate
+            every = self._every[name] = 0 if rate <= 0 else max(1, round(1 / rate))
+        return every
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+        every = self._every_for(record.name)
+        if every <= 1:
+            return every == 1
+        key = (record.name, record.lineno)
+        count = self._counts.get(key, 0)
+        self._counts[key] = count + 1
+        return count % every == 0
+
+
+class _QueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 기본 구현은 호출한 스레드에서 포맷까지 하므로, 메시지 인자만 합치고 포맷은 리스너에 맡김
+        # (인자로 넘긴 가변 객체가 나중에 바뀌어도 기록 시점의 내용이 남도록 여기서 합침)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def _apply_levels():
+    logging.getLogger().setLevel(settings.LOG_LEVEL.upper())
+    for name, level in settings.LOG_LEVELS.items():
+        logging.getLogger(name).setLevel(level.upper())
+
+
+def _use_direct_handler_in_child():
+    # fork된 작업 프로세스(ProcessPoolExecutor)에는 리스너 스레드가 없으므로 stderr에 바로 기록
+    global _listener, _handler
+    if _handler is None:
+        return
+    root = logging.getLogger()
+    root.removeHandler(_handler)
+    direct = logging.StreamHandler(sys.stderr)
+    direct.setFormatter(_create_formatter())
+    for log_filter in _handler.filters:
+        direct.addFilter(log_filter)
+    root.addHandler(direct)
+    _handler = None
+    _listener = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_use_direct_handler_in_child)
+
+
+def setup_logging():
+    """
+    [앱 시작 시 실행] 루트 로거에 큐 핸들러를 달고 백그라운드 기록 스레드를 시작 (여러 번 호출해도 한 번만 적용)
+    """
+    global _listener, _handler
+    with _lock:
+        _apply_levels()
+        if _listener is not None:
+            return
+
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        output = logging.StreamHandler(sys.stdout)
+        output.setFormatter(_create_formatter())
+
+        _handler = _QueueHandler(log_queue)
+        _handler.addFilter(SamplingFilter(settings.LOG_SAMPLE_RATES, settings.LOG_DEBUG_SAMPLE_RATE))
+        _listener = QueueListener(log_queue, output, respect_handler_level=True)
+        _listener.start()
+        logging.getLogger().addHandler(_handler)
+
+
+def shutdown_logging():
+    """
+    [앱 종료 시 실행] 큐에 남은 로그를 모두 기록하고 기록 스레드를 멈춤
+    """
+    global _listener, _handler
+    with _lock:
+        if _listener is None:
+            return
+        logging.getLogger().removeHandler(_handler)
+        _listener.stop()
+        _listener = None
+        _handler = None
@@ -0,0 +1,223 @@
+# app/core/metrics.py
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# --- Prometheus 메트릭 (/metrics, prometheus_client 기본 레지스트리) ---
+# - 요청 시간/오류는 Counter / Histogram에 바로 기록하고,
+#   캐시 적중률처럼 이미 다른 곳에 있는 값은 수집 시점에 콜렉터가 읽습니다. (요청 경로 비용 0)
+# - 실행기 대기열은 앱이 만든 실행기(TrackedThreadPoolExecutor / TrackedProcessPoolExecutor)가 직접 셉니다.
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+# 초 단위 기본 구간 (업스트림 API 수백 ms ~ 수 초, DB 수 ms 모두 포함)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def render() -> bytes:
+    """
+    등록된 모든 메트릭을 Prometheus 텍스트 형식으로 출력
+    """
+    return generate_latest(REGISTRY)
+
+
+# --- 메트릭 정의 ---
+http_request_seconds = Histogram(
+    "http_request_duration_seconds", "라우트별 요청 처리 시간 (응답 본문 전송 완료까지)",
+    ("method", "route", "status"), buckets=DEFAULT_BUCKETS)
+upstream_request_seconds = Histogram(
+    "upstream_request_duration_seconds", "업스트림 API 응답 시간 (응답 헤더 수신까지)",
+    ("upstream", "method", "status"), buckets=DEFAULT_BUCKETS)
+upstream_errors = Counter(
+    "upstream_request_errors", "업스트림 API 오류 (timeout / connect / other)",
+    ("upstream", "kind"))
+category_search_seconds = Histogram(
+    "nearby_category_search_duration_seconds", "상가 검색의 카테고리별 검색 시간 (캐시 적중 포함)",
+    ("category", "cache"), buckets=DEFAULT_BUCKETS)
+db_query_seconds = Histogram(
+    "db_query_duration_seconds", "DB 쿼리 실행 시간 (문장 종류별)",
+    ("statement",), buckets=DEFAULT_BUCKETS)
+db_query_errors = Counter("db_query_errors", "DB 쿼리 오류", ("statement",))
+executor_pending_tasks = Gauge(
+    "executor_pending_tasks", "실행기에 제출되어 아직 끝나지 않은 작업 수 (대기 + 실행 중)", ("executor",))
+executor_workers = Gauge("executor_workers", "실행기 최대 작업자(스레드/프로세스) 수", ("executor",))
+
+
+# --- 캐시 (수집 시점에 LRUCache.stats()를 읽음) ---
+_caches: dict[str, object] = {}
+
+
+def register_cache(name: str, cache):
+    """
+    LRUCache의 적중/미스/제거 수와 크기를 /metrics에 노출
+    """
+    _caches[name] = cache
+    return cache
+
+
+class _CacheCollector:
+    FAMILIES = (
+        (CounterMetricFamily, "cache_hits", "캐시 적중 수", "hits"),
+        (CounterMetricFamily, "cache_misses", "캐시 미스 수", "misses"),
+        (CounterMetricFamily, "cache_evictions", "캐시 제거 수", "evictions"),
+        (GaugeMetricFamily, "cache_hit_ratio", "캐시 적중률 (시작 이후 누적)", "hit_ratio"),
+        (GaugeMetricFamily, "cache_entries", "캐시 항목 수", "size"),
+        (GaugeMetricFamily, "cache_bytes", "캐시 메모리 사용량 추정 (메모리 예산이 있는 캐시만)", "bytes"),
+    )
+
+    def collect(self):
+        stats = {}
+        for name, cache in list(_caches.items()):
+            try:
+                stats[name] = cache.stats()
+            except Exception as e:
+                logger.error("캐시 메트릭 수집 중 오류 발생(%s): %s", name, e)
+        for family_class, metric_name, documentation, field in self.FAMILIES:
+            family = family_class(metric_name, documentation, labels=("cache",))
+            for name, s in stats.items():
+                family.add_metric((name,), s.get(field) or 0)
+            yield family
+
+
+REGISTRY.register(_CacheCollector())
+
+
+# --- 실행기 대기열 (앱이 만든 실행기가 제출/완료 시점에 직접 셈) ---
+class _TrackedExecutor:
+    def __init__(self, name: str, *, max_workers: int, **kwargs):
+        super().__init__(max_workers=max_workers, **kwargs)
+        self._pending = executor_pending_tasks.labels(name)
+        executor_workers.labels(name).set(max_workers)
+
+    def submit(self, fn, /, *args, **kwargs):
+        self._pending.inc()
+        try:
+            future = super().submit(fn, *args, **kwargs)
+        except BaseException:
+            self._pending.dec()
+            raise
+        future.add_done_callback(lambda _: self._pending.dec())
+        return future
+
+
+class TrackedThreadPoolExecutor(_TrackedExecutor, ThreadPoolExecutor):
+    """
+    제출된 작업 수를 executor_pending_tasks에 기록하는 스레드 풀 (이벤트 루프 기본 실행기로 사용 -> asyncio.to_thread)
+    """
+
+
+class TrackedProcessPoolExecutor(_TrackedExecutor, ProcessPoolExecutor):
+    """
+    제출된 작업 수를 executor_pending_tasks에 기록하는 프로세스 풀
+    """
+
+
+# --- HTTP 요청 시간 (ASGI 미들웨어) ---
+class MetricsMiddleware:
+    """
+    라우트 템플릿(/tiles/{z}/{x}/{y}.mvt 등) 단위로 요청 시간을 기록하는 ASGI 미들웨어
+    (BaseHTTPMiddleware와 달리 스트리밍 응답을 버퍼링하지 않음)
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._routes: dict | None = None
+
+    def _route_of(self, scope) -> str:
+        if self._routes is None:
+            app = scope.get("app")
+            self._routes = {route.endpoint: route.path
+                            for route in getattr(app, "routes", []) if hasattr(route, "endpoint")}
+        return self._routes.get(scope.get("endpoint"), "unmatched")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_request_seconds.labels(scope["method"], self._route_of(scope), status[0]).observe(
+                time.perf_counter() - start)
+
+
+# --- 업스트림 API 시간 (httpx 전송 계층) ---
+class InstrumentedTransport:
+    """
+    httpx 비동기 전송 계층을 감싸 업스트림별 응답 시간/상태/오류를 기록
+    """
+
+    def __init__(self, transport, upstream: str):
+        self._transport = transport
+        self._upstream = upstream
+
+    async def handle_async_request(self, request):
+        import httpx
+
+        start = time.perf_counter()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except httpx.TimeoutException:
+            upstream_errors.labels(self._upstream, "timeout").inc()
+            raise
+        except httpx.ConnectError:
+            upstream_errors.labels(self._upstream, "connect").inc()
+            raise
+        except Exception:
+            upstream_errors.labels(self._upstream, "other").inc()
+            raise
+        upstream_request_seconds.labels(self._upstream, request.method, response.status_code).observe(
+            time.perf_counter() - start)
+        return response
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+    async def __aenter__(self):
+        await self._transport.__aenter__()
+        return self
+
+    async def __aexit__(self, *args):
+        await self._transport.__aexit__(*args)
+
+
+# --- DB 쿼리 시간 (SQLAlchemy 이벤트) ---
+def _statement_kind(statement: str) -> str:
+    word = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return word if word in ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "COPY", "CREATE", "ALTER") else "OTHER"
+
+
+def instrument_engine(engine):
+    """
+    엔진의 모든 쿼리 실행 시간을 db_query_duration_seconds에 기록
+    """
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("query_start")
+        if starts:
+            db_query_seconds.labels(_statement_kind(statement)).observe(time.perf_counter() - starts.pop())
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        starts = context.connection.info.get("query_start") if context.connection is not None else None
+        if starts:
+            starts.pop()
+        db_query_errors.labels(_statement_kind(context.statement or "")).inc()
@@ -1,24 +1,66 @@
 from fastapi import FastAPI
+from fastapi.responses import Response
 from contextlib import asynccontextmanager
 import asyncio
+import logging
 
 from app.core.config import settings
-from app.api import building, coordinates, restricted_zone
-from app.services import db_service
+from app.core import http_client, log, metrics
+from app.api import building, coordinates, restricted_zone, tiles, retailers, raster, sites, changes
+from app.services import db_service, zone_job, isochrone_engine, zone_index, coverage_service, retailer_index, raster_service, dataset_version, change_service
 from fastapi.middleware.cors import CORSMiddleware
 
+logger = logging.getLogger(__name__)
+
 
 # --- FastAPI 이벤트 훅 (앱 시작/종료 시 실행) ---
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # 앱 시작 시 실행
-    print("🚀 FastAPI 시작!")
-    await asyncio.to_thread(db_service.initialize_address_table)  # address 테이블 채우기
-    await db_service.fill_missing_coordinates() # 비어 있는 좌표 채우기
-    await db_service.initialize_restricted_zone() # 제한 구역 CSV 데이터 저장
+    log.setup_logging() # 로그는 큐를 거쳐 백그라운드 스레드에서 기록 (요청 처리를 막지 않음)
+    logger.info("🚀 FastAPI 시작!")
+    # asyncio.to_thread가 쓰는 기본 스레드 풀 (대기열 길이를 /metrics에 기록)
+    executor = metrics.TrackedThreadPoolExecutor("default", max_workers=settings.THREAD_POOL_WORKERS)
+    asyncio.get_running_loop().set_default_executor(executor)
+    await http_client.init_clients() # 업스트림 공유 HTTP 클라이언트 생성
+    coverage_service.init() # 제한 구역 합집합 갱신용 락 (이 이벤트 루프에서 생성)
+    await db_service.ensure_schema() # 캐시 등 부가 테이블 생성
+    await dataset_version.load() # 응답 ETag용 데이터셋 버전
+    await change_service.prune_tombstones() # 보관 기간이 지난 삭제 기록 정리
+    await db_service.initialize_address_table()  # address 테이블 채우기
+    await retailer_index.ensure_loaded() # 적재를 건너뛴 경우 기존 테이블로 소매점 KD-tree 생성
+    # 비어 있는 좌표 채우기 (설정에 따라 백그라운드 실행 -> 앱 시작을 막지 않음)
+    backfill_task = None
+    if settings.BACKFILL_IN_BACKGROUND:
+        backfill_task = asyncio.create_task(db_service.fill_missing_coordinates())
+    else:
+        await db_service.fill_missing_coordinates()
+    await db_service.initialize_restricted_zone() # 제한 구역 CSV 변경분 반영 (바뀐 경우 메모리 인덱스 재생성)
+    if not zone_index.is_loaded(): # CSV 적재를 건너뛴 경우 기존 테이블로 인덱스 생성
+        await zone_index.reload()
+    if not coverage_service.is_loaded(): # 저장된 제한 구역 합집합 불러오기 (없으면 계산)
+        await coverage_service.load()
+    # 입점 가능 여부 래스터: 저장된 파일을 불러와 변경 범위만 갱신 (없으면 설정에 따라 새로 계산)
+    if await asyncio.to_thread(raster_service.load):
+        raster_service.schedule_refresh()
+    elif settings.RASTER_AUTO_BUILD:
+        raster_service.start_build()
+    graph_task = None
+    if settings.ISOCHRONE_ENGINE == "local": # 입점 판정 도보 거리용 보행 그래프 (백그라운드 로드)
+        graph_task = asyncio.create_task(isochrone_engine.warm_up())
     yield
     # 앱 종료 시 실행
-    print("👋 FastAPI 종료!")
+    if backfill_task and not backfill_task.done():
+        backfill_task.cancel()
+    if graph_task and not graph_task.done():
+        graph_task.cancel()
+    zone_job.cancel_all_jobs()
+    raster_service.cancel()
+    isochrone_engine.shutdown_executor()
+    await http_client.close_clients()
+    executor.shutdown(wait=False)
+    logger.info("👋 FastAPI 종료!")
+    log.shutdown_logging() # 큐에 남은 로그 모두 기록
 
 app = FastAPI(title="Tobacco Retailer Location API", lifespan=lifespan)
 
@@ -29,11 +71,17 @@ app.add_middleware(
     allow_methods=["*"],        # GET, POST, PUT, DELETE 등 모든 메서드 허용
     allow_headers=["*"],        # 모든 헤더 허용
 )
+app.add_middleware(metrics.MetricsMiddleware) # 라우트별 요청 시간 -> /metrics
 
 # --- 라우터 등록 ---
 app.include_router(building.router)
 app.include_router(coordinates.router)
 app.include_router(restricted_zone.router)
+app.include_router(tiles.router)
+app.include_router(retailers.router)
+app.include_router(raster.router)
+app.include_router(sites.router)
+app.include_router(changes.router)
 
 # --- API 엔드포인트 ---
 
@@ -42,4 +90,12 @@ async def read_root():
     return {"message": "Welcome to Tobacco Retailer Location API!"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """
+    Prometheus 수집용 메트릭 (라우트/업스트림 API/DB 쿼리 시간, 캐시 적중률, 실행기 대기열)
+    """
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
 
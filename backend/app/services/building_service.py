@@ -1,9 +1,83 @@
 # app/services/building_service.py
 import asyncio
+import json
+import logging
+import math
 import re
+import time
 from app.core.config import settings
+from app.core import metrics
 from app.services import naver_api
-from app.utils.geo import calculate_distance, convert_naver_mapcoord_to_wgs84
+from app.utils.cache import LRUCache, MISSING
+from app.utils.geo import distances_from_point, convert_naver_mapcoords_to_wgs84_array
+
+logger = logging.getLogger(__name__)
+
+# --- 상가 검색 파이프라인 캐시 ---
+# 1) 역지오코딩: 좌표를 격자 셀로 양자화하여 셀 단위로 동 이름 캐시
+# 2) 카테고리 검색: (동 이름, 카테고리) 단위로 검색 결과 캐시 (TTL + 메모리 예산 LRU)
+def _estimate_size(items) -> int:
+    return len(json.dumps(items, ensure_ascii=False).encode("utf-8"))
+
+_address_cache = LRUCache(
+    maxsize=settings.NEARBY_ADDRESS_CACHE_SIZE,
+    ttl=settings.NEARBY_ADDRESS_CACHE_TTL_SEC,
+)
+_search_cache = LRUCache(
+    maxsize=settings.NEARBY_SEARCH_CACHE_SIZE,
+    ttl=settings.NEARBY_SEARCH_CACHE_TTL_SEC,
+    max_bytes=settings.NEARBY_SEARCH_CACHE_MAX_BYTES,
+    sizeof=_estimate_size,
+)
+metrics.register_cache("reverse_geocode", _address_cache)
+metrics.register_cache("category_search", _search_cache)
+
+def _grid_cell(latitude: float, longitude: float) -> tuple[int, int]:
+    cell = settings.REVERSE_GEOCODE_GRID_DEG
+    return round(latitude / cell), round(longitude / cell)
+
+async def get_address_cached(latitude: float, longitude: float):
+    """
+    격자 셀 단위 캐시를 거쳐 좌표의 주소(동 이름)를 반환
+    """
+    key = _grid_cell(latitude, longitude)
+    address = _address_cache.get(key)
+    if address is not MISSING:
+        return address
+
+    address = await naver_api.get_address_from_coords(latitude, longitude)
+    if address:
+        _address_cache.set(key, address)
+    return address
+
+async def search_category_cached(address: str, category: str):
+    """
+    (동 이름, 카테고리) 단위 캐시를 거쳐 검색 결과를 반환
+    빈 결과는 API 오류일 수 있으므로 캐시하지 않습니다.
+    """
+    start = time.perf_counter()
+    key = (address, category)
+    items = _search_cache.get(key)
+    if items is not MISSING:
+        metrics.category_search_seconds.labels(category, "hit").observe(time.perf_counter() - start)
+        return items
+
+    items = await naver_api.search_places(f"{address} {category}") # 예: "역삼동 편의점"
+    if items:
+        _search_cache.set(key, items)
+    # 카테고리별 꼬리 지연 확인용 (상가 검색 응답 시간은 가장 느린 카테고리가 결정)
+    metrics.category_search_seconds.labels(category, "miss").observe(time.perf_counter() - start)
+    return items
+
+def get_cache_stats() -> dict:
+    return {
+        "reverse_geocode": _address_cache.stats(),
+        "category_search": _search_cache.stats(),
+    }
+
+def clear_caches():
+    _address_cache.clear()
+    _search_cache.clear()
 
 async def fetch_nearby_buildings(latitude: float, longitude: float):
     """
@@ -11,50 +85,119 @@ async def fetch_nearby_buildings(latitude: float, longitude: float):
     """
     
     # 1. 현재 위치의 주소(동 이름) 확보
-    current_address = await naver_api.get_address_from_coords(latitude, longitude)
+    current_address = await get_address_cached(latitude, longitude)
     if not current_address:
         raise ValueError("현재 위치의 주소를 찾을 수 없습니다.")
-    print(f"📍 현재 주소: {current_address}")
+    logger.debug("📍 현재 주소: %s", current_address)
 
     # 2. 카테고리별 검색 병렬 실행
     search_tasks = []
     for category in settings.TARGET_CATEGORIES:
-        query = f"{current_address} {category}" # 예: "역삼동 편의점"
-        search_tasks.append(naver_api.search_places(query))
+        search_tasks.append(search_category_cached(current_address, category))
     
     # 모든 검색 결과 수집
     results_list = await asyncio.gather(*search_tasks)
     
     # 3. 결과 필터링 (거리 50m 이내) 및 데이터 정제
-    valid_places = []
-    for items in results_list:
-        for item in items:
-            # 좌표 변환 (1e7 나누기 방식 적용)
-            place_lon, place_lat = convert_naver_mapcoord_to_wgs84(item.get('mapx'), item.get('mapy'))
-            
-            if place_lon is None or place_lat is None:
-                title = re.sub('<[^<]+?>', '', item['title'])
-                print(f"⚠️ 좌표 파싱 실패: {title} (mapx:{item.get('mapx')}, mapy:{item.get('mapy')})")
-                continue
-
-            # 거리 계산 (Clamping 적용됨)
-            distance = calculate_distance(latitude, longitude, place_lat, place_lon)
-            
-            print(f"[DEBUG] 거리 계산: {item['title']} -> {distance:.2f}m")
-
-            if distance <= settings.SEARCH_RADIUS_METER:
-                title = re.sub('<[^<]+?>', '', item['title'])
-                address = item['roadAddress'] if item['roadAddress'] else item['address']
-                valid_places.append({
-                    "name": title,
-                    "category": item['category'],
-                    "address": address,
-                    "distance": round(distance, 2),
-                    "lat": place_lat,
-                    "lon": place_lon
-                })
+    items = [item for items in results_list for item in items]
+    valid_places = filter_places(latitude, longitude, items)
 
     # 4. 그룹화
+    buildings = group_buildings(valid_places)
+
+    return {
+        "count": len(buildings),
+        "radius_meter": settings.SEARCH_RADIUS_METER,
+        "buildings": buildings
+    }
+
+async def stream_nearby_buildings(latitude: float, longitude: float):
+    """
+    fetch_nearby_buildings의 스트리밍 버전 (async generator)
+    카테고리 검색이 끝나는 순서대로 해당 카테고리의 건물 결과를 내보내고, 마지막에 전체 요약을 내보냅니다.
+    - {"event": "address", ...} → {"event": "category", ...} x 카테고리 수 → {"event": "summary", ...}
+    """
+    current_address = await get_address_cached(latitude, longitude)
+    if not current_address:
+        raise ValueError("현재 위치의 주소를 찾을 수 없습니다.")
+    yield {"event": "address", "address": current_address}
+
+    tasks = {
+        asyncio.create_task(search_category_cached(current_address, category)): category
+        for category in settings.TARGET_CATEGORIES
+    }
+    places_by_category = {}
+    try:
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                category = tasks[task]
+                places = filter_places(latitude, longitude, task.result())
+                places_by_category[category] = places
+                buildings = group_buildings(places)
+                yield {
+                    "event": "category",
+                    "category": category,
+                    "count": len(buildings),
+                    "buildings": buildings,
+                }
+    finally:
+        # 클라이언트가 중간에 연결을 끊으면 남은 검색 취소
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+    # 요약은 비스트리밍 응답과 같도록 카테고리 설정 순서대로 그룹화
+    all_places = [place for category in settings.TARGET_CATEGORIES
+                  for place in places_by_category.get(category, [])]
+    buildings = group_buildings(all_places)
+    yield {
+        "event": "summary",
+        "count": len(buildings),
+        "radius_meter": settings.SEARCH_RADIUS_METER,
+        "buildings": buildings,
+    }
+
+def filter_places(latitude: float, longitude: float, items: list[dict]) -> list[dict]:
+    """
+    검색 결과 중 SEARCH_RADIUS_METER 이내의 장소만 정제하여 반환
+    (좌표 변환과 거리 계산은 전체 결과에 대해 한 번에 배열 연산으로 수행)
+    """
+    if not items:
+        return []
+
+    # 좌표 변환 (1e7 나누기 방식 적용)
+    place_lons, place_lats = convert_naver_mapcoords_to_wgs84_array(
+        [item.get('mapx') for item in items], [item.get('mapy') for item in items])
+    # 거리 계산 (Clamping 적용됨)
+    distances = distances_from_point(latitude, longitude, place_lats, place_lons)
+
+    valid_places = []
+    for item, place_lon, place_lat, distance in zip(items, place_lons.tolist(), place_lats.tolist(), distances.tolist()):
+        if math.isnan(place_lon) or math.isnan(place_lat):
+            title = re.sub('<[^<]+?>', '', item['title'])
+            logger.warning("⚠️ 좌표 파싱 실패: %s (mapx:%s, mapy:%s)", title, item.get('mapx'), item.get('mapy'))
+            continue
+
+        if distance <= settings.SEARCH_RADIUS_METER:
+            title = re.sub('<[^<]+?>', '', item['title'])
+            address = item['roadAddress'] if item['roadAddress'] else item['address']
+            valid_places.append({
+                "name": title,
+                "category": item['category'],
+                "address": address,
+                "distance": round(distance, 2),
+                "lat": place_lat,
+                "lon": place_lon
+            })
+
+    return valid_places
+
+def group_buildings(valid_places: list[dict]) -> list[dict]:
+    """
+    장소 목록을 건물 주소 단위로 그룹화
+    """
     buildings = {}
     for place in valid_places:
         addr = place['address']
@@ -68,9 +211,4 @@ async def fetch_nearby_buildings(latitude: float, longitude: float):
             "name": place['name'],
             "category": place['category']
         })
-
-    return {
-        "count": len(buildings),
-        "radius_meter": settings.SEARCH_RADIUS_METER,
-        "buildings": list(buildings.values())
-    }
\ No newline at end of file
+    return list(buildings.values())
@@ -0,0 +1,160 @@
+# app/services/change_service.py
+import logging
+import orjson
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+# --- 델타 동기화 (/changes?since=<revision>) ---
+# impossible / address 행은 쓰기마다 전역 시퀀스(data_revision_seq)에서 revision을 받고,
+# 삭제된 행은 deleted_rows에 키가 남습니다. (트리거: db_service.CHANGE_TRACKING_STATEMENTS)
+# - 제한 구역은 id와 row_key(주소 + 구역 내용 해시), 소매점은 (지번주소, 도로명주소)로 삭제된 행을 가리킵니다.
+# 클라이언트는 마지막으로 받은 revision을 since로 보내 그 이후의 추가/수정/삭제만 받습니다.
+# - since가 change_horizon보다 오래되면(삭제 이력 정리/테이블 재생성) reset=true와 함께 전체를 다시 보냅니다.
+ZONES = "zones"
+ADDRESSES = "addresses"
+DATASETS = (ZONES, ADDRESSES)
+
+# 데이터셋 -> (테이블, 변경 행 조회 쿼리)
+CHANGED_ROWS_QUERIES = {
+    ZONES: ("impossible", text("""
+        SELECT id, row_key, landlot_address, vertices::text, revision, created_revision
+        FROM impossible
+        WHERE revision > :since
+        ORDER BY revision
+        LIMIT :limit
+    """)),
+    ADDRESSES: ("address", text("""
+        SELECT landlot_address, road_name_address, x, y, revision, created_revision
+        FROM address
+        WHERE revision > :since
+        ORDER BY revision
+        LIMIT :limit
+    """)),
+}
+
+DELETED_ROWS_QUERY = text("""
+    SELECT row_key, revision
+    FROM deleted_rows
+    WHERE table_name = :table_name AND revision > :since
+    ORDER BY revision
+    LIMIT :limit
+""")
+
+MAX_REVISION_QUERY = text("""
+    SELECT GREATEST(
+        (SELECT max(revision) FROM impossible WHERE :zones),
+        (SELECT max(revision) FROM address WHERE :addresses),
+        (SELECT max(revision) FROM deleted_rows WHERE table_name = ANY(CAST(:tables AS text[]))))
+""")
+
+HORIZON_QUERY = text("SELECT revision FROM change_horizon WHERE id = 1")
+
+PRUNE_QUERY = text("""
+    WITH pruned AS (
+        DELETE FROM deleted_rows
+        WHERE deleted_at < now() - make_interval(days => :days)
+        RETURNING revision
+    )
+    INSERT INTO change_horizon (id, revision, updated_at)
+    SELECT 1, max(revision), now() FROM pruned HAVING max(revision) IS NOT NULL
+    ON CONFLICT (id) DO UPDATE
+    SET revision = GREATEST(change_horizon.revision, EXCLUDED.revision), updated_at = EXCLUDED.updated_at
+""")
+
+
+def _zone_item(row) -> dict:
+    return {
+        "id": row[0],
+        "row_key": row[1],
+        "landlot_address": row[2],
+        "vertices": orjson.loads(row[3]) if row[3] is not None else None,
+        "revision": row[4],
+    }
+
+
+def _address_item(row) -> dict:
+    return {
+        "landlot_address": row[0],
+        "road_name_address": row[1],
+        "x": row[2],
+        "y": row[3],
+        "revision": row[4],
+    }
+
+
+_ITEM_BUILDERS = {ZONES: _zone_item, ADDRESSES: _address_item}
+
+
+def merge_page(since: int, sources: dict, limit: int, current: int | None) -> tuple[int, bool]:
+    """
+    여러 변경 목록(데이터셋별 행 + 삭제 기록)을 같은 revision 구간으로 잘라 한 페이지로 만듭니다.
+    - sources: 이름 -> revision 오름차순 (revision, ...) 목록 (각각 최대 limit개)
+    - return: (다음 요청의 since, 남은 변경 여부)
+    한 목록이라도 limit개가 꽉 찼으면, 그 목록들의 마지막 revision 중 가장 작은 값까지만 돌려줘야
+    다른 목록의 변경을 건너뛰지 않습니다.
+    """
+    full = [rows[-1][0] for rows in sources.values() if len(rows) >= limit]
+    if not full:
+        return max(current or since, since), False
+    cutoff = min(full)
+    for name, rows in sources.items():
+        sources[name] = [row for row in rows if row[0] <= cutoff]
+    return cutoff, True
+
+
+async def get_changes(since: int, datasets: list[str], limit: int | None = None) -> dict:
+    """
+    since 이후 변경된 제한 구역/소매점 행과 삭제된 행 키
+    """
+    limit = limit or settings.CHANGES_PAGE_SIZE
+    async with AsyncSessionLocal() as db:
+        # 여러 쿼리가 같은 스냅샷을 보도록 REPEATABLE READ
+        await db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        horizon = (await db.execute(HORIZON_QUERY)).scalar() or 0
+        reset = 0 < since < horizon
+        if reset:
+            since = 0
+
+        sources = {}
+        for name in datasets:
+            table, query = CHANGED_ROWS_QUERIES[name]
+            rows = (await db.execute(query, {"since": since, "limit": limit})).fetchall()
+            sources[name] = [(row[-2], row[-1], row) for row in rows]
+            # since=0(전체 동기화)이면 클라이언트에 지울 행이 없음
+            if since > 0:
+                deleted = (await db.execute(
+                    DELETED_ROWS_QUERY, {"table_name": table, "since": since, "limit": limit})).fetchall()
+                sources[f"{name}:deleted"] = [(row[1], row[0]) for row in deleted]
+        current = (await db.execute(MAX_REVISION_QUERY, {
+            "zones": ZONES in datasets,
+            "addresses": ADDRESSES in datasets,
+            "tables": [CHANGED_ROWS_QUERIES[name][0] for name in datasets],
+        })).scalar()
+
+    revision, has_more = merge_page(since, sources, limit, current)
+    result = {"since": since, "revision": revision, "has_more": has_more, "reset": reset}
+    for name in datasets:
+        build = _ITEM_BUILDERS[name]
+        added, modified = [], []
+        for row_revision, created_revision, row in sources[name]:
+            (added if created_revision > since else modified).append(build(row))
+        removed = [dict(orjson.loads(key) if isinstance(key, str) else key, revision=row_revision)
+                   for row_revision, key in sources.get(f"{name}:deleted", [])]
+        result[name] = {"added": added, "modified": modified, "removed": removed}
+    return result
+
+
+async def prune_tombstones():
+    """
+    [앱 시작 시 실행] 보관 기간이 지난 삭제 기록을 지우고 change_horizon을 올립니다.
+    """
+    try:
+        async with AsyncSessionLocal() as db:
+            await db.execute(PRUNE_QUERY, {"days": settings.CHANGES_RETENTION_DAYS})
+            await db.commit()
+    except Exception as e:
+        logger.error("변경 이력 정리 중 오류 발생: %s", e)
@@ -0,0 +1,283 @@
+# app/services/coverage_service.py
+import asyncio
+import datetime
+import hashlib
+import json
+import logging
+import shapely
+from sqlalchemy import text
+
+from app.core.database import AsyncSessionLocal
+from app.services import zone_index
+
+logger = logging.getLogger(__name__)
+
+# --- 제한 구역 전체 합집합(coverage) ---
+# 서로 많이 겹치는 제한 구역 다각형들을 하나의 MultiPolygon으로 합쳐 두고,
+# "제한 구역 중 하나라도 포함하는가" 판정과 지도 오버레이를 단일 geometry로 처리합니다.
+# - 처음(저장된 합집합이 없을 때)에는 전체 계산 → impossible_coverage 테이블 저장 + 메모리 보관
+# - 구역 추가/삭제 시에는 바뀐 구역 범위만 다시 합쳐서 갱신
+#   (initialize_restricted_zone의 CSV 변경분: apply_zone_changes / 구역 계산 작업 db 싱크: add_zone)
+# - 저장된 합집합은 구역 geometry 집합의 해시(zone_hash)가 현재 구역과 같을 때만 사용
+#   (구역 수가 같아도 내용이 바뀌었으면 다시 계산)
+_coverage = None
+_zone_count = 0
+_zone_hash: str | None = None
+_updated_at: str | None = None
+_dirty = False  # 메모리에는 반영되었지만 DB에 저장되지 않은 변경 여부
+_lock: asyncio.Lock | None = None  # 이벤트 루프 안에서 생성 (init)
+# 단순화 단계(미터, POLYGON_LOD_TOLERANCES_METER 중 하나 또는 0) -> GeoJSON 문자열
+_geojson_cache: dict[float, str] = {}
+
+METER_PER_DEGREE = zone_index.METER_PER_DEGREE
+HASH_MODULUS = 1 << 128
+
+
+def init():
+    """
+    [앱 시작 시 실행] 현재 이벤트 루프에서 갱신용 락 생성
+    """
+    global _lock
+    _lock = asyncio.Lock()
+
+
+def _get_lock() -> asyncio.Lock:
+    # init 없이 호출된 경우(스크립트 등) 처음 사용할 때 생성
+    if _lock is None:
+        init()
+    return _lock
+
+
+def zone_hash(geometries, base: str | None = None, removed=()) -> str:
+    """
+    구역 geometry 집합의 해시 (순서와 무관, 구역마다 WKB MD5를 128비트 정수로 더함)
+    - base에 기존 해시를 주면 geometries를 더하고 removed를 뺀 집합의 해시 (전체를 다시 읽지 않고 갱신)
+    """
+    def digest_sum(items) -> int:
+        return sum(int.from_bytes(hashlib.md5(wkb).digest(), "big") for wkb in shapely.to_wkb(list(items)))
+
+    total = int(base, 16) if base else 0
+    total += digest_sum(geometries) - digest_sum(removed)
+    return format(total % HASH_MODULUS, "032x")
+
+
+def get_coverage():
+    """
+    현재 합집합 geometry (아직 계산되지 않았으면 None)
+    """
+    return _coverage
+
+
+def is_loaded() -> bool:
+    return _coverage is not None
+
+
+def compute_coverage(geometries):
+    """
+    제한 구역 geometry 배열의 합집합 (항상 MultiPolygon)
+    """
+    union = shapely.union_all(geometries)
+    if union.is_empty:
+        return shapely.MultiPolygon()
+    if union.geom_type == "Polygon":
+        return shapely.MultiPolygon([union])
+    if union.geom_type != "MultiPolygon":
+        # 선/점이 섞인 GeometryCollection이면 면만 남김
+        polygons = [g for g in shapely.get_parts(union) if g.geom_type == "Polygon"]
+        return shapely.MultiPolygon(polygons)
+    return union
+
+
+def add_geometry(coverage, geometry):
+    """
+    합집합에 구역 하나를 추가한 결과
+    """
+    return compute_coverage([coverage, geometry])
+
+
+def replace_geometries(coverage, added, removed, remaining):
+    """
+    합집합에서 구역 여러 개를 빼고 더한 결과
+    - 빠지는 구역 범위만 지운 뒤, 그 범위와 겹치는 남은 구역(remaining)의 교집합과 추가된 구역을 다시 합침
+    """
+    parts = [coverage]
+    if len(removed):
+        removed_area = shapely.union_all(removed)
+        parts = [shapely.difference(coverage, removed_area)]
+        parts += [shapely.intersection(other, removed_area) for other in remaining
+                  if shapely.intersects(other, removed_area)]
+    return compute_coverage([*parts, *added])
+
+
+def contains(x: float, y: float) -> bool:
+    """
+    좌표(x:경도, y:위도)가 제한 구역 합집합에 포함되는지 여부
+    """
+    return bool(shapely.contains_xy(_coverage, x, y))
+
+
+def _set(coverage, zone_count: int, hash_value: str | None):
+    global _coverage, _zone_count, _zone_hash, _updated_at
+    shapely.prepare(coverage)
+    _coverage = coverage
+    _zone_count = zone_count
+    _zone_hash = hash_value
+    _updated_at = datetime.datetime.now().isoformat()
+    _geojson_cache.clear()
+
+
+async def _save():
+    async with AsyncSessionLocal() as db:
+        await db.execute(text("""
+            INSERT INTO impossible_coverage (id, geom, zone_count, zone_hash, updated_at)
+            VALUES (1, ST_Multi(ST_SetSRID(ST_GeomFromWKB(:wkb), 4326)), :zone_count, :zone_hash, now())
+            ON CONFLICT (id) DO UPDATE
+            SET geom = EXCLUDED.geom, zone_count = EXCLUDED.zone_count,
+                zone_hash = EXCLUDED.zone_hash, updated_at = EXCLUDED.updated_at
+        """), {"wkb": shapely.to_wkb(_coverage), "zone_count": _zone_count, "zone_hash": _zone_hash})
+        await db.commit()
+
+
+async def _load_from_db():
+    async with AsyncSessionLocal() as db:
+        return (await db.execute(text(
+            "SELECT ST_AsBinary(geom), zone_count, zone_hash FROM impossible_coverage WHERE id = 1"))).fetchone()
+
+
+async def rebuild():
+    """
+    [제한 구역 적재 시 실행] 메모리 인덱스의 모든 구역으로 합집합을 다시 계산하고 DB에 저장합니다.
+    """
+    global _dirty
+    async with _get_lock():
+        try:
+            index = zone_index.get_index()
+            if index is None:
+                logger.warning("제한 구역 인덱스가 없어 합집합을 계산할 수 없습니다.")
+                return
+            coverage = await asyncio.to_thread(compute_coverage, index.geometries)
+            _set(coverage, len(index), await asyncio.to_thread(zone_hash, index.geometries))
+            await _save()
+            _dirty = False
+            logger.info("제한 구역 합집합 계산 완료: 구역 %s개 -> 다각형 %s개", len(index), len(coverage.geoms))
+        except Exception as e:
+            logger.error("제한 구역 합집합 계산 중 오류 발생: %s", e)
+
+
+async def load():
+    """
+    [앱 시작 시 실행] DB에 저장된 합집합을 불러옵니다. (없거나 구역 해시가 현재 구역과 다르면 다시 계산)
+    - 인덱스가 없으면 비교할 수도, 다시 계산할 수도 없으므로 저장된 합집합을 그대로 사용
+    """
+    try:
+        row = await _load_from_db()
+    except Exception as e:
+        logger.error("제한 구역 합집합 조회 중 오류 발생: %s", e)
+        row = None
+
+    index = zone_index.get_index()
+    current_hash = await asyncio.to_thread(zone_hash, index.geometries) if index is not None else None
+    if row is not None and row[0] is not None and (index is None or row[2] == current_hash):
+        _set(shapely.from_wkb(bytes(row[0])), row[1], row[2])
+        logger.info("제한 구역 합집합 로드 완료: 구역 %s개", row[1])
+        return
+    if row is not None and row[0] is not None:
+        logger.info("저장된 제한 구역 합집합이 현재 구역과 달라 다시 계산합니다.")
+    await rebuild()
+
+
+async def add_zone(geometry):
+    """
+    구역 하나가 추가되었을 때 합집합을 갱신합니다. (DB 저장은 flush에서 한 번에)
+    """
+    global _dirty
+    if _coverage is None:
+        return
+    async with _get_lock():
+        coverage = await asyncio.to_thread(add_geometry, _coverage, geometry)
+        _set(coverage, _zone_count + 1, zone_hash([geometry], base=_zone_hash) if _zone_hash else None)
+        _dirty = True
+
+
+def _apply_changes(coverage, index, added, removed):
+    remaining = []
+    if removed:
+        # 삭제 구역과 겹치는 남은 구역만 (STRtree 조회)
+        remaining = index.geometries[index.tree.query(shapely.union_all(removed), predicate="intersects")]
+    return replace_geometries(coverage, added, removed, remaining)
+
+
+async def apply_zone_changes(added: list, removed: list):
+    """
+    [제한 구역 CSV 변경분 반영 시 실행] 추가/삭제된 구역 범위만 다시 합쳐 갱신하고 DB에 저장합니다.
+    - zone_index가 변경 후 구역으로 다시 만들어진 뒤에 호출
+    - 메모리에 합집합이 없으면 변경 전 구역 해시와 같은 저장된 합집합에서 시작 (없으면 전체 재계산)
+    """
+    global _dirty
+    index = zone_index.get_index()
+    if index is None:
+        return
+    current_hash = await asyncio.to_thread(zone_hash, index.geometries)
+    if _coverage is None:
+        try:
+            row = await _load_from_db()
+        except Exception as e:
+            logger.error("제한 구역 합집합 조회 중 오류 발생: %s", e)
+            row = None
+        # 변경 전 구역 집합 = 현재 구역 - 추가된 구역 + 삭제된 구역
+        previous_hash = await asyncio.to_thread(zone_hash, removed, current_hash, added)
+        if row is None or row[0] is None or row[2] != previous_hash:
+            await rebuild()
+            return
+        _set(shapely.from_wkb(bytes(row[0])), row[1], row[2])
+
+    async with _get_lock():
+        coverage = await asyncio.to_thread(_apply_changes, _coverage, index, added, removed)
+        _set(coverage, len(index), current_hash)
+        _dirty = True
+    await flush()
+    logger.info("제한 구역 합집합 갱신 완료: 추가 %s, 삭제 %s", len(added), len(removed))
+
+
+async def flush():
+    """
+    add_zone / apply_zone_changes로 바뀐 합집합을 DB에 저장합니다.
+    """
+    global _dirty
+    if not _dirty or _coverage is None:
+        return
+    async with _get_lock():
+        try:
+            await _save()
+            _dirty = False
+        except Exception as e:
+            logger.error("제한 구역 합집합 저장 중 오류 발생: %s", e)
+
+
+def to_geojson(tolerance_meter: float | None = None) -> str:
+    """
+    합집합을 GeoJSON Feature 문자열로 반환 (단순화 단계별로 캐시)
+    """
+    level = zone_index.select_level(tolerance_meter)
+    cached = _geojson_cache.get(level)
+    if cached is not None:
+        return cached
+
+    geometry = _coverage
+    if level > 0:
+        geometry = shapely.simplify(geometry, level / METER_PER_DEGREE, preserve_topology=True)
+    properties = json.dumps({"zone_count": _zone_count, "tolerance_meter": level, "updated_at": _updated_at})
+    feature = f'{{"type":"Feature","properties":{properties},"geometry":{shapely.to_geojson(geometry)}}}'
+    _geojson_cache[level] = feature
+    return feature
+
+
+def get_stats() -> dict:
+    return {
+        "loaded": _coverage is not None,
+        "zone_count": _zone_count,
+        "zone_hash": _zone_hash,
+        "polygon_count": len(_coverage.geoms) if _coverage is not None else 0,
+        "updated_at": _updated_at,
+        "dirty": _dirty,
+    }
@@ -0,0 +1,79 @@
+# app/services/dataset_version.py
+import hashlib
+import logging
+import time
+from sqlalchemy import text
+
+from app.core.database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+# --- 데이터셋 버전 (조건부 GET / 응답 캐시 키) ---
+# 제한 구역(ZONES)과 소매점 주소(ADDRESSES)는 적재/백필/구역 계산 작업이 끝날 때만 바뀝니다.
+# 바뀔 때마다 dataset_version 테이블의 버전을 올리고, 그 버전으로 ETag와 응답 캐시 키를 만듭니다.
+# (DB에 저장하므로 앱을 다시 시작해도 같은 버전 = 같은 데이터가 유지됩니다)
+ZONES = "zones"
+ADDRESSES = "addresses"
+
+_versions: dict[str, int] = {}
+
+LOAD_QUERY = text("SELECT name, version FROM dataset_version")
+
+BUMP_QUERY = text("""
+    INSERT INTO dataset_version (name, version, updated_at)
+    VALUES (:name, 1, now())
+    ON CONFLICT (name) DO UPDATE
+    SET version = dataset_version.version + 1, updated_at = now()
+    RETURNING version
+""")
+
+
+def _fallback_version() -> int:
+    # DB를 쓸 수 없을 때: 재시작 전후로 겹치지 않도록 현재 시각(ms)을 버전으로 사용
+    return time.time_ns() // 1_000_000
+
+
+def get(name: str) -> int:
+    """
+    데이터셋의 현재 버전
+    """
+    if name not in _versions:
+        _versions[name] = _fallback_version()
+    return _versions[name]
+
+
+async def load():
+    """
+    [앱 시작 시 실행] DB에 저장된 버전을 읽어 옵니다.
+    """
+    try:
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(LOAD_QUERY)).fetchall()
+        _versions.update({row[0]: int(row[1]) for row in rows})
+        logger.info("데이터셋 버전 로드 완료: %s", _versions)
+    except Exception as e:
+        logger.error("데이터셋 버전 로드 중 오류 발생: %s", e)
+
+
+async def bump(name: str) -> int:
+    """
+    데이터셋이 바뀌었을 때 버전을 올립니다. (메모리 인덱스 갱신이 끝난 뒤 호출)
+    """
+    try:
+        async with AsyncSessionLocal() as db:
+            version = (await db.execute(BUMP_QUERY, {"name": name})).scalar_one()
+            await db.commit()
+    except Exception as e:
+        logger.error("데이터셋 버전 갱신 중 오류 발생: %s", e)
+        version = max(get(name) + 1, _fallback_version())
+    _versions[name] = int(version)
+    return _versions[name]
+
+
+def etag(name: str, *variant) -> str:
+    """
+    데이터셋 버전 + 요청 변형(bbox, 형식 등)으로 만든 약한 ETag
+    (압축 방식에 상관없이 같은 내용이므로 W/ 사용)
+    """
+    digest = hashlib.sha1(repr(variant).encode()).hexdigest()[:12]
+    return f'W/"{name}-{get(name)}-{digest}"'
@@ -1,221 +1,715 @@
 # app/services/db_service.py
+import logging
+import numpy as np
 import pandas as pd
+import shapely
 import asyncio
+import datetime
+import hashlib
+import json
 import os
+import time
 from sqlalchemy import text
-import traceback
 
 from app.core.config import settings
-from app.core.database import sync_engine, SessionLocal
-from app.utils.geo import convert_epsg5174_to_wgs84
+from app.core.database import async_engine, AsyncSessionLocal
+from app.utils.geo import convert_epsg5174_to_wgs84_array
 from app.services.naver_api import get_coordinates_from_address
+from app.services import zone_index, tile_service, coverage_service, eligibility_service, retailer_index, raster_service, dataset_version
+
+logger = logging.getLogger(__name__)
+
+# --- 부가 테이블 생성 (init_db.sql 이후 추가된 스키마) ---
+# DB 볼륨이 이미 존재하면 init_db.sql이 다시 실행되지 않으므로, 앱 시작 시 멱등하게 생성합니다.
+SCHEMA_STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS geocode_cache (
+        address_key TEXT PRIMARY KEY,
+        found BOOLEAN NOT NULL,
+        x DOUBLE PRECISION,
+        y DOUBLE PRECISION,
+        expires_at TIMESTAMPTZ NOT NULL,
+        updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    )
+    """,
+    # 데이터 적재 이력 (원본 파일 지문 비교로 변경 없는 적재를 건너뜀)
+    """
+    CREATE TABLE IF NOT EXISTS dataset_meta (
+        name TEXT PRIMARY KEY,
+        fingerprint TEXT NOT NULL,
+        row_count BIGINT,
+        loaded_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    )
+    """,
+    # 제한 구역 식별자 (메모리 인덱스/일괄 포함 여부 조회 결과에서 사용)
+    "ALTER TABLE impossible ADD COLUMN IF NOT EXISTS id BIGSERIAL PRIMARY KEY",
+    # 제한 구역 전체 합집합 (단일 행)
+    """
+    CREATE TABLE IF NOT EXISTS impossible_coverage (
+        id SMALLINT PRIMARY KEY CHECK (id = 1),
+        geom geometry(MultiPolygon, 4326) NOT NULL,
+        zone_count INTEGER NOT NULL,
+        updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    )
+    """,
+    # 데이터셋 버전 (제한 구역/소매점 데이터가 바뀔 때마다 증가, ETag에 사용)
+    """
+    CREATE TABLE IF NOT EXISTS dataset_version (
+        name TEXT PRIMARY KEY,
+        version BIGINT NOT NULL,
+        updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    )
+    """,
+    # 제한 구역 행 식별 키 (zone_row_key, 증분 비교와 삭제 기록에 사용)
+    "ALTER TABLE impossible ADD COLUMN IF NOT EXISTS row_key TEXT",
+    "CREATE INDEX IF NOT EXISTS idx_impossible_row_key ON impossible (row_key)",
+    # 합집합을 만든 구역 집합의 해시 (coverage_service.zone_hash, 저장된 합집합 검증용)
+    "ALTER TABLE impossible_coverage ADD COLUMN IF NOT EXISTS zone_hash TEXT",
+]
+
+# --- 행 단위 변경 추적 (/changes 델타 동기화) ---
+# impossible / address의 INSERT·UPDATE마다 전역 시퀀스에서 새 revision을 받고,
+# DELETE는 deleted_rows에 행 키와 revision을 남깁니다. (tombstone)
+# 쓰기 문장마다 트랜잭션 advisory lock을 먼저 잡아 revision 순서와 커밋 순서를 맞춥니다.
+# (늦게 커밋된 작은 revision을 since 이후 조회에서 놓치지 않도록)
+CHANGE_TRACKING_STATEMENTS = [
+    "CREATE SEQUENCE IF NOT EXISTS data_revision_seq",
+    """
+    CREATE TABLE IF NOT EXISTS deleted_rows (
+        table_name TEXT NOT NULL,
+        row_key JSONB NOT NULL,
+        revision BIGINT NOT NULL DEFAULT nextval('data_revision_seq'),
+        deleted_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_deleted_rows_revision ON deleted_rows (table_name, revision)",
+    # 이 revision 이전의 변경 이력은 남아 있지 않음 (tombstone 정리, 테이블 재생성)
+    """
+    CREATE TABLE IF NOT EXISTS change_horizon (
+        id SMALLINT PRIMARY KEY CHECK (id = 1),
+        revision BIGINT NOT NULL,
+        updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    )
+    """,
+    """
+    CREATE OR REPLACE FUNCTION lock_data_revision() RETURNS trigger AS $$
+    BEGIN
+        PERFORM pg_advisory_xact_lock(hashtext('data_revision_seq'));
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION set_row_revision() RETURNS trigger AS $$
+    BEGIN
+        NEW.revision := nextval('data_revision_seq');
+        IF TG_OP = 'INSERT' THEN
+            NEW.created_revision := NEW.revision;
+        END IF;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION record_row_deletion() RETURNS trigger AS $$
+    DECLARE
+        row_key JSONB := '{}'::jsonb;
+        col TEXT;
+    BEGIN
+        FOREACH col IN ARRAY TG_ARGV LOOP
+            row_key := row_key || jsonb_build_object(col, to_jsonb(OLD) -> col);
+        END LOOP;
+        INSERT INTO deleted_rows (table_name, row_key) VALUES (TG_TABLE_NAME, row_key);
+        RETURN OLD;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+]
+
+# 변경 추적 대상 테이블 -> 삭제 기록에 남길 키 컬럼
+TRACKED_TABLE_KEYS = {
+    # 같은 지번주소에 구역이 여러 개일 수 있으므로 구역 내용으로 만든 row_key로 구분
+    "impossible": ["id", "row_key"],
+    "address": ["landlot_address", "road_name_address"],
+}
+
+def change_tracking_statements(table: str) -> list[str]:
+    """
+    테이블에 revision 컬럼과 변경 추적 트리거를 추가하는 문장 목록 (멱등)
+    - created_revision: 추적 시작 전부터 있던 행은 0
+    """
+    keys = ", ".join(f"'{col}'" for col in TRACKED_TABLE_KEYS[table])
+    return [
+        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS revision BIGINT NOT NULL DEFAULT nextval('data_revision_seq')",
+        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS created_revision BIGINT NOT NULL DEFAULT 0",
+        f"CREATE INDEX IF NOT EXISTS idx_{table}_revision ON {table} (revision)",
+        f"""
+        CREATE OR REPLACE TRIGGER {table}_revision_lock
+        BEFORE INSERT OR UPDATE OR DELETE ON {table}
+        FOR EACH STATEMENT EXECUTE FUNCTION lock_data_revision()
+        """,
+        f"""
+        CREATE OR REPLACE TRIGGER {table}_revision
+        BEFORE INSERT OR UPDATE ON {table}
+        FOR EACH ROW EXECUTE FUNCTION set_row_revision()
+        """,
+        f"""
+        CREATE OR REPLACE TRIGGER {table}_tombstone
+        AFTER DELETE ON {table}
+        FOR EACH ROW EXECUTE FUNCTION record_row_deletion({keys})
+        """,
+    ]
+
+RESET_CHANGE_HORIZON_QUERY = text("""
+    INSERT INTO change_horizon (id, revision, updated_at)
+    VALUES (1, nextval('data_revision_seq'), now())
+    ON CONFLICT (id) DO UPDATE SET revision = EXCLUDED.revision, updated_at = EXCLUDED.updated_at
+""")
+
+async def ensure_schema():
+    """
+    [앱 시작 시 실행]
+    캐시 등 부가 테이블이 없으면 생성합니다.
+    """
+    statements = SCHEMA_STATEMENTS + CHANGE_TRACKING_STATEMENTS + change_tracking_statements("impossible")
+    for statement in statements:
+        try:
+            async with async_engine.begin() as conn:
+                await conn.execute(text(statement))
+        except Exception as e:
+            logger.error("❌ 부가 테이블 생성 중 오류 발생: %s", e)
+    # address는 첫 적재 때 생성되므로, 이미 있는 경우에만 여기서 변경 추적을 붙임
+    try:
+        async with async_engine.begin() as conn:
+            if (await conn.execute(text("SELECT to_regclass('address') IS NOT NULL"))).scalar():
+                for statement in change_tracking_statements("address"):
+                    await conn.execute(text(statement))
+    except Exception as e:
+        logger.error("❌ address 변경 추적 설정 중 오류 발생: %s", e)
+    logger.info("✅ 부가 테이블 확인 완료.")
 
 # --- address.csv → DB 로딩 함수 ---
-def initialize_address_table():
+# 적재 로직이 바뀌면 올려서, 원본 CSV가 같아도 다시 적재되도록 합니다.
+ADDRESS_LOADER_VERSION = "2"
+ADDRESS_COLUMNS = ["landlot_address", "road_name_address", "x", "y"]
+
+# init_db.sql과 동일한 address 스키마 (geom 생성 컬럼 + GiST 인덱스)
+ADDRESS_TABLE_STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS address (
+        landlot_address VARCHAR(500) NOT NULL,
+        road_name_address VARCHAR(500),
+        x DOUBLE PRECISION NOT NULL,
+        y DOUBLE PRECISION NOT NULL,
+        geom geometry(Point, 4326) GENERATED ALWAYS AS (ST_SetSRID(ST_MakePoint(x, y), 4326)) STORED
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_address_geom ON address USING GIST (geom)",
+]
+
+def file_fingerprint(path: str) -> str:
+    """
+    원본 파일 내용 + 적재 로직 버전의 SHA-256
+    """
+    digest = hashlib.sha256(ADDRESS_LOADER_VERSION.encode())
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def prepare_address_frame(path: str) -> pd.DataFrame:
+    """
+    address.csv를 읽어 결측치 처리 및 좌표 변환(EPSG:5174 -> WGS84)을 한 번에 수행합니다.
+    - return: landlot_address, road_name_address, x(경도), y(위도) 컬럼의 DataFrame (변환 실패 좌표는 -1.0)
+    """
+    df = pd.read_csv(path, usecols=lambda col: col in ADDRESS_COLUMNS)
+    
+    # 결측치 처리
+    df[['landlot_address', 'road_name_address']] = df[['landlot_address', 'road_name_address']].fillna("비어있음")
+    
+    # 좌표 데이터 전처리 (숫자형 변환, 에러 시 -1.0) 후 전체 좌표를 한 번에 변환 (변환 실패: -1.0 유지)
+    lons, lats = convert_epsg5174_to_wgs84_array(df['x'].to_numpy(), df['y'].to_numpy())
+    df['x'] = np.where(np.isnan(lons), -1.0, lons) # 경도 (Longitude) -> 127.xxx
+    df['y'] = np.where(np.isnan(lats), -1.0, lats) # 위도 (Latitude) -> 37.xxx
+    
+    # 같은 (지번주소, 도로명주소) 쌍은 한 번만 적재 (증분 비교의 키)
+    return df.drop_duplicates(subset=['landlot_address', 'road_name_address'], keep='first')[ADDRESS_COLUMNS]
+
+async def _address_table_state(conn) -> tuple[bool, bool]:
+    """
+    address 테이블 존재 여부와 init_db.sql 스키마(geom 컬럼) 여부를 반환
+    (예전 to_sql 방식으로 만들어진 테이블에는 geom 컬럼과 공간 인덱스가 없음)
+    """
+    result = await conn.execute(text("""
+        SELECT to_regclass('address') IS NOT NULL, EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = 'address' AND column_name = 'geom'
+        )
+    """))
+    exists, has_geom = result.fetchone()
+    return exists, has_geom
+
+def _address_records(df: pd.DataFrame):
+    """
+    COPY(copy_records_to_table)에 넘길 (지번주소, 도로명주소, x, y) 튜플 목록
+    """
+    return list(zip(
+        df['landlot_address'].astype(str).tolist(),
+        df['road_name_address'].astype(str).tolist(),
+        df['x'].astype(float).tolist(),
+        df['y'].astype(float).tolist(),
+    ))
+
+async def _on_address_changed():
+    """
+    address 좌표가 바뀐 뒤 소매점 위치를 쓰는 메모리 인덱스/캐시를 갱신
+    """
+    await retailer_index.reload()
+    tile_service.invalidate() # 소매점 위치 레이어 갱신
+    eligibility_service.invalidate()
+    raster_service.schedule_refresh()
+    await dataset_version.bump(dataset_version.ADDRESSES)
+
+async def initialize_address_table():
     """
-    앱 시작 시 실행: 기존 테이블 삭제 후 CSV 데이터를 읽어 좌표 변환(EPSG:5174 -> WGS84) 후 DB에 적재합니다.
+    앱 시작 시 실행: CSV 데이터를 읽어 좌표 변환(EPSG:5174 -> WGS84) 후 DB에 적재합니다.
+    - 원본 파일 지문(SHA-256)이 마지막 적재와 같으면 아무것도 하지 않습니다.
+    - 변경된 경우 COPY로 임시 테이블에 올린 뒤 한 트랜잭션에서 address와 비교하여 추가/수정/삭제만 반영합니다.
+      (테이블을 지우지 않으므로 geom 생성 컬럼과 GiST 인덱스가 유지되고, 백필로 채운 좌표도 보존됩니다.)
+    - return: 데이터 변경 여부
     """
     try:
-        print("🔄 DB 초기화 및 데이터 적재 작업을 시작합니다...")
-        
-        # sync_engine을 사용하여 DB 연결
-        with sync_engine.connect() as conn:
-            # 1. 기존 테이블 강제 삭제 (개발용 초기화 로직)
-            print("🗑️ 기존 address 테이블 삭제 중 (IF EXISTS)...")
-            conn.execute(text("DROP TABLE IF EXISTS address CASCADE"))
-            conn.commit()
-            print("✅ 기존 테이블 삭제 완료.")
-
-            # 2. CSV 로드
-            print(f"📂 CSV 파일 로드 중: {settings.CSV_PATH}")
-            df = pd.read_csv(settings.CSV_PATH)
+        logger.info("🔄 address 데이터 적재 작업을 시작합니다...")
+        if not os.path.exists(settings.CSV_PATH):
+            logger.warning("address CSV 파일이 없습니다: %s", settings.CSV_PATH)
+            return False
+        
+        fingerprint = await asyncio.to_thread(file_fingerprint, settings.CSV_PATH)
+        
+        async with async_engine.begin() as conn:
+            # 1. 스키마 확인 (예전 방식 테이블은 init_db.sql 스키마로 재생성)
+            exists, has_geom = await _address_table_state(conn)
+            row = (await conn.execute(
+                text("SELECT fingerprint FROM dataset_meta WHERE name = 'address'"))).fetchone()
+            if exists and has_geom and row and row[0] == fingerprint:
+                logger.info("✅ address CSV가 마지막 적재 이후 변경되지 않았습니다. 적재를 건너뜁니다.")
+                return False
             
-            # 결측치 처리
-            df[['landlot_address', 'road_name_address']] = df[['landlot_address', 'road_name_address']].fillna("비어있음")
+            if exists and not has_geom:
+                logger.info("🗑️ geom 컬럼이 없는 예전 address 테이블을 재생성합니다...")
+                await conn.execute(text("DROP TABLE address CASCADE"))
+                await conn.execute(RESET_CHANGE_HORIZON_QUERY) # 이전 변경 이력은 이어 받을 수 없음
+            for statement in ADDRESS_TABLE_STATEMENTS + change_tracking_statements("address"):
+                await conn.execute(text(statement))
             
-            # 좌표 데이터 전처리 (숫자형 변환, 에러 시 -1.0)
-            if 'x' in df.columns:
-                df['x'] = pd.to_numeric(df['x'], errors='coerce').fillna(-1.0)
-            if 'y' in df.columns:
-                df['y'] = pd.to_numeric(df['y'], errors='coerce').fillna(-1.0)
-
-            # 3. 메모리 상에서 좌표 변환 수행 (EPSG:5174 -> WGS84)
-            print("🌍 좌표 변환 수행 중 (EPSG:5174 -> WGS84)...")
+            # 2. CSV 로드 + 좌표 변환 (한 번의 배열 연산, 이벤트 루프를 막지 않도록 스레드에서 실행)
+            logger.info("📂 CSV 파일 로드 및 좌표 변환 중: %s", settings.CSV_PATH)
+            df = await asyncio.to_thread(prepare_address_frame, settings.CSV_PATH)
+            records = await asyncio.to_thread(_address_records, df)
             
-            # 변환 로직 적용 함수
-            def apply_conversion(row):
-                orig_x = row['x']
-                orig_y = row['y']
-                
-                # utils/geo.py의 함수 사용하여 변환 (lat: 위도, lon: 경도)
-                lon, lat = convert_epsg5174_to_wgs84(orig_x, orig_y)
-                
-                if lat is not None and lon is not None:
-                    # 변환 성공: 경도(x), 위도(y) 반환
-                    return lon, lat 
-                else:
-                    # 변환 실패: -1.0 유지
-                    return -1.0, -1.0
-
-            # apply 함수 실행하여 새로운 좌표 컬럼 생성
-            converted_coords = df.apply(apply_conversion, axis=1, result_type='expand')
+            # 3. COPY로 임시 테이블에 적재 (asyncpg 바이너리 COPY)
+            await conn.execute(text("""
+                CREATE TEMP TABLE address_staging (
+                    landlot_address TEXT, road_name_address TEXT,
+                    x DOUBLE PRECISION, y DOUBLE PRECISION
+                ) ON COMMIT DROP
+            """))
+            raw = await conn.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                "address_staging", records=records, columns=ADDRESS_COLUMNS)
             
-            # 변환된 값을 원본 df의 x, y 컬럼에 덮어쓰기
-            df['x'] = converted_coords[0] # 경도 (Longitude) -> 127.xxx
-            df['y'] = converted_coords[1] # 위도 (Latitude) -> 37.xxx
-
-            # 4. DB에 저장 (테이블 새로 생성됨)
-            df.to_sql('address', con=sync_engine, if_exists='replace', index=False)
-            print("✅ 데이터 삽입 완료! (address 테이블 재생성됨)")
-            print("   👉 저장된 데이터 기준: x=경도(Longitude), y=위도(Latitude)")
+            # 4. address와 비교하여 변경분만 반영
+            result = await conn.execute(text("""
+                DELETE FROM address a
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM address_staging s
+                    WHERE s.landlot_address = a.landlot_address
+                      AND s.road_name_address IS NOT DISTINCT FROM a.road_name_address)
+            """))
+            deleted = result.rowcount
+            # 원본 좌표가 없는(-1) 행은 백필로 채운 기존 좌표를 유지
+            result = await conn.execute(text("""
+                UPDATE address a SET x = s.x, y = s.y
+                FROM address_staging s
+                WHERE s.landlot_address = a.landlot_address
+                  AND s.road_name_address IS NOT DISTINCT FROM a.road_name_address
+                  AND s.x != -1 AND s.y != -1
+                  AND (a.x, a.y) IS DISTINCT FROM (s.x, s.y)
+            """))
+            updated = result.rowcount
+            result = await conn.execute(text("""
+                INSERT INTO address (landlot_address, road_name_address, x, y)
+                SELECT s.landlot_address, s.road_name_address, s.x, s.y
+                FROM address_staging s
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM address a
+                    WHERE a.landlot_address = s.landlot_address
+                      AND a.road_name_address IS NOT DISTINCT FROM s.road_name_address)
+            """))
+            inserted = result.rowcount
+            
+            await conn.execute(text("""
+                INSERT INTO dataset_meta (name, fingerprint, row_count, loaded_at)
+                VALUES ('address', :fingerprint, :row_count, now())
+                ON CONFLICT (name) DO UPDATE
+                SET fingerprint = EXCLUDED.fingerprint, row_count = EXCLUDED.row_count, loaded_at = EXCLUDED.loaded_at
+            """), {"fingerprint": fingerprint, "row_count": len(df)})
+        
+        logger.info("✅ address 적재 완료: 추가 %s, 수정 %s, 삭제 %s (총 %s행)", inserted, updated, deleted, len(df))
+        logger.info("   👉 저장된 데이터 기준: x=경도(Longitude), y=위도(Latitude)")
+        changed = (inserted + updated + deleted) > 0
+        if changed:
+            await _on_address_changed()
+        return changed
 
     except Exception as e:
-        print(f"❌ DB 초기화 중 오류 발생: {e}")
-        traceback.print_exc()
+        logger.exception("❌ DB 초기화 중 오류 발생: %s", e)
+        return False
+
+# 좌표 백필 진행 상황 (/geocode/backfill-status 에서 조회)
+backfill_progress = {
+    "running": False,
+    "total": 0,
+    "done": 0,
+    "updated": 0,
+    "failed": 0,
+    "started_at": None,
+    "finished_at": None,
+}
+
+BACKFILL_UPDATE_QUERY = text("""
+    UPDATE address AS a
+    SET x = v.x, y = v.y
+    FROM unnest(
+        CAST(:landlot_addresses AS text[]),
+        CAST(:road_name_addresses AS text[]),
+        CAST(:xs AS double precision[]),
+        CAST(:ys AS double precision[])
+    ) AS v(landlot_address, road_name_address, x, y)
+    WHERE a.landlot_address = v.landlot_address
+      AND a.road_name_address IS NOT DISTINCT FROM v.road_name_address
+      AND (a.x = -1 OR a.y = -1)
+""")
+
+async def _write_backfill_batch(batch):
+    """
+    백필 결과를 한 번의 UPDATE(unnest 배열 조인)로 반영하고 커밋합니다.
+    """
+    async with AsyncSessionLocal() as db:
+        await db.execute(BACKFILL_UPDATE_QUERY, {
+            "landlot_addresses": [item[0] for item in batch],
+            "road_name_addresses": [item[1] for item in batch],
+            "xs": [float(item[2]) for item in batch],
+            "ys": [float(item[3]) for item in batch],
+        })
+        await db.commit()
+
+async def _missing_coordinate_rows():
+    query = text("""
+        SELECT DISTINCT landlot_address, road_name_address
+        FROM address
+        WHERE x = -1 or y = -1
+    """)
+    async with AsyncSessionLocal() as db:
+        return (await db.execute(query)).fetchall()
 
 async def fill_missing_coordinates():
     """
     [앱 시작 시 실행] 
     DB에서 좌표(x, y)가 비어 있는(-1) 레코드를 찾아 실제 좌표로 채워넣는 함수
+    - 동시 요청 수(BACKFILL_CONCURRENCY)만큼 병렬로 지오코딩 (속도는 naver_api의 토큰 버킷이 쿼터에 맞춰 제한)
+    - 결과는 BACKFILL_BATCH_SIZE 단위로 모아서 한 번의 UPDATE로 반영
+    - UPDATE가 실패하면 나머지 작업을 멈추고(네이버 호출 중단), 모아 둔 결과를 한 번 더 반영해 봅니다.
+      (그래도 실패한 주소는 좌표가 -1로 남아 다음 백필에서 다시 변환)
     """
-    db = SessionLocal()
     try:
-        query = text("SELECT landlot_address, road_name_address FROM address WHERE x = -1 or y = -1")
-        rows_to_update = await asyncio.to_thread(lambda: db.execute(query).fetchall())
+        rows_to_update = await _missing_coordinate_rows()
         
         if not rows_to_update:
-            print("비어 있는 좌표가 없습니다.")
+            logger.info("비어 있는 좌표가 없습니다.")
             return
         
-        print(f"총 {len(rows_to_update)}개의 좌표를 변환합니다.")
+        total = len(rows_to_update)
+        logger.info("총 %s개의 좌표를 변환합니다.", total)
+        backfill_progress.update({
+            "running": True, "total": total, "done": 0, "updated": 0, "failed": 0,
+            "started_at": datetime.datetime.now().isoformat(), "finished_at": None,
+        })
+        started = time.monotonic()
         
+        queue: asyncio.Queue = asyncio.Queue()
         for row in rows_to_update:
-            landlot_addr, road_addr = row
-            address = landlot_addr if landlot_addr != "비어있음" else road_addr
-            coordinates = await get_coordinates_from_address(address)
+            queue.put_nowait(tuple(row))
+        
+        pending = []
+        write_lock = asyncio.Lock()
+        
+        async def flush(force: bool = False):
+            nonlocal pending
+            if not pending or (not force and len(pending) < settings.BACKFILL_BATCH_SIZE):
+                return
+            batch, pending = pending, []
+            try:
+                async with write_lock:
+                    await _write_backfill_batch(batch)
+            except BaseException: # 취소된 경우 포함
+                pending = batch + pending # 반영하지 못한 결과는 버리지 않고 되돌려 둠
+                raise
+            backfill_progress["updated"] += len(batch)
             
-            if coordinates:
-                x, y = coordinates
-                update_query = text("UPDATE address SET x = :x, y = :y WHERE landlot_address = :landlot_address")
-                await asyncio.to_thread(
-                    db.execute, update_query, {"x": x, "y": y, "landlot_address": address}
-                )
-            else:
-                print(f"비어 있는 좌표 변환 실패: address={address}")
-            await asyncio.sleep(0.1)
-        
-        await asyncio.to_thread(db.commit)
-        print("비어 있는 좌표 업데이트 완료")
+            done = backfill_progress["done"]
+            elapsed = time.monotonic() - started
+            rate = done / elapsed if elapsed > 0 else 0.0
+            eta = (total - done) / rate if rate > 0 else 0.0
+            logger.info("좌표 백필 진행: %s/%s (%.1f%%), 업데이트 %s, 실패 %s, %.1f건/s, 남은 시간 약 %.0fs",
+                        done, total, done / total * 100,
+                        backfill_progress['updated'], backfill_progress['failed'], rate, eta)
+        
+        async def worker():
+            while True:
+                try:
+                    landlot_addr, road_addr = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                
+                address = landlot_addr if landlot_addr != "비어있음" else road_addr
+                coordinates = await get_coordinates_from_address(address)
+                backfill_progress["done"] += 1
+                
+                if coordinates:
+                    x, y = coordinates
+                    pending.append((landlot_addr, road_addr, x, y))
+                    await flush()
+                else:
+                    backfill_progress["failed"] += 1
+                    logger.warning("비어 있는 좌표 변환 실패: address=%s", address)
+        
+        workers = [asyncio.create_task(worker())
+                   for _ in range(min(settings.BACKFILL_CONCURRENCY, total))]
+        try:
+            await asyncio.gather(*workers)
+        except Exception:
+            # 한 작업이 실패하면 나머지 작업도 취소
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            try:
+                await flush(force=True)
+            except Exception as e:
+                logger.error("좌표 %s건을 반영하지 못했습니다 (다음 백필에서 다시 변환): %s", len(pending), e)
+            raise
+        await flush(force=True)
+        
+        logger.info("비어 있는 좌표 업데이트 완료 (%.1fs)", time.monotonic() - started)
+        if backfill_progress["updated"]:
+            await _on_address_changed()
     
     except Exception as e:
-        print(f"비어 있는 좌표 업데이트 중 오류 발생: {e}")
-        await asyncio.to_thread(db.rollback)
+        logger.error("비어 있는 좌표 업데이트 중 오류 발생: %s", e)
     finally:
-        db.close()
+        backfill_progress["running"] = False
+        backfill_progress["finished_at"] = datetime.datetime.now().isoformat()
         
+ZONE_COLUMNS = ["landlot_address", "centroid_x", "centroid_y", "polygon_geom", "vertices"]
+ZONE_STAGING_COLUMNS = ZONE_COLUMNS + ["row_key", "position"]
+
+def zone_row_key(landlot_address, centroid_x, centroid_y, polygon, vertices) -> str:
+    """
+    제한 구역 행 식별 키: 주소 + 구역 내용(중심점, 다각형, 꼭짓점)의 MD5
+    한 지번주소에 제한 구역이 여러 개일 수 있으므로 주소만으로는 구분하지 않습니다.
+    - polygon: WKT 문자열 / WKB 바이트 / Shapely 객체, vertices: JSON 문자열 또는 파싱된 값
+      (CSV 값과 DB에서 읽은 값이 같은 키가 되도록 다각형은 WKB, 꼭짓점은 JSON으로 정규화)
+    """
+    if isinstance(polygon, str):
+        polygon = shapely.from_wkt(polygon)
+    elif isinstance(polygon, (bytes, bytearray, memoryview)):
+        polygon = shapely.from_wkb(bytes(polygon))
+    if isinstance(vertices, str):
+        vertices = json.loads(vertices)
+    parts = [
+        landlot_address or "",
+        "" if centroid_x is None else repr(float(centroid_x)),
+        "" if centroid_y is None else repr(float(centroid_y)),
+        shapely.to_wkb(polygon, hex=True) if polygon is not None else "",
+        json.dumps(vertices, separators=(",", ":")),
+    ]
+    return hashlib.md5("|".join(parts).encode()).hexdigest()
+
+def diff_zone_rows(current: list[tuple[int, str]], incoming: list[str]) -> tuple[list[int], list[int]]:
+    """
+    (id, row_key) 목록인 현재 행과 새 행 키 목록을 비교
+    - return: (삭제할 id 목록, 추가할 새 행 위치 목록)
+    완전히 같은 행이 여러 번 있어도 모두 유지하도록 키별 개수까지 맞춥니다. (남는 행은 id가 작은 것부터 유지)
+    다각형이 바뀐 구역은 예전 행 삭제 + 새 행 추가로 반영합니다.
+    """
+    available: dict[str, list[int]] = {}
+    for row_id, key in sorted(current, reverse=True):
+        available.setdefault(key, []).append(row_id)
+    inserts = []
+    for position, key in enumerate(incoming):
+        ids = available.get(key)
+        if ids:
+            ids.pop()
+        else:
+            inserts.append(position)
+    deletes = sorted(row_id for ids in available.values() for row_id in ids)
+    return deletes, inserts
+
+def _zone_records(df: pd.DataFrame):
+    """
+    COPY(copy_records_to_table)에 넘길 제한 구역 튜플 목록 (결측값은 None, 끝에 row_key와 행 위치)
+    """
+    def column(name, cast):
+        return [cast(v) if pd.notna(v) else None for v in df[name].tolist()]
+    rows = zip(
+        column("landlot_address", str),
+        column("centroid_x", float),
+        column("centroid_y", float),
+        column("polygon_geom", str),
+        column("vertices", str),
+    )
+    return [(*row, zone_row_key(*row), position) for position, row in enumerate(rows)]
+
+LEGACY_ZONE_ROWS_QUERY = text("""
+    SELECT id, landlot_address, centroid_x, centroid_y, ST_AsBinary(polygon_geom), vertices::text
+    FROM impossible
+    WHERE row_key IS NULL
+""")
+
+FILL_ZONE_ROW_KEYS_QUERY = text("""
+    UPDATE impossible i SET row_key = v.row_key
+    FROM unnest(CAST(:ids AS bigint[]), CAST(:row_keys AS text[])) AS v(id, row_key)
+    WHERE i.id = v.id
+""")
+
+async def _fill_zone_row_keys(conn):
+    """
+    row_key가 없는 예전 행에 키를 채움 (한 번만, 이 행들은 row_key와 함께 /changes에 수정으로 한 번 나감)
+    """
+    legacy = (await conn.execute(LEGACY_ZONE_ROWS_QUERY)).fetchall()
+    if not legacy:
+        return
+    keys = await asyncio.to_thread(lambda: [zone_row_key(*row[1:]) for row in legacy])
+    await conn.execute(FILL_ZONE_ROW_KEYS_QUERY, {"ids": [row[0] for row in legacy], "row_keys": keys})
+
 async def initialize_restricted_zone():
     """
     [앱 시작 시 실행] 
-    제한 구역 CSV 데이터를 읽어와 DB의 impossible 테이블에 저장하는 함수
+    제한 구역 CSV 데이터를 읽어와 DB의 impossible 테이블에 반영하는 함수
+    - COPY로 임시 테이블에 올린 뒤 행 식별 키(zone_row_key: 주소 + 구역 내용)로 비교하여 추가/삭제만 반영합니다.
+      (바뀌지 않은 구역은 id와 revision이 그대로라 /changes 델타가 작게 유지됩니다.)
+    - return: 데이터 변경 여부
     """
-    db = SessionLocal()
     try:
         if not os.path.exists(settings.ZONE_CSV_PATH):
-            print(f"제한 구역 CSV 파일이 없습니다: {settings.ZONE_CSV_PATH}")
-            return
+            logger.warning("제한 구역 CSV 파일이 없습니다: %s", settings.ZONE_CSV_PATH)
+            return False
         
-        # 개발 단계에서 사용
-        print("제한 구역 데이터 갱신 (impossible 테이블 데이터 삭제) 중...")
-        await asyncio.to_thread(lambda: db.execute(text("DELETE FROM impossible")))
-        await asyncio.to_thread(db.commit)
+        df = await asyncio.to_thread(pd.read_csv, settings.ZONE_CSV_PATH)
+        if df.empty:
+            logger.warning("restricted_zone.csv 파일이 비어 있습니다.")
+            return False
         
-        # if not await is_empty_impossible_table():
-        #     print("제한 구역 데이터가 이미 존재합니다. CSV 파일 저장을 건너뜁니다.")
-        #     return
+        if not set(ZONE_COLUMNS).issubset(df.columns):
+            logger.warning("restricted_zone.csv 컬럼 부족: %s", ZONE_COLUMNS)
+            return False
         
-        df = pd.read_csv(settings.ZONE_CSV_PATH)
-        if df.empty:
-            print("restricted_zone.csv 파일이 비어 있습니다.")
-            return
+        records = await asyncio.to_thread(_zone_records, df)
         
-        required_cols = ["landlot_address", "centroid_x", "centroid_y", "polygon_geom", "vertices"]
-        if not set(required_cols).issubset(df.columns):
-            print(f"restricted_zone.csv 컬럼 부족: {required_cols}")
-            return
+        logger.info("제한 구역 데이터 갱신 (impossible 테이블과 비교) 중...")
+        async with async_engine.begin() as conn:
+            await conn.execute(text("""
+                CREATE TEMP TABLE impossible_staging (
+                    landlot_address TEXT, centroid_x DOUBLE PRECISION, centroid_y DOUBLE PRECISION,
+                    polygon_geom TEXT, vertices TEXT, row_key TEXT, position INTEGER PRIMARY KEY
+                ) ON COMMIT DROP
+            """))
+            raw = await conn.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                "impossible_staging", records=records, columns=ZONE_STAGING_COLUMNS)
+            
+            await _fill_zone_row_keys(conn)
+            current = (await conn.execute(text("SELECT id, row_key FROM impossible"))).fetchall()
+            deletes, inserts = diff_zone_rows([tuple(row) for row in current], [record[5] for record in records])
+            
+            # 삭제/추가된 구역 다각형은 합집합 부분 갱신에 사용
+            removed = (await conn.execute(text("""
+                DELETE FROM impossible
+                WHERE id = ANY(CAST(:ids AS bigint[]))
+                RETURNING ST_AsBinary(polygon_geom)
+            """), {"ids": deletes})).scalars().all() if deletes else []
+            added = (await conn.execute(text("""
+                INSERT INTO impossible (
+                    landlot_address, centroid_x, centroid_y,
+                    polygon_geom, vertices, row_key)
+                SELECT s.landlot_address, s.centroid_x, s.centroid_y,
+                       ST_SetSRID(ST_GeomFromText(s.polygon_geom), 4326), s.vertices::jsonb, s.row_key
+                FROM impossible_staging s
+                WHERE s.position = ANY(CAST(:positions AS integer[]))
+                ORDER BY s.position
+                RETURNING ST_AsBinary(polygon_geom)
+            """), {"positions": inserts})).scalars().all() if inserts else []
+        logger.info("impossible 테이블 반영 완료: 추가 %s, 삭제 %s (총 %s행)", len(added), len(removed), len(df))
         
-        insert_query = text("""
-            INSERT INTO impossible (
-                landlot_address, centroid_x, centroid_y,
-                polygon_geom, vertices)
-            VALUES (
-                :landlot_address, :centroid_x, :centroid_y,
-                ST_SetSRID(ST_GeomFromText(:polygon_geom), 4326),
-                :vertices);
-        """)
-        params = df[required_cols].to_dict(orient='records')
-
-        db.execute(insert_query, params)
-        db.commit()
-        print("impossible 테이블 초기화 및 CSV 데이터 저장 완료.")
+        changed = bool(added or removed)
+        if changed:
+            await zone_index.reload() # 메모리 공간 인덱스 재생성
+            # 제한 구역 합집합은 바뀐 구역 범위만 다시 합쳐서 갱신 + 저장
+            await coverage_service.apply_zone_changes(
+                [shapely.from_wkb(bytes(wkb)) for wkb in added if wkb is not None],
+                [shapely.from_wkb(bytes(wkb)) for wkb in removed if wkb is not None])
+            eligibility_service.invalidate()
+            raster_service.schedule_refresh()
+            await dataset_version.bump(dataset_version.ZONES)
+        return changed
     
     except Exception as e:
-        print(f"impossible 테이블 정보 저장 중 오류 발생: {e}")
-        db.rollback()
-    finally:
-        db.close()
+        logger.error("impossible 테이블 정보 저장 중 오류 발생: %s", e)
+        return False
 
 async def get_valid_address():
     """
     address 테이블에서 위치 정보를 조회하여 반환하는 함수
     """
-    db = SessionLocal()
     try:
-        rows = await asyncio.to_thread(
-            lambda: db.execute(text("""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(text("""
                      SELECT landlot_address, x, y 
                      FROM address 
                      WHERE x != -1 AND y != -1
-                     """)).fetchall())
-        return rows
+                     """))
+            return result.fetchall()
     
     except Exception as e:
-        print(f"address 테이블 조회 중 오류 발생: {e}")
+        logger.error("address 테이블 조회 중 오류 발생: %s", e)
         return []
-    finally:
-        db.close()
         
 async def is_empty_impossible_table():
     """
     impossible 테이블에 저장된 제한 구역이 있는지 확인하는 함수
     """
-    db = SessionLocal()
     try:
-        count = await asyncio.to_thread(
-            lambda: db.execute(text("SELECT COUNT(*) FROM impossible")).scalar())
+        async with AsyncSessionLocal() as db:
+            count = (await db.execute(text("SELECT COUNT(*) FROM impossible"))).scalar()
         return count == 0
     
     except Exception as e:
-        print(f"impossible 테이블 확인 중 오류 발생: {e}")
+        logger.error("impossible 테이블 확인 중 오류 발생: %s", e)
         return False
-    finally:
-        db.close()
 
 async def get_restricted_zone():
     """
     impossible 테이블에서 제한 구역 정보를 조회하여 반환하는 함수
     """
-    db = SessionLocal()
     try:
-        rows = await asyncio.to_thread(
-            lambda: db.execute(
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
                 text("""
                      SELECT landlot_address, vertices, centroid_x, centroid_y 
                      FROM impossible
-                     """)).fetchall())
-        return rows
+                     """))
+            return result.fetchall()
     
     except Exception as e:
-        print(f"impossible 테이블 조회 중 오류 발생: {e}")
-        return []
-    finally:
-        db.close()
\ No newline at end of file
+        logger.error("impossible 테이블 조회 중 오류 발생: %s", e)
+        return []
\ No newline at end of file
@@ -0,0 +1,234 @@
+# app/services/eligibility_service.py
+import math
+import numpy as np
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core import metrics
+from app.core.database import AsyncSessionLocal
+from app.services import coverage_service, zone_index, isochrone_engine, retailer_index
+from app.utils.cache import LRUCache, MISSING
+from app.utils.geo import distances_from_point
+
+# --- 담배소매인 입점 가능 여부 판정 ---
+# 1) 제한 구역(impossible) 포함 여부: 합집합 geometry로 빠르게 걸러낸 뒤 메모리 인덱스로 구역 id 확인
+# 2) 가장 가까운 기존 소매점(address): 메모리 KD-tree(retailer_index)로 조회
+#    (KD-tree가 아직 없으면 GiST KNN(<->)으로 후보만 조회하고 거리는 직접 계산)
+#    보행 그래프가 로드되어 있으면 최소 거리 안쪽 후보만 도보 거리로 다시 확인 (직선 거리 <= 도보 거리)
+# 비용이 큰 소매점 후보 조회만 ELIGIBILITY_CELL_DEG 격자 셀 단위로 캐시하고,
+# 제한 구역 포함 여부와 거리는 항상 요청 좌표 그대로 계산합니다. (구역 경계/최소 거리 근처에서도 정확)
+RESTRICTED_ZONE = "RESTRICTED_ZONE"
+TOO_CLOSE_TO_RETAILER = "TOO_CLOSE_TO_RETAILER"
+
+METER_PER_DEGREE = zone_index.METER_PER_DEGREE
+
+_cache = LRUCache(maxsize=settings.ELIGIBILITY_CACHE_SIZE, ttl=settings.ELIGIBILITY_CACHE_TTL_SEC)
+metrics.register_cache("eligibility", _cache)
+
+# 가장 가까운 k개 + 최소 거리 반경 안의 모든 소매점 (둘 다 address.geom GiST 인덱스 사용)
+NEAREST_RETAILERS_QUERY = text("""
+    (SELECT landlot_address, road_name_address, x, y
+     FROM address
+     WHERE x != -1 AND y != -1
+     ORDER BY geom <-> ST_SetSRID(ST_Point(:x, :y), 4326)
+     LIMIT :k)
+    UNION
+    (SELECT landlot_address, road_name_address, x, y
+     FROM address
+     WHERE ST_DWithin(geom, ST_SetSRID(ST_Point(:x, :y), 4326), :radius_deg))
+""")
+
+ZONES_AT_QUERY = text("""
+    SELECT id FROM impossible
+    WHERE ST_Within(ST_SetSRID(ST_Point(:x, :y), 4326), polygon_geom)
+    ORDER BY id
+""")
+
+
+def cell_of(latitude: float, longitude: float) -> tuple[int, int]:
+    """
+    좌표가 속한 캐시 격자 셀
+    """
+    size = settings.ELIGIBILITY_CELL_DEG
+    return math.floor(latitude / size), math.floor(longitude / size)
+
+
+def cell_center(cell: tuple[int, int]) -> tuple[float, float]:
+    """
+    격자 셀 중심 좌표 (위도, 경도)
+    """
+    size = settings.ELIGIBILITY_CELL_DEG
+    return round((cell[0] + 0.5) * size, 7), round((cell[1] + 0.5) * size, 7)
+
+
+def cell_radius_meter() -> float:
+    """
+    셀 중심에서 셀 안 어느 좌표까지의 최대 거리 (위도 방향 1도 길이로 계산한 반대각선, 상한값)
+    """
+    return settings.ELIGIBILITY_CELL_DEG * METER_PER_DEGREE * math.sqrt(2) / 2
+
+
+def _search_radius_deg(latitude: float, radius_meter: float) -> float:
+    """
+    반경(미터)을 덮는 경도/위도 반경 (경도 방향이 더 짧으므로 cos(위도)로 나눔)
+    """
+    return radius_meter / (METER_PER_DEGREE * max(math.cos(math.radians(latitude)), 0.1))
+
+
+async def _zones_at(latitude: float, longitude: float) -> list[int]:
+    """
+    좌표를 포함하는 제한 구역 id 목록
+    """
+    if coverage_service.is_loaded() and not coverage_service.contains(longitude, latitude):
+        return []
+    index = zone_index.get_index()
+    if index is not None:
+        return index.zones_at(longitude, latitude)
+    async with AsyncSessionLocal() as db:
+        rows = (await db.execute(ZONES_AT_QUERY, {"x": longitude, "y": latitude})).fetchall()
+    return [row[0] for row in rows]
+
+
+async def _candidate_retailers(latitude: float, longitude: float, radius_meter: float | None = None) -> list[dict]:
+    """
+    가장 가까운 소매점 후보 + 반경(기본: 최소 거리) 안의 모든 소매점과 직선 거리(미터), 가까운 순
+    """
+    radius_meter = radius_meter or settings.ELIGIBILITY_MIN_DISTANCE_METER
+    index = retailer_index.get_index()
+    if index is not None:
+        return index.candidates(longitude, latitude, settings.ELIGIBILITY_NEAREST_COUNT, radius_meter)
+
+    params = {
+        "x": longitude, "y": latitude,
+        "k": settings.ELIGIBILITY_NEAREST_COUNT,
+        "radius_deg": _search_radius_deg(latitude, radius_meter),
+    }
+    async with AsyncSessionLocal() as db:
+        rows = (await db.execute(NEAREST_RETAILERS_QUERY, params)).fetchall()
+    if not rows:
+        return []
+
+    distances = distances_from_point(latitude, longitude, [row[3] for row in rows], [row[2] for row in rows])
+    retailers = [
+        {
+            "landlot_address": row[0],
+            "road_name_address": row[1],
+            "x": row[2],
+            "y": row[3],
+            "distance_meter": round(float(distance), 1),
+        }
+        for row, distance in zip(rows, np.atleast_1d(distances).tolist())
+    ]
+    retailers.sort(key=lambda item: item["distance_meter"])
+    return retailers
+
+
+async def _mark_conflicts(latitude: float, longitude: float, retailers: list[dict]) -> str | None:
+    """
+    최소 거리 안쪽의 소매점에 conflict 표시 (보행 그래프가 있으면 도보 거리 기준)
+    - return: 판정에 사용한 거리 기준 ("walking" / "straight", 비교할 소매점이 없으면 None)
+    """
+    min_distance = settings.ELIGIBILITY_MIN_DISTANCE_METER
+    # 직선 거리가 최소 거리 이상이면 도보 거리도 그 이상이므로 다시 볼 필요 없음
+    for item in retailers:
+        item["conflict"] = item["distance_meter"] < min_distance
+    near = [item for item in retailers if item["conflict"]]
+
+    if not near:
+        # 도보 거리는 계산하지 않았으므로 직선 거리로 판정한 것
+        return "straight" if retailers else None
+
+    walking = await isochrone_engine.get_walking_distances(
+        latitude, longitude, [(item["y"], item["x"]) for item in near], min_distance)
+    if walking is None:
+        return "straight"
+
+    for item, distance in zip(near, walking):
+        if distance is None:
+            continue  # 소매점을 도로망에 붙일 수 없으면 직선 거리 판정 유지
+        item["walking_distance_meter"] = round(distance, 1) if math.isfinite(distance) else None
+        item["conflict"] = distance < min_distance
+    return "walking"
+
+
+def _with_distances(latitude: float, longitude: float, candidates: list[dict]) -> list[dict]:
+    """
+    후보 소매점마다 좌표에서의 직선 거리(미터)를 다시 계산해 가까운 순으로 (후보 목록은 바꾸지 않음)
+    """
+    if not candidates:
+        return []
+    distances = distances_from_point(latitude, longitude,
+                                     [item["y"] for item in candidates], [item["x"] for item in candidates])
+    retailers = [dict(item, distance_meter=round(float(distance), 1))
+                 for item, distance in zip(candidates, np.atleast_1d(distances).tolist())]
+    retailers.sort(key=lambda item: item["distance_meter"])
+    return retailers
+
+
+async def evaluate(latitude: float, longitude: float, candidates: list[dict] | None = None) -> dict:
+    """
+    좌표의 입점 가능 여부와 그 이유, 가장 가까운 소매점 목록을 반환
+    - candidates: 미리 조회해 둔 소매점 후보 (없으면 이 좌표로 조회). 거리는 항상 이 좌표 기준으로 계산
+    """
+    zone_ids = await _zones_at(latitude, longitude)
+    if candidates is None:
+        candidates = await _candidate_retailers(latitude, longitude)
+    retailers = _with_distances(latitude, longitude, candidates)
+    distance_mode = await _mark_conflicts(latitude, longitude, retailers)
+
+    reasons = []
+    if zone_ids:
+        reasons.append({
+            "code": RESTRICTED_ZONE,
+            "message": "기존 소매점의 도보 제한 구역 안에 있습니다.",
+            "zone_ids": zone_ids,
+        })
+    conflicts = [item for item in retailers if item["conflict"]]
+    if conflicts:
+        reasons.append({
+            "code": TOO_CLOSE_TO_RETAILER,
+            "message": f"{settings.ELIGIBILITY_MIN_DISTANCE_METER:g}m 이내에 기존 소매점이 있습니다.",
+            "retailers": conflicts,
+        })
+
+    return {
+        "eligible": not reasons,
+        "latitude": latitude,
+        "longitude": longitude,
+        "distance_mode": distance_mode,
+        "min_distance_meter": settings.ELIGIBILITY_MIN_DISTANCE_METER,
+        "reasons": reasons,
+        "nearest_retailers": retailers[:settings.ELIGIBILITY_NEAREST_COUNT],
+    }
+
+
+async def _cell_candidates(cell: tuple[int, int]) -> list[dict]:
+    """
+    격자 셀 안 어느 좌표에서든 최소 거리 안에 들 수 있는 소매점 후보 (셀 단위 캐시)
+    - 셀 중심에서 (최소 거리 + 셀 반대각선) 반경으로 조회하므로, 셀 안 좌표의 최소 거리 판정에 필요한 소매점은 빠지지 않음
+    """
+    candidates = _cache.get(cell)
+    if candidates is MISSING:
+        radius = settings.ELIGIBILITY_MIN_DISTANCE_METER + cell_radius_meter()
+        candidates = await _candidate_retailers(*cell_center(cell), radius_meter=radius)
+        _cache.set(cell, candidates)
+    return candidates
+
+
+async def check_location(latitude: float, longitude: float) -> dict:
+    """
+    입점 가능 여부 판정 (소매점 후보는 격자 셀 단위 캐시, 판정은 요청 좌표 기준)
+    """
+    candidates = await _cell_candidates(cell_of(latitude, longitude))
+    return await evaluate(latitude, longitude, candidates)
+
+
+def invalidate():
+    """
+    제한 구역/소매점 데이터가 바뀌었을 때 캐시된 소매점 후보를 모두 버립니다.
+    """
+    _cache.clear()
+
+
+def get_cache_stats() -> dict:
+    return _cache.stats()
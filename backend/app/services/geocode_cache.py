@@ -0,0 +1,126 @@
+# app/services/geocode_cache.py
+import logging
+import re
+import unicodedata
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.utils.cache import LRUCache, MISSING
+
+logger = logging.getLogger(__name__)
+
+# --- 지오코딩 결과 2단 캐시 (프로세스 내 LRU -> PostGIS geocode_cache 테이블) ---
+# 값: (경도, 위도) 또는 None(네이버가 결과 없음으로 응답한 주소 = 음수 캐시)
+_memory = LRUCache(maxsize=settings.GEOCODE_CACHE_MEMORY_SIZE)
+
+_stats = {
+    "memory_hits": 0,
+    "db_hits": 0,
+    "negative_hits": 0,
+    "misses": 0,
+    "stores": 0,
+}
+
+
+def normalize_address(address: str) -> str:
+    """
+    캐시 키로 사용할 주소 정규화 (유니코드 NFC, 앞뒤 공백 제거, 연속 공백 축약)
+    """
+    address = unicodedata.normalize("NFC", address)
+    return re.sub(r"\s+", " ", address).strip()
+
+
+def _ttl_seconds(coords) -> float:
+    if coords is None:
+        return settings.GEOCODE_NEGATIVE_TTL_HOURS * 3600
+    return settings.GEOCODE_CACHE_TTL_DAYS * 86400
+
+
+async def _select_from_db(key: str):
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(text("""
+            SELECT found, x, y, EXTRACT(EPOCH FROM (expires_at - now())) AS remaining
+            FROM geocode_cache
+            WHERE address_key = :key AND expires_at > now()
+        """), {"key": key})
+        return result.fetchone()
+
+
+async def _upsert_to_db(key: str, coords, ttl: float):
+    x, y = coords if coords is not None else (None, None)
+    async with AsyncSessionLocal() as db:
+        await db.execute(text("""
+            INSERT INTO geocode_cache (address_key, found, x, y, expires_at, updated_at)
+            VALUES (:key, :found, :x, :y, now() + make_interval(secs => :ttl), now())
+            ON CONFLICT (address_key) DO UPDATE
+            SET found = EXCLUDED.found, x = EXCLUDED.x, y = EXCLUDED.y,
+                expires_at = EXCLUDED.expires_at, updated_at = EXCLUDED.updated_at
+        """), {"key": key, "found": coords is not None, "x": x, "y": y, "ttl": ttl})
+        await db.commit()
+
+
+async def lookup(address: str):
+    """
+    캐시에서 주소의 좌표를 조회합니다.
+    - return: (경도, 위도) / None(음수 캐시) / MISSING(캐시에 없음)
+    """
+    key = normalize_address(address)
+
+    value = _memory.get(key)
+    if value is not MISSING:
+        _stats["memory_hits"] += 1
+        if value is None:
+            _stats["negative_hits"] += 1
+        return value
+
+    try:
+        row = await _select_from_db(key)
+    except Exception as e:
+        logger.error("[geocode cache] DB 조회 중 오류 발생(address=%s): %s", address, e)
+        row = None
+
+    if row is None:
+        _stats["misses"] += 1
+        return MISSING
+
+    found, x, y, remaining = row
+    value = (x, y) if found else None
+    _memory.set(key, value, ttl=float(remaining))
+    _stats["db_hits"] += 1
+    if value is None:
+        _stats["negative_hits"] += 1
+    return value
+
+
+async def store(address: str, coords):
+    """
+    지오코딩 결과를 캐시에 저장합니다. (coords가 None이면 짧은 TTL의 음수 캐시)
+    """
+    key = normalize_address(address)
+    ttl = _ttl_seconds(coords)
+    _memory.set(key, coords, ttl=ttl)
+    _stats["stores"] += 1
+
+    try:
+        await _upsert_to_db(key, coords, ttl)
+    except Exception as e:
+        logger.error("[geocode cache] DB 저장 중 오류 발생(address=%s): %s", address, e)
+
+
+def get_stats() -> dict:
+    """
+    캐시 적중/미스 통계 반환
+    """
+    lookups = _stats["memory_hits"] + _stats["db_hits"] + _stats["misses"]
+    hits = _stats["memory_hits"] + _stats["db_hits"]
+    return {
+        **_stats,
+        "lookups": lookups,
+        "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+        "memory": _memory.stats(),
+    }
+
+
+def clear_memory():
+    _memory.clear()
@@ -0,0 +1,468 @@
+# app/services/isochrone_engine.py
+import asyncio
+import bz2
+import gzip
+import heapq
+import logging
+import os
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import shapely
+from shapely.geometry import MultiLineString, Polygon
+
+from app.core import metrics
+from app.core.config import settings
+from app.utils.geo import transformer_wgs_to_metric, transformer_metric_to_wgs
+
+logger = logging.getLogger(__name__)
+
+# --- 오프라인 도보 거리 Isochrone 엔진 (ORS foot-walking 대체) ---
+# OSM 추출 파일에서 보행 가능한 도로망을 한 번 읽어 CSR 형태의 그래프로 메모리에 올리고,
+# 출발점에서 거리 제한 Dijkstra로 도달 가능한 도로 구간을 구한 뒤 버퍼를 씌워 Polygon으로 만듭니다.
+# 네트워크 없이 동작하며, ors_api.get_isochrone_polygon과 같은 형태(경도/위도 Shapely Polygon)를 반환합니다.
+
+# 보행 불가 도로 유형
+NON_WALKABLE_HIGHWAYS = {
+    "motorway", "motorway_link", "trunk", "trunk_link",
+    "construction", "proposed", "abandoned", "platform",
+    "raceway", "bus_guideway", "escape", "busway",
+}
+NO_ACCESS_VALUES = {"no", "private"}
+FOOT_ALLOWED_VALUES = {"yes", "designated", "permissive"}
+
+# 출발점 스냅용 격자 셀 크기 (미터)
+SNAP_CELL_METER = 50.0
+
+
+def is_walkable(tags: dict) -> bool:
+    """
+    OSM way 태그 기준으로 보행 가능한 도로인지 판단
+    """
+    highway = tags.get("highway")
+    if not highway or highway in NON_WALKABLE_HIGHWAYS:
+        return False
+    foot = tags.get("foot")
+    if foot in NO_ACCESS_VALUES:
+        return False
+    if tags.get("access") in NO_ACCESS_VALUES and foot not in FOOT_ALLOWED_VALUES:
+        return False
+    return True
+
+
+def _read_osm_xml(path: str):
+    """
+    OSM XML(.osm / .osm.gz / .osm.bz2)에서 노드 좌표와 보행 가능한 way의 노드 목록을 읽습니다.
+    """
+    opener = gzip.open if path.endswith(".gz") else bz2.open if path.endswith(".bz2") else open
+    nodes: dict[int, tuple[float, float]] = {}
+    ways: list[list[int]] = []
+
+    with opener(path, "rb") as f:
+        for _, elem in ET.iterparse(f, events=("end",)):
+            if elem.tag == "node":
+                nodes[int(elem.get("id"))] = (float(elem.get("lon")), float(elem.get("lat")))
+                elem.clear()
+            elif elem.tag == "way":
+                tags = {tag.get("k"): tag.get("v") for tag in elem.iterfind("tag")}
+                if is_walkable(tags):
+                    ways.append([int(nd.get("ref")) for nd in elem.iterfind("nd")])
+                elem.clear()
+            elif elem.tag == "relation":
+                elem.clear()
+    return nodes, ways
+
+
+def _read_osm_pbf(path: str):
+    """
+    OSM PBF(.osm.pbf)는 pyosmium이 설치된 경우에만 지원합니다.
+    """
+    try:
+        import osmium
+    except ImportError:
+        raise ValueError("OSM PBF 파일을 읽으려면 osmium(pyosmium) 패키지가 필요합니다. .osm(XML) 파일을 사용하세요.")
+
+    nodes: dict[int, tuple[float, float]] = {}
+    ways: list[list[int]] = []
+
+    class _Handler(osmium.SimpleHandler):
+        def node(self, n):
+            if n.location.valid():
+                nodes[n.id] = (n.location.lon, n.location.lat)
+
+        def way(self, w):
+            if is_walkable({tag.k: tag.v for tag in w.tags}):
+                ways.append([nd.ref for nd in w.nodes])
+
+    _Handler().apply_file(path)
+    return nodes, ways
+
+
+class PedestrianGraph:
+    """
+    보행 네트워크 그래프 (양방향, CSR 인접 배열)
+    - x, y: 노드 좌표 (EPSG:5179, 미터)
+    - indptr, indices, weights: 노드 i의 이웃은 indices[indptr[i]:indptr[i+1]], 간선 길이(미터)는 weights
+    """
+
+    def __init__(self, x, y, indptr, indices, weights):
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.weights = np.asarray(weights, dtype=np.float32)
+        self._build_snap_index()
+        # Dijkstra 루프는 파이썬 리스트 접근이 numpy 스칼라 접근보다 빠름
+        self._indptr_list = self.indptr.tolist()
+        self._indices_list = self.indices.tolist()
+        self._weights_list = self.weights.tolist()
+
+    @property
+    def node_count(self) -> int:
+        return len(self.x)
+
+    @classmethod
+    def from_osm(cls, nodes: dict, ways: list[list[int]]):
+        # way에서 실제로 사용되는 노드만 그래프에 포함
+        node_ids = {}
+        src, dst = [], []
+        for refs in ways:
+            refs = [ref for ref in refs if ref in nodes]
+            for a, b in zip(refs, refs[1:]):
+                if a == b:
+                    continue
+                src.append(node_ids.setdefault(a, len(node_ids)))
+                dst.append(node_ids.setdefault(b, len(node_ids)))
+
+        coords = np.array([nodes[node_id] for node_id in node_ids], dtype=np.float64).reshape(-1, 2)
+        x, y = transformer_wgs_to_metric.transform(coords[:, 0], coords[:, 1])
+        x, y = np.asarray(x), np.asarray(y)
+
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        length = np.hypot(x[dst] - x[src], y[dst] - y[src])
+
+        # 보행은 일방통행 제한이 없으므로 양방향 간선으로 저장
+        all_src = np.concatenate([src, dst])
+        all_dst = np.concatenate([dst, src])
+        all_len = np.concatenate([length, length])
+        order = np.argsort(all_src, kind="stable")
+        counts = np.bincount(all_src, minlength=len(x))
+        indptr = np.concatenate([[0], np.cumsum(counts)])
+        return cls(x, y, indptr, all_dst[order], all_len[order])
+
+    def save(self, path: str):
+        np.savez_compressed(path, x=self.x, y=self.y, indptr=self.indptr,
+                            indices=self.indices, weights=self.weights)
+
+    @classmethod
+    def load(cls, path: str):
+        with np.load(path) as data:
+            return cls(data["x"], data["y"], data["indptr"], data["indices"], data["weights"])
+
+    # --- 출발점 스냅 (격자 인덱스) ---
+    def _build_snap_index(self):
+        if self.node_count == 0:
+            self._origin = (0.0, 0.0)
+            self._cell_keys = np.empty(0, dtype=np.int64)
+            self._cell_order = np.empty(0, dtype=np.int64)
+            return
+        self._origin = (self.x.min(), self.y.min())
+        keys = self._cell_key(*self._cell_of(self.x, self.y))
+        self._cell_order = np.argsort(keys, kind="stable")
+        self._cell_keys = keys[self._cell_order]
+
+    def _cell_of(self, x, y):
+        cx = np.floor((np.asarray(x) - self._origin[0]) / SNAP_CELL_METER).astype(np.int64)
+        cy = np.floor((np.asarray(y) - self._origin[1]) / SNAP_CELL_METER).astype(np.int64)
+        return cx, cy
+
+    @staticmethod
+    def _cell_key(cx, cy):
+        return cx * (1 << 32) + cy
+
+    def _nodes_in_cell(self, cx: int, cy: int):
+        key = self._cell_key(cx, cy)
+        start = np.searchsorted(self._cell_keys, key, side="left")
+        end = np.searchsorted(self._cell_keys, key, side="right")
+        return self._cell_order[start:end]
+
+    def nearest_node(self, x: float, y: float, max_distance: float):
+        """
+        (x, y)에서 max_distance(미터) 이내의 가장 가까운 노드 인덱스와 거리를 반환 (없으면 None, None)
+        """
+        if self.node_count == 0:
+            return None, None
+        cx, cy = (int(v) for v in self._cell_of(x, y))
+        max_ring = int(np.ceil(max_distance / SNAP_CELL_METER)) + 1
+        best, best_dist = None, np.inf
+
+        for ring in range(max_ring + 1):
+            # 현재까지 찾은 최단 거리보다 ring 경계가 멀면 더 찾을 필요 없음
+            if best is not None and (ring - 1) * SNAP_CELL_METER > best_dist:
+                break
+            candidates = [
+                self._nodes_in_cell(cx + dx, cy + dy)
+                for dx in range(-ring, ring + 1)
+                for dy in range(-ring, ring + 1)
+                if max(abs(dx), abs(dy)) == ring
+            ]
+            candidates = np.concatenate(candidates) if candidates else np.empty(0, dtype=np.int64)
+            if len(candidates) == 0:
+                continue
+            dist = np.hypot(self.x[candidates] - x, self.y[candidates] - y)
+            i = int(np.argmin(dist))
+            if dist[i] < best_dist:
+                best, best_dist = int(candidates[i]), float(dist[i])
+
+        if best is None or best_dist > max_distance:
+            return None, None
+        return best, best_dist
+
+    # --- 거리 제한 Dijkstra ---
+    def shortest_distances(self, source: int, cutoff: float) -> dict[int, float]:
+        """
+        source에서 cutoff(미터) 이내로 도달 가능한 노드까지의 최단 보행 거리
+        """
+        indptr, indices, weights = self._indptr_list, self._indices_list, self._weights_list
+        dist = {source: 0.0}
+        heap = [(0.0, source)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            for k in range(indptr[u], indptr[u + 1]):
+                v = indices[k]
+                nd = d + weights[k]
+                if nd <= cutoff and nd < dist.get(v, np.inf):
+                    dist[v] = nd
+                    heapq.heappush(heap, (nd, v))
+        return dist
+
+    def isochrone(self, latitude: float, longitude: float, range_meter: float,
+                  buffer_meter: float, snap_meter: float):
+        """
+        도보 거리 range_meter 이내 영역을 경도/위도 Shapely Polygon으로 반환 (도로망에 스냅 실패 시 None)
+        """
+        ox, oy = transformer_wgs_to_metric.transform(longitude, latitude)
+        source, snap_dist = self.nearest_node(ox, oy, snap_meter)
+        if source is None:
+            return None
+
+        dist = self.shortest_distances(source, range_meter)
+        indptr, indices, weights = self._indptr_list, self._indices_list, self._weights_list
+        x, y = self.x, self.y
+
+        # 도달 가능한 도로 구간 (끝까지 못 가는 간선은 남은 거리만큼만 포함)
+        segments = [((ox, oy), (x[source], y[source]))]
+        for u, du in dist.items():
+            for k in range(indptr[u], indptr[u + 1]):
+                v, w = indices[k], weights[k]
+                if du + w <= range_meter:
+                    # 양방향 간선이 두 번 들어가지 않도록 한 방향만 추가
+                    if v in dist and v < u and dist[v] + w <= range_meter:
+                        continue
+                    segments.append(((x[u], y[u]), (x[v], y[v])))
+                elif w > 0:
+                    ratio = (range_meter - du) / w
+                    segments.append(((x[u], y[u]),
+                                     (x[u] + (x[v] - x[u]) * ratio, y[u] + (y[v] - y[u]) * ratio)))
+
+        area = MultiLineString(segments).buffer(buffer_meter, quad_segs=4)
+        if area.geom_type == "MultiPolygon":
+            area = max(area.geoms, key=lambda part: part.area)
+        # ORS 결과와 같이 구멍 없는 단일 Polygon
+        polygon = Polygon(area.exterior).simplify(1.0)
+
+        def to_wgs84(coords):
+            lon, lat = transformer_metric_to_wgs.transform(coords[:, 0], coords[:, 1])
+            return np.round(np.column_stack([lon, lat]), 6)
+
+        return shapely.transform(polygon, to_wgs84)
+
+    def walking_distances(self, latitude: float, longitude: float, targets: list[tuple[float, float]],
+                          cutoff: float, snap_meter: float) -> list[float | None] | None:
+        """
+        출발점에서 각 목적지(위도, 경도)까지의 도보 거리(미터)
+        - cutoff 안에서 도달할 수 없으면 inf, 목적지를 도로망에 스냅할 수 없으면 None
+        - 출발점을 도로망에 스냅할 수 없으면 None (목록이 아님)
+        """
+        ox, oy = transformer_wgs_to_metric.transform(longitude, latitude)
+        source, source_snap = self.nearest_node(ox, oy, snap_meter)
+        if source is None:
+            return None
+        if not targets:
+            return []
+
+        dist = self.shortest_distances(source, cutoff)
+        tx, ty = transformer_wgs_to_metric.transform(
+            np.array([lon for _, lon in targets], dtype=np.float64),
+            np.array([lat for lat, _ in targets], dtype=np.float64))
+
+        results = []
+        for x, y in zip(np.atleast_1d(tx).tolist(), np.atleast_1d(ty).tolist()):
+            node, target_snap = self.nearest_node(x, y, snap_meter)
+            if node is None:
+                results.append(None)
+                continue
+            total = source_snap + dist.get(node, np.inf) + target_snap
+            results.append(total if total <= cutoff else np.inf)
+        return results
+
+
+def load_graph(path: str) -> PedestrianGraph:
+    """
+    OSM 추출 파일을 그래프로 읽습니다.
+    변환된 그래프는 '<path>.graph.npz'에 저장해 두고, 원본이 바뀌지 않았으면 다음부터 그것을 읽습니다.
+    (원본 없이 캐시만 배포한 경우에도 캐시를 그대로 사용)
+    """
+    cache_path = f"{path}.graph.npz"
+    if os.path.exists(cache_path) and (
+            not os.path.exists(path) or os.path.getmtime(cache_path) >= os.path.getmtime(path)):
+        return PedestrianGraph.load(cache_path)
+
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"OSM 추출 파일이 없습니다: {path}")
+
+    logger.info("[isochrone] OSM 도로망 로드 중: %s", path)
+    nodes, ways = _read_osm_pbf(path) if path.endswith(".pbf") else _read_osm_xml(path)
+    graph = PedestrianGraph.from_osm(nodes, ways)
+    logger.info("[isochrone] 보행 그래프 생성 완료: 노드 %s개, 간선 %s개", graph.node_count, len(graph.indices) // 2)
+
+    try:
+        graph.save(cache_path)
+    except OSError as e:
+        logger.error("[isochrone] 그래프 캐시 저장 실패: %s", e)
+    return graph
+
+
+_graph: PedestrianGraph | None = None
+_executor: ProcessPoolExecutor | None = None
+
+
+def get_graph() -> PedestrianGraph:
+    """
+    보행 그래프 (프로세스당 한 번만 로드)
+    """
+    global _graph
+    if _graph is None:
+        _graph = load_graph(settings.OSM_EXTRACT_PATH)
+    return _graph
+
+
+def is_graph_loaded() -> bool:
+    """
+    이 프로세스에 보행 그래프가 이미 로드되어 있는지 여부 (요청 처리 중 무거운 로드를 피하기 위해 확인)
+    """
+    return _graph is not None
+
+
+async def get_walking_distances(latitude: float, longitude: float, targets: list[tuple[float, float]],
+                                cutoff: float) -> list[float | None] | None:
+    """
+    로드된 보행 그래프로 출발점에서 목적지들까지의 도보 거리를 계산 (그래프가 없거나 출발점을 스냅할 수 없으면 None)
+    """
+    if _graph is None:
+        return None
+    return await asyncio.to_thread(
+        _graph.walking_distances, latitude, longitude, targets, cutoff, settings.ISOCHRONE_SNAP_METER)
+
+
+async def warm_up():
+    """
+    [앱 시작 시 실행] 보행 그래프를 미리 로드 (입점 가능 여부 판정의 도보 거리 계산용)
+    """
+    try:
+        graph = await asyncio.to_thread(get_graph)
+        logger.info("[isochrone] 보행 그래프 로드 완료: 노드 %s개", graph.node_count)
+    except Exception as e:
+        logger.error("[isochrone] 보행 그래프 로드 실패 (직선 거리로 판정): %s", e)
+
+
+def _compute_isochrones(origins: list[tuple[float, float]]) -> list[tuple[Polygon | None, str | None]]:
+    """
+    출발점마다 (Polygon, 오류 메시지) 반환 (한 출발점의 오류가 묶음 전체를 실패시키지 않도록 출발점별로 처리)
+    """
+    try:
+        graph = get_graph()
+    except Exception as e:
+        error = f"보행 그래프 로드 실패: {e}"
+        return [(None, error) for _ in origins]
+
+    results = []
+    for latitude, longitude in origins:
+        try:
+            polygon = graph.isochrone(latitude, longitude, settings.ISOCHRONE_RANGE_METER,
+                                      settings.ISOCHRONE_BUFFER_METER, settings.ISOCHRONE_SNAP_METER)
+            results.append((polygon, None if polygon is not None else "도로망에 스냅할 수 없는 출발점"))
+        except Exception as e:
+            results.append((None, f"{type(e).__name__}: {e}"))
+    return results
+
+
+def _init_worker():
+    # 작업 프로세스에서 그래프를 미리 로드 (실패해도 풀이 깨지지 않도록 여기서는 기록만 하고, 계산 시 출발점별 오류로 보고)
+    try:
+        get_graph()
+    except Exception as e:
+        logger.error("[isochrone] 작업 프로세스의 보행 그래프 로드 실패: %s", e)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = metrics.TrackedProcessPoolExecutor(
+            "isochrone", max_workers=settings.ISOCHRONE_WORKERS, initializer=_init_worker)
+    return _executor
+
+
+def shutdown_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def get_isochrone_polygon(latitude: float, longitude: float):
+    """
+    로컬 보행 그래프로 도보 거리 기반 Shapely Polygon을 반환하는 함수 (ors_api.get_isochrone_polygon과 동일한 형태)
+    """
+    if not latitude or not longitude:
+        logger.warning("[isochrone] 제한 구역 계산에 실패했습니다: latitude=%s, longitude=%s", latitude, longitude)
+        return None
+
+    [(polygon, error)] = await asyncio.to_thread(_compute_isochrones, [(latitude, longitude)])
+    if error:
+        logger.warning("[isochrone] 제한 구역 계산 실패(latitude=%s, longitude=%s): %s", latitude, longitude, error)
+    return polygon
+
+
+async def get_isochrone_polygons(origins: list[tuple[float, float]]) -> list[tuple[Polygon | None, str | None]]:
+    """
+    여러 출발점(위도, 경도)의 Polygon을 프로세스 풀에 나누어 계산합니다. (결과 순서는 입력 순서와 같음)
+    - 출발점마다 (Polygon, 오류 메시지)를 반환하며, 실패한 출발점은 (None, 오류 메시지)
+    """
+    if not origins:
+        return []
+
+    global _executor
+    loop = asyncio.get_running_loop()
+    executor = _get_executor()
+    chunk_size = max(1, -(-len(origins) // settings.ISOCHRONE_WORKERS))
+    chunks = [origins[i:i + chunk_size] for i in range(0, len(origins), chunk_size)]
+    results = await asyncio.gather(*[loop.run_in_executor(executor, _compute_isochrones, chunk) for chunk in chunks],
+                                   return_exceptions=True)
+
+    polygons = []
+    for chunk, result in zip(chunks, results):
+        if isinstance(result, BaseException):
+            # 작업 프로세스가 죽는 등 묶음 단위로 실패한 경우 그 묶음의 출발점마다 오류로 보고
+            logger.error("[isochrone] 묶음 계산 실패 (출발점 %s개): %s", len(chunk), result)
+            if isinstance(result, BrokenProcessPool) and _executor is executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+                _executor = None  # 다음 묶음은 새 풀에서 계산
+            result = [(None, f"{type(result).__name__}: {result}")] * len(chunk)
+        polygons.extend(result)
+    return polygons
@@ -0,0 +1,447 @@
+# app/services/raster_service.py
+import asyncio
+import datetime
+import hashlib
+import logging
+import math
+import os
+
+import numpy as np
+import shapely
+from scipy.spatial import cKDTree
+
+from app.core import metrics
+from app.core.config import settings
+from app.services import coverage_service, retailer_index
+from app.services.tile_service import WEB_MERCATOR_WORLD_METER
+from app.utils.cache import LRUCache, MISSING
+from app.utils.geo import transformer_wgs_to_metric, transformer_metric_to_wgs, transformer_mercator_to_metric
+from app.utils.png import encode_png_rgba
+
+logger = logging.getLogger(__name__)
+
+# --- 입점 가능 여부 래스터(히트맵) ---
+# address / impossible 전체 범위를 RASTER_CELL_METER 격자(EPSG:5179)로 나누어 셀마다 판정 결과를 미리 계산합니다.
+# - 셀 상태(uint8): 입점 가능 / 제한 구역 / 최소 거리 이내 + 가장 가까운 소매점까지 거리(uint16, 미터)
+# - 행 묶음 단위로 프로세스 풀에 나누어 contains_xy / KD-tree 벡터 연산으로 계산
+# - 결과는 압축 npz 파일로 저장하고, 계산에 사용한 제한 구역 합집합(WKB)도 함께 보관해서
+#   제한 구역이 바뀌면 이전 합집합과의 차이(symmetric difference)가 걸친 셀 범위만 다시 계산합니다.
+ELIGIBLE = 0
+RESTRICTED_ZONE = 1
+TOO_CLOSE_TO_RETAILER = 2
+NO_DATA = 255
+DISTANCE_MAX = np.iinfo(np.uint16).max
+
+GRID_MARGIN_METER = 200.0
+TILE_SIZE = 256
+
+# 상태 값 -> RGBA 색상 (NO_DATA 등 나머지는 투명)
+STATUS_COLORS = np.zeros((256, 4), dtype=np.uint8)
+STATUS_COLORS[ELIGIBLE] = (0, 170, 80, 110)
+STATUS_COLORS[RESTRICTED_ZONE] = (220, 30, 30, 110)
+STATUS_COLORS[TOO_CLOSE_TO_RETAILER] = (255, 140, 0, 110)
+
+
+class EligibilityRaster:
+    """
+    EPSG:5179 격자 래스터 (origin은 좌상단 모서리, 행은 북쪽에서 남쪽 방향)
+    """
+
+    def __init__(self, origin_x: float, origin_y: float, cell: float, status, distance,
+                 coverage_wkb: bytes, retailer_digest: str, created_at: str | None = None):
+        self.origin_x = float(origin_x)
+        self.origin_y = float(origin_y)
+        self.cell = float(cell)
+        self.status = status
+        self.distance = distance
+        self.coverage_wkb = coverage_wkb
+        self.retailer_digest = retailer_digest
+        self.created_at = created_at or datetime.datetime.now().isoformat()
+
+    @property
+    def height(self) -> int:
+        return self.status.shape[0]
+
+    @property
+    def width(self) -> int:
+        return self.status.shape[1]
+
+    @property
+    def bounds(self) -> tuple[float, float, float, float]:
+        """
+        (minx, miny, maxx, maxy) 미터 좌표
+        """
+        return (self.origin_x, self.origin_y - self.height * self.cell,
+                self.origin_x + self.width * self.cell, self.origin_y)
+
+    def covers(self, bounds) -> bool:
+        minx, miny, maxx, maxy = self.bounds
+        return minx <= bounds[0] and miny <= bounds[1] and bounds[2] <= maxx and bounds[3] <= maxy
+
+    def window(self, minx: float, miny: float, maxx: float, maxy: float) -> tuple[int, int, int, int] | None:
+        """
+        미터 좌표 범위를 덮는 (행 시작, 행 끝, 열 시작, 열 끝) (래스터 밖이면 None)
+        """
+        r0 = max(int(math.floor((self.origin_y - maxy) / self.cell)), 0)
+        r1 = min(int(math.ceil((self.origin_y - miny) / self.cell)), self.height)
+        c0 = max(int(math.floor((minx - self.origin_x) / self.cell)), 0)
+        c1 = min(int(math.ceil((maxx - self.origin_x) / self.cell)), self.width)
+        if r0 >= r1 or c0 >= c1:
+            return None
+        return r0, r1, c0, c1
+
+    def sample(self, xs, ys) -> np.ndarray:
+        """
+        미터 좌표 배열 위치의 셀 상태 (래스터 밖은 NO_DATA)
+        """
+        cols = np.floor((np.asarray(xs) - self.origin_x) / self.cell)
+        rows = np.floor((self.origin_y - np.asarray(ys)) / self.cell)
+        valid = (rows >= 0) & (rows < self.height) & (cols >= 0) & (cols < self.width)
+        values = np.full(cols.shape, NO_DATA, dtype=np.uint8)
+        values[valid] = self.status[rows[valid].astype(np.int64), cols[valid].astype(np.int64)]
+        return values
+
+    def counts(self) -> dict:
+        values, counts = np.unique(self.status, return_counts=True)
+        names = {ELIGIBLE: "eligible", RESTRICTED_ZONE: "restricted_zone",
+                 TOO_CLOSE_TO_RETAILER: "too_close_to_retailer", NO_DATA: "no_data"}
+        return {names.get(int(v), str(v)): int(c) for v, c in zip(values, counts)}
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(
+                f,
+                status=self.status,
+                distance=self.distance,
+                grid=np.array([self.origin_x, self.origin_y, self.cell]),
+                coverage_wkb=np.frombuffer(self.coverage_wkb, dtype=np.uint8),
+                meta=np.array([self.retailer_digest, self.created_at]),
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "EligibilityRaster":
+        with np.load(path) as data:
+            origin_x, origin_y, cell = data["grid"].tolist()
+            retailer_digest, created_at = data["meta"].tolist()
+            return cls(origin_x, origin_y, cell, data["status"], data["distance"],
+                       data["coverage_wkb"].tobytes(), retailer_digest, created_at)
+
+
+# --- 프로세스 풀 작업자 (작업마다 제한 구역 합집합 / 소매점 좌표를 한 번만 전달) ---
+_worker: dict = {}
+
+
+def _init_worker(coverage_wkb: bytes, retailer_xy: np.ndarray, min_distance: float):
+    coverage = shapely.from_wkb(coverage_wkb)
+    shapely.prepare(coverage)
+    _worker["coverage"] = coverage
+    _worker["tree"] = cKDTree(retailer_xy) if len(retailer_xy) else None
+    _worker["min_distance"] = min_distance
+
+
+def compute_window(origin_x: float, origin_y: float, cell: float, r0: int, r1: int, c0: int, c1: int):
+    """
+    래스터 창 [r0:r1, c0:c1]의 셀 상태/거리 계산 (작업자 프로세스에서 실행)
+    """
+    xs = origin_x + (np.arange(c0, c1) + 0.5) * cell
+    ys = origin_y - (np.arange(r0, r1) + 0.5) * cell
+    gx, gy = np.meshgrid(xs, ys)
+    gx, gy = gx.ravel(), gy.ravel()
+
+    lons, lats = transformer_metric_to_wgs.transform(gx, gy)
+    inside = shapely.contains_xy(_worker["coverage"], lons, lats)
+
+    tree = _worker["tree"]
+    if tree is None:
+        distance = np.full(len(gx), np.inf)
+    else:
+        distance, _ = tree.query(np.column_stack([gx, gy]), k=1, distance_upper_bound=DISTANCE_MAX)
+
+    status = np.where(inside, RESTRICTED_ZONE,
+                      np.where(distance < _worker["min_distance"], TOO_CLOSE_TO_RETAILER, ELIGIBLE))
+    shape = (r1 - r0, c1 - c0)
+    return (r0, c0,
+            status.astype(np.uint8).reshape(shape),
+            np.minimum(distance, DISTANCE_MAX).astype(np.uint16).reshape(shape))
+
+
+def _metric_bounds(minlon: float, minlat: float, maxlon: float, maxlat: float):
+    """
+    경도/위도 범위의 네 모서리를 미터 좌표로 변환한 외접 사각형
+    """
+    xs, ys = transformer_wgs_to_metric.transform(
+        np.array([minlon, minlon, maxlon, maxlon]), np.array([minlat, maxlat, minlat, maxlat]))
+    return float(xs.min()), float(ys.min()), float(xs.max()), float(ys.max())
+
+
+def _snapshot():
+    """
+    현재 제한 구역 합집합과 소매점 좌표(미터) + 소매점 좌표 지문
+    """
+    coverage = coverage_service.get_coverage()
+    index = retailer_index.get_index()
+    if coverage is None or index is None:
+        raise RuntimeError("제한 구역 합집합 또는 소매점 인덱스가 준비되지 않았습니다.")
+    retailer_xy = np.ascontiguousarray(index.tree.data, dtype=np.float64)
+    digest = hashlib.sha1(retailer_xy.tobytes()).hexdigest()
+    return coverage, retailer_xy, digest
+
+
+def _data_bounds(coverage, retailer_xy) -> tuple[float, float, float, float] | None:
+    """
+    제한 구역 + 소매점 전체 범위(미터, 여유 GRID_MARGIN_METER 포함)
+    """
+    parts = []
+    if not coverage.is_empty:
+        parts.append(_metric_bounds(*coverage.bounds))
+    if len(retailer_xy):
+        parts.append((*retailer_xy.min(axis=0), *retailer_xy.max(axis=0)))
+    if not parts:
+        return None
+    bounds = np.array(parts)
+    return (bounds[:, 0].min() - GRID_MARGIN_METER, bounds[:, 1].min() - GRID_MARGIN_METER,
+            bounds[:, 2].max() + GRID_MARGIN_METER, bounds[:, 3].max() + GRID_MARGIN_METER)
+
+
+def _split_rows(windows, chunk_rows: int):
+    for r0, r1, c0, c1 in windows:
+        for start in range(r0, r1, chunk_rows):
+            yield start, min(start + chunk_rows, r1), c0, c1
+
+
+_raster: EligibilityRaster | None = None
+_task: asyncio.Task | None = None
+_pending_refresh = False
+_tile_cache = LRUCache(maxsize=settings.RASTER_TILE_CACHE_SIZE)
+metrics.register_cache("raster_tile", _tile_cache)
+
+progress = {
+    "state": "idle",
+    "mode": None,
+    "windows": 0,
+    "chunks": 0,
+    "done": 0,
+    "started_at": None,
+    "finished_at": None,
+    "error": None,
+}
+
+
+def get_raster() -> EligibilityRaster | None:
+    return _raster
+
+
+async def _compute(raster: EligibilityRaster, windows, coverage, retailer_xy):
+    """
+    래스터 창 목록을 프로세스 풀에서 계산해 raster 배열에 기록
+    """
+    chunks = list(_split_rows(windows, settings.RASTER_CHUNK_ROWS))
+    progress.update({"windows": len(windows), "chunks": len(chunks), "done": 0})
+    if not chunks:
+        return
+
+    loop = asyncio.get_running_loop()
+    executor = metrics.TrackedProcessPoolExecutor(
+        "raster",
+        max_workers=settings.RASTER_WORKERS,
+        initializer=_init_worker,
+        initargs=(shapely.to_wkb(coverage), retailer_xy, settings.ELIGIBILITY_MIN_DISTANCE_METER),
+    )
+    try:
+        futures = [
+            loop.run_in_executor(executor, compute_window,
+                                 raster.origin_x, raster.origin_y, raster.cell, r0, r1, c0, c1)
+            for r0, r1, c0, c1 in chunks
+        ]
+        for future in asyncio.as_completed(futures):
+            r0, c0, status, distance = await future
+            raster.status[r0:r0 + status.shape[0], c0:c0 + status.shape[1]] = status
+            raster.distance[r0:r0 + status.shape[0], c0:c0 + status.shape[1]] = distance
+            progress["done"] += 1
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def _build(coverage, retailer_xy, digest):
+    """
+    전체 범위 래스터를 새로 계산
+    """
+    global _raster
+    bounds = _data_bounds(coverage, retailer_xy)
+    if bounds is None:
+        logger.warning("[raster] 계산할 데이터가 없습니다.")
+        return
+    cell = settings.RASTER_CELL_METER
+    origin_x = math.floor(bounds[0] / cell) * cell
+    origin_y = math.ceil(bounds[3] / cell) * cell
+    width = int(math.ceil((bounds[2] - origin_x) / cell))
+    height = int(math.ceil((origin_y - bounds[1]) / cell))
+
+    raster = EligibilityRaster(
+        origin_x, origin_y, cell,
+        np.full((height, width), NO_DATA, dtype=np.uint8),
+        np.full((height, width), DISTANCE_MAX, dtype=np.uint16),
+        shapely.to_wkb(coverage), digest)
+    progress["mode"] = "full"
+    logger.info("[raster] 전체 계산 시작: %s x %s 셀 (%gm)", width, height, cell)
+    await _compute(raster, [(0, height, 0, width)], coverage, retailer_xy)
+    await asyncio.to_thread(raster.save, settings.RASTER_PATH)
+    _raster = raster
+    _tile_cache.clear()
+
+
+async def _refresh(coverage, retailer_xy, digest):
+    """
+    저장된 래스터를 현재 데이터에 맞게 갱신 (제한 구역 차이가 걸친 셀 범위만 다시 계산)
+    """
+    raster = _raster
+    bounds = _data_bounds(coverage, retailer_xy)
+    # 소매점이 바뀌면 거리 값이 넓게 바뀌고, 데이터 범위가 넓어지면 격자를 다시 잡아야 하므로 전체 계산
+    if raster.retailer_digest != digest or (bounds is not None and not raster.covers(bounds)):
+        await _build(coverage, retailer_xy, digest)
+        return
+
+    if shapely.to_wkb(coverage) == raster.coverage_wkb:
+        progress.update({"mode": "unchanged", "windows": 0, "chunks": 0, "done": 0})
+        return
+
+    old = shapely.from_wkb(raster.coverage_wkb)
+    changed = await asyncio.to_thread(shapely.symmetric_difference, old, coverage)
+    windows = []
+    for part in shapely.get_parts(changed):
+        if part.is_empty:
+            continue
+        window = raster.window(*_metric_bounds(*part.bounds))
+        if window is not None:
+            windows.append(window)
+
+    progress["mode"] = "incremental"
+    logger.info("[raster] 제한 구역 변경 범위 %s곳 다시 계산", len(windows))
+    await _compute(raster, windows, coverage, retailer_xy)
+    raster.coverage_wkb = shapely.to_wkb(coverage)
+    raster.created_at = datetime.datetime.now().isoformat()
+    await asyncio.to_thread(raster.save, settings.RASTER_PATH)
+    _tile_cache.clear()
+
+
+async def _run(full: bool):
+    global _pending_refresh
+    progress.update({"state": "running", "started_at": datetime.datetime.now().isoformat(),
+                     "finished_at": None, "error": None})
+    try:
+        while True:
+            coverage, retailer_xy, digest = _snapshot()
+            if full or _raster is None:
+                await _build(coverage, retailer_xy, digest)
+            else:
+                await _refresh(coverage, retailer_xy, digest)
+            # 계산 중에 데이터가 또 바뀌었으면 한 번 더 갱신
+            if not _pending_refresh:
+                break
+            _pending_refresh, full = False, False
+        progress["state"] = "completed"
+    except asyncio.CancelledError:
+        progress["state"] = "cancelled"
+        raise
+    except Exception as e:
+        logger.error("[raster] 래스터 계산 중 오류 발생: %s", e)
+        progress["state"] = "failed"
+        progress["error"] = str(e)
+    finally:
+        progress["finished_at"] = datetime.datetime.now().isoformat()
+
+
+def start_build(full: bool = True) -> dict:
+    """
+    래스터 계산을 백그라운드에서 시작합니다. (이미 실행 중이면 끝난 뒤 한 번 더 갱신)
+    """
+    global _task, _pending_refresh
+    if _task and not _task.done():
+        _pending_refresh = True
+        return progress
+    progress["state"] = "pending"
+    _task = asyncio.create_task(_run(full))
+    return progress
+
+
+def schedule_refresh():
+    """
+    제한 구역/소매점 데이터가 바뀐 뒤 호출: 래스터가 있을 때만 변경 범위를 갱신
+    """
+    if _raster is None:
+        return
+    start_build(full=False)
+
+
+def load():
+    """
+    [앱 시작 시 실행] 저장된 래스터 파일을 불러옵니다.
+    """
+    global _raster
+    if not os.path.exists(settings.RASTER_PATH):
+        return False
+    try:
+        _raster = EligibilityRaster.load(settings.RASTER_PATH)
+        _tile_cache.clear()
+        logger.info("[raster] 래스터 로드 완료: %s x %s 셀", _raster.width, _raster.height)
+        return True
+    except Exception as e:
+        logger.error("[raster] 래스터 파일 로드 실패: %s", e)
+        return False
+
+
+def cancel():
+    if _task and not _task.done():
+        _task.cancel()
+
+
+def get_status() -> dict:
+    status = {**progress, "loaded": _raster is not None}
+    if _raster is not None:
+        minx, miny, maxx, maxy = _raster.bounds
+        lons, lats = transformer_metric_to_wgs.transform(
+            np.array([minx, minx, maxx, maxx]), np.array([miny, maxy, miny, maxy]))
+        status.update({
+            "width": _raster.width,
+            "height": _raster.height,
+            "cell_meter": _raster.cell,
+            "bounds_wgs84": [float(lons.min()), float(lats.min()), float(lons.max()), float(lats.max())],
+            "created_at": _raster.created_at,
+            "cells": _raster.counts(),
+        })
+    return status
+
+
+def render_overview(max_size: int) -> bytes:
+    """
+    래스터 전체를 최대 max_size 픽셀 PNG로 (격자 단위 그대로, 간격을 두고 표본 추출)
+    """
+    step = max(1, math.ceil(max(_raster.height, _raster.width) / max_size))
+    return encode_png_rgba(STATUS_COLORS[_raster.status[::step, ::step]])
+
+
+def render_tile(z: int, x: int, y: int) -> bytes:
+    """
+    XYZ 타일(256px) PNG (래스터와 겹치지 않으면 b"")
+    """
+    key = (z, x, y)
+    tile = _tile_cache.get(key)
+    if tile is not MISSING:
+        return tile
+
+    half = WEB_MERCATOR_WORLD_METER / 2
+    tile_meter = WEB_MERCATOR_WORLD_METER / (1 << z)
+    offsets = (np.arange(TILE_SIZE) + 0.5) / TILE_SIZE * tile_meter
+    mx, my = np.meshgrid(-half + x * tile_meter + offsets, half - y * tile_meter - offsets)
+    gx, gy = transformer_mercator_to_metric.transform(mx.ravel(), my.ravel())
+
+    values = _raster.sample(gx, gy)
+    if (values == NO_DATA).all():
+        tile = b""
+    else:
+        tile = encode_png_rgba(STATUS_COLORS[values].reshape(TILE_SIZE, TILE_SIZE, 4))
+    _tile_cache.set(key, tile)
+    return tile
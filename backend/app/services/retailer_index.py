@@ -0,0 +1,151 @@
+# app/services/retailer_index.py
+import asyncio
+import logging
+import numpy as np
+from scipy.spatial import cKDTree
+from sqlalchemy import text
+
+from app.core.database import AsyncSessionLocal
+from app.utils.geo import transformer_wgs_to_metric
+
+logger = logging.getLogger(__name__)
+
+# --- 기존 소매점 위치 메모리 KD-tree ---
+# address 테이블의 좌표를 미터 좌표계(EPSG:5179)로 변환해 cKDTree로 보관하고,
+# "이 지점에서 가장 가까운 N개 소매점과 거리"를 DB 없이 계산합니다.
+# address 데이터가 바뀌면(적재/좌표 백필) reload()로 다시 만듭니다.
+
+
+class RetailerIndex:
+    def __init__(self, landlot_addresses, road_name_addresses, lons, lats):
+        self.landlot_addresses = list(landlot_addresses)
+        self.road_name_addresses = list(road_name_addresses)
+        self.lons = np.asarray(lons, dtype=np.float64)
+        self.lats = np.asarray(lats, dtype=np.float64)
+        xs, ys = transformer_wgs_to_metric.transform(self.lons, self.lats)
+        self.tree = cKDTree(np.column_stack([np.atleast_1d(xs), np.atleast_1d(ys)]).reshape(-1, 2))
+
+    def __len__(self):
+        return len(self.lons)
+
+    def _project(self, lons, lats) -> np.ndarray:
+        xs, ys = transformer_wgs_to_metric.transform(
+            np.asarray(lons, dtype=np.float64), np.asarray(lats, dtype=np.float64))
+        return np.column_stack([np.atleast_1d(xs), np.atleast_1d(ys)]).reshape(-1, 2)
+
+    def record(self, i: int, distance: float) -> dict:
+        return {
+            "landlot_address": self.landlot_addresses[i],
+            "road_name_address": self.road_name_addresses[i],
+            "x": float(self.lons[i]),
+            "y": float(self.lats[i]),
+            "distance_meter": round(float(distance), 1),
+        }
+
+    def query_many(self, lons, lats, k: int, max_distance: float | None = None):
+        """
+        여러 지점의 최근접 소매점 k개를 한 번에 조회
+        - return: (거리 배열 n x k (미터, 없으면 inf), 인덱스 배열 n x k (없으면 len(self)))
+        """
+        points = self._project(lons, lats)
+        k = min(k, len(self))
+        if len(points) == 0 or k == 0:
+            return np.empty((len(points), 0)), np.empty((len(points), 0), dtype=np.int64)
+        bound = max_distance if max_distance is not None else np.inf
+        distances, indices = self.tree.query(points, k=k, distance_upper_bound=bound)
+        return distances.reshape(len(points), k), indices.reshape(len(points), k)
+
+    def nearest(self, lon: float, lat: float, k: int, max_distance: float | None = None) -> list[dict]:
+        """
+        한 지점의 최근접 소매점 k개 (가까운 순)
+        """
+        distances, indices = self.query_many([lon], [lat], k, max_distance)
+        return [self.record(i, d) for d, i in zip(distances[0].tolist(), indices[0].tolist())
+                if np.isfinite(d)]
+
+    def candidates(self, lon: float, lat: float, k: int, radius: float) -> list[dict]:
+        """
+        최근접 k개 + 반경(미터) 안의 모든 소매점 (가까운 순)
+        """
+        point = self._project([lon], [lat])[0]
+        found = {}
+        if len(self):
+            distances, indices = self.query_many([lon], [lat], k)
+            for d, i in zip(distances[0].tolist(), indices[0].tolist()):
+                if np.isfinite(d):
+                    found[i] = d
+            for i in self.tree.query_ball_point(point, r=radius):
+                if i not in found:
+                    found[i] = float(np.hypot(*(self.tree.data[i] - point)))
+        return sorted((self.record(i, d) for i, d in found.items()), key=lambda item: item["distance_meter"])
+
+
+_index: RetailerIndex | None = None
+# 첫 로드 작업 (인덱스가 없을 때 동시에 들어온 요청은 이 작업 하나를 함께 기다림)
+_loading: asyncio.Task | None = None
+
+
+def get_index() -> RetailerIndex | None:
+    """
+    현재 소매점 인덱스 (아직 로드되지 않았으면 None)
+    """
+    return _index
+
+
+def is_loaded() -> bool:
+    return _index is not None
+
+
+def _clear_loading(task: asyncio.Task):
+    global _loading
+    if _loading is task:
+        _loading = None
+
+
+async def ensure_loaded():
+    """
+    인덱스가 아직 없으면 한 번만 로드합니다. (동시 요청마다 소매점 전체를 다시 읽지 않도록 로드 작업을 공유)
+    """
+    global _loading
+    if _index is not None:
+        return
+    if _loading is None:
+        _loading = asyncio.create_task(reload())
+        _loading.add_done_callback(_clear_loading)
+    # 기다리던 요청이 취소돼도 로드 작업은 계속 진행
+    await asyncio.shield(_loading)
+
+
+async def _load_rows():
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(text("""
+            SELECT landlot_address, road_name_address, x, y
+            FROM address
+            WHERE x != -1 AND y != -1
+        """))
+        return result.fetchall()
+
+
+def build_index(rows) -> RetailerIndex:
+    """
+    (지번주소, 도로명주소, 경도, 위도) 행 목록으로 인덱스 생성
+    """
+    return RetailerIndex(
+        [row[0] for row in rows],
+        [row[1] for row in rows],
+        [row[2] for row in rows],
+        [row[3] for row in rows],
+    )
+
+
+async def reload():
+    """
+    address 테이블을 다시 읽어 KD-tree를 재생성합니다. (실패 시 기존 인덱스 유지)
+    """
+    global _index
+    try:
+        rows = await _load_rows()
+        _index = await asyncio.to_thread(build_index, rows)
+        logger.info("소매점 KD-tree 생성 완료: %s개", len(_index))
+    except Exception as e:
+        logger.error("소매점 KD-tree 생성 중 오류 발생: %s", e)
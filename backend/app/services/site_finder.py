@@ -0,0 +1,230 @@
+# app/services/site_finder.py
+import heapq
+import itertools
+import numpy as np
+import shapely
+
+from app.core.config import settings
+from app.services import coverage_service, retailer_index
+from app.utils.geo import transformer_wgs_to_metric, transformer_metric_to_wgs
+
+# --- 입점 후보지 탐색 ---
+# 영역(bbox/다각형) 안에서 입점 가능한 지점 중 점수가 높은 N곳을 찾습니다.
+# 점수 = 거리 가중치 x (가장 가까운 소매점까지 거리 / 거리 상한)
+#      + 밀도 가중치 x (반경 안 소매점 수 / 밀도 상한)    (둘 다 0~1로 자름)
+# 영역을 EPSG:5179 격자 셀로 나눠 사분할(quadtree)하며, 점수 상한이 높은 셀부터 꺼내는
+# best-first 탐색으로 셀을 잘라 나갑니다. 다음 셀은 더 나누지 않고 버립니다.
+# - 영역과 겹치지 않는 셀, 제한 구역 합집합(coverage)에 완전히 포함되는 셀
+# - 셀 안 어디서나 기존 소매점과의 거리가 최소 거리보다 짧은 셀
+# 셀 점수 상한은 소매점 KD-tree로 계산합니다. (셀 중심 거리 + 반대각선, 반경 + 반대각선 안 소매점 수)
+# 후보는 "직선 거리 >= 최소 거리"로 판정하므로 도보 거리 기준으로도 항상 입점 가능합니다. (직선 <= 도보)
+
+_CELL = 0   # 아직 나누지 않은 셀 (키: 점수 상한)
+_POINT = 1  # 평가가 끝난 셀 중심점 (키: 실제 점수)
+
+
+def to_metric(geometry):
+    """
+    WGS84 geometry를 EPSG:5179(미터) 좌표로 변환
+    """
+    return shapely.transform(
+        geometry, lambda xy: np.column_stack(transformer_wgs_to_metric.transform(xy[:, 0], xy[:, 1])))
+
+
+class SiteSearch:
+    def __init__(self, region, coverage, index, limit: int, resolution: float, min_separation: float,
+                 distance_weight: float, density_weight: float):
+        """
+        - region: WGS84 영역 geometry (Polygon/MultiPolygon)
+        - coverage: 제한 구역 합집합 (없으면 None)
+        - index: retailer_index.RetailerIndex (소매점이 하나도 없으면 None)
+        """
+        self.region = region
+        self.region_metric = to_metric(region)
+        shapely.prepare(self.region_metric)
+        self.coverage = coverage if coverage is not None and not coverage.is_empty else None
+        if self.coverage is not None:
+            shapely.prepare(self.coverage)
+        self.index = index if index is not None and len(index) else None
+        self.limit = limit
+        self.resolution = resolution
+        self.min_separation = min_separation
+        self.min_distance = settings.ELIGIBILITY_MIN_DISTANCE_METER
+        self.distance_cap = settings.SITE_DISTANCE_CAP_METER
+        self.density_radius = settings.SITE_DENSITY_RADIUS_METER
+        self.density_cap = settings.SITE_DENSITY_CAP
+        total = distance_weight + density_weight
+        self.distance_weight = distance_weight / total if total > 0 else 1.0
+        self.density_weight = density_weight / total if total > 0 else 0.0
+        self.cells_visited = 0
+        self.points_evaluated = 0
+
+    # --- 점수 계산 ---
+    def _score(self, distances, densities):
+        return (self.distance_weight * np.minimum(distances / self.distance_cap, 1.0)
+                + self.density_weight * np.minimum(densities / self.density_cap, 1.0))
+
+    def _nearest(self, xs, ys):
+        """
+        가장 가까운 소매점까지 거리 배열 (소매점이 없으면 inf)
+        """
+        if self.index is None:
+            return np.full(len(xs), np.inf)
+        distances, _ = self.index.tree.query(np.column_stack([xs, ys]), k=1)
+        return np.asarray(distances, dtype=np.float64).reshape(-1)
+
+    def _density(self, xs, ys, radius):
+        if self.index is None:
+            return np.zeros(len(xs))
+        return np.asarray(self.index.tree.query_ball_point(
+            np.column_stack([xs, ys]), r=radius, return_length=True), dtype=np.float64).reshape(-1)
+
+    # --- 셀 처리 ---
+    def _bounds_to_wgs(self, xs, ys, half):
+        """
+        셀 사각형을 WGS84 다각형 배열로 변환 (네 모서리만 변환하므로 작은 셀에서만 정확)
+        """
+        corners_x = np.stack([xs - half, xs + half, xs + half, xs - half], axis=1)
+        corners_y = np.stack([ys - half, ys - half, ys + half, ys + half], axis=1)
+        lons, lats = transformer_metric_to_wgs.transform(corners_x.ravel(), corners_y.ravel())
+        ring = np.stack([np.reshape(lons, (-1, 4)), np.reshape(lats, (-1, 4))], axis=2)
+        return shapely.polygons(ring)
+
+    def _expand(self, xs, ys, size):
+        """
+        같은 크기 셀 여러 개를 걸러내고 점수 상한을 계산
+        - return: (남은 셀 중심 x, y, 점수 상한)
+        """
+        half = size / 2
+        self.cells_visited += len(xs)
+        boxes = shapely.box(xs - half, ys - half, xs + half, ys + half)
+        keep = shapely.intersects(self.region_metric, boxes)
+        if self.coverage is not None and keep.any():
+            polygons = self._bounds_to_wgs(xs[keep], ys[keep], half)
+            keep[keep] = ~shapely.contains(self.coverage, polygons)
+        xs, ys = xs[keep], ys[keep]
+
+        # 셀 안 임의 지점까지 거리는 (중심 거리 +- 반대각선) 범위
+        diagonal = half * np.sqrt(2)
+        nearest = self._nearest(xs, ys)
+        keep = nearest + diagonal >= self.min_distance
+        xs, ys, nearest = xs[keep], ys[keep], nearest[keep]
+        upper = self._score(nearest + diagonal, self._density(xs, ys, self.density_radius + diagonal))
+        return xs, ys, upper
+
+    def _evaluate(self, xs, ys):
+        """
+        셀 중심점의 입점 가능 여부와 실제 점수
+        - return: (입점 가능한 점 x, y, 점수, 최근접 거리, 반경 안 소매점 수)
+        """
+        self.points_evaluated += len(xs)
+        ok = shapely.contains_xy(self.region_metric, xs, ys)
+        nearest = self._nearest(xs, ys)
+        ok &= nearest >= self.min_distance
+        if self.coverage is not None and ok.any():
+            lons, lats = transformer_metric_to_wgs.transform(xs[ok], ys[ok])
+            ok[ok] = ~shapely.contains_xy(self.coverage, lons, lats)
+        xs, ys, nearest = xs[ok], ys[ok], nearest[ok]
+        density = self._density(xs, ys, self.density_radius)
+        return xs, ys, self._score(nearest, density), nearest, density
+
+    def _initial_cells(self):
+        """
+        영역 범위를 덮는 가장 큰 정사각형 셀 격자 (셀 크기 = 해상도 x 2^n)
+        """
+        minx, miny, maxx, maxy = self.region_metric.bounds
+        span = max(maxx - minx, maxy - miny, self.resolution)
+        size = self.resolution * 2 ** max(int(np.ceil(np.log2(span / self.resolution))) - 4, 0)
+        xs = np.arange(minx + size / 2, maxx + size / 2, size)
+        ys = np.arange(miny + size / 2, maxy + size / 2, size)
+        grid_x, grid_y = np.meshgrid(xs, ys)
+        return grid_x.ravel(), grid_y.ravel(), size
+
+    def run(self) -> list[dict]:
+        heap = []
+        counter = itertools.count()  # 같은 점수일 때 비교용
+
+        def push_cells(xs, ys, size):
+            if size <= self.resolution:
+                # 가장 작은 셀: 중심점을 바로 평가해 실제 점수로 넣음
+                for x, y, score, d, n in zip(*self._evaluate(xs, ys)):
+                    heapq.heappush(heap, (-score, next(counter), _POINT, (x, y, d, n)))
+                return
+            for x, y, bound in zip(*self._expand(xs, ys, size)):
+                heapq.heappush(heap, (-bound, next(counter), _CELL, (x, y, size)))
+
+        push_cells(*self._initial_cells())
+
+        selected = []
+        selected_xy = []
+        max_cells = settings.SITE_MAX_CELLS
+        while heap and len(selected) < self.limit:
+            neg_score, _, kind, item = heapq.heappop(heap)
+            if kind == _POINT:
+                x, y, distance, density = item
+                # 이미 뽑은 후보와 너무 가까우면 건너뜀
+                if selected_xy and np.min(np.hypot(*(np.asarray(selected_xy) - (x, y)).T)) < self.min_separation:
+                    continue
+                selected_xy.append((x, y))
+                selected.append((-neg_score, x, y, distance, density))
+                continue
+
+            x, y, size = item
+            if self.cells_visited >= max_cells:
+                # 탐색 한도 도달: 더 나누지 않고 셀 중심점으로 평가
+                push_cells(np.array([x]), np.array([y]), self.resolution)
+                continue
+            quarter = size / 4
+            push_cells(np.array([x - quarter, x + quarter, x - quarter, x + quarter]),
+                       np.array([y - quarter, y - quarter, y + quarter, y + quarter]), size / 2)
+
+        return self._results(selected)
+
+    def _results(self, selected) -> list[dict]:
+        if not selected:
+            return []
+        scores, xs, ys, distances, densities = (np.array(col) for col in zip(*selected))
+        lons, lats = transformer_metric_to_wgs.transform(xs, ys)
+        return [
+            {
+                "rank": rank,
+                "x": round(float(lon), 7),
+                "y": round(float(lat), 7),
+                "score": round(float(score), 4),
+                "nearest_retailer_meter": round(float(distance), 1) if np.isfinite(distance) else None,
+                "retailers_within_radius": int(density),
+            }
+            for rank, (lon, lat, score, distance, density)
+            in enumerate(zip(np.atleast_1d(lons), np.atleast_1d(lats), scores, distances, densities), start=1)
+        ]
+
+
+def find_sites(region, limit: int, resolution: float | None = None, min_separation: float | None = None,
+               distance_weight: float | None = None, density_weight: float | None = None) -> dict:
+    """
+    영역(WGS84 geometry) 안의 입점 후보지 상위 limit곳 (점수 내림차순)
+    """
+    area_km2 = to_metric(region).area / 1e6
+    if area_km2 > settings.SITE_MAX_AREA_KM2:
+        raise ValueError(f"탐색 영역이 너무 넓습니다. ({area_km2:.1f}km², 최대 {settings.SITE_MAX_AREA_KM2:g}km²)")
+
+    search = SiteSearch(
+        region,
+        coverage_service.get_coverage(),
+        retailer_index.get_index(),
+        limit=limit,
+        resolution=resolution or settings.SITE_RESOLUTION_METER,
+        min_separation=settings.SITE_MIN_SEPARATION_METER if min_separation is None else min_separation,
+        distance_weight=settings.SITE_DISTANCE_WEIGHT if distance_weight is None else distance_weight,
+        density_weight=settings.SITE_DENSITY_WEIGHT if density_weight is None else density_weight,
+    )
+    results = search.run()
+    return {
+        "count": len(results),
+        "resolution_meter": search.resolution,
+        "min_distance_meter": search.min_distance,
+        "weights": {"distance": search.distance_weight, "density": search.density_weight},
+        "cells_visited": search.cells_visited,
+        "points_evaluated": search.points_evaluated,
+        "results": results,
+    }
@@ -0,0 +1,143 @@
+# app/services/tile_service.py
+import asyncio
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core import metrics
+from app.core.database import AsyncSessionLocal
+from app.utils.cache import LRUCache, MISSING
+
+# --- 벡터 타일(Mapbox Vector Tile) 생성 ---
+# impossible.polygon_geom(제한 구역)과 address.geom(소매점 위치)을 PostGIS ST_AsMVT로 타일 단위로 잘라서 반환합니다.
+# 지도 응답 크기가 전체 데이터가 아니라 화면(타일) 범위에 비례하도록 하고,
+# 생성한 타일은 바이트 예산이 있는 LRU에 보관했다가 제한 구역/주소 데이터가 바뀌면 비웁니다.
+ZONE_LAYER = "restricted_zones"
+RETAILER_LAYER = "retailers"
+
+# EPSG:3857 세계 전체 폭 (미터)
+WEB_MERCATOR_WORLD_METER = 2 * 20037508.342789244
+
+_cache = LRUCache(
+    maxsize=settings.TILE_CACHE_SIZE,
+    max_bytes=settings.TILE_CACHE_MAX_BYTES,
+    sizeof=len,
+)
+metrics.register_cache("vector_tile", _cache)
+# 캐시 세대 (무효화 중에 생성이 끝난 예전 데이터 타일이 캐시에 들어가지 않도록 비교)
+_generation = 0
+# 같은 타일에 대한 동시 요청은 한 번만 생성
+_inflight: dict[tuple, asyncio.Future] = {}
+
+TILE_QUERY = text("""
+    WITH bounds AS (
+        SELECT ST_TileEnvelope(:z, :x, :y) AS geom,
+               ST_Transform(ST_TileEnvelope(:z, :x, :y, margin => CAST(:margin AS double precision)), 4326) AS geom_4326
+    ),
+    zones AS (
+        SELECT i.id, i.landlot_address,
+               ST_AsMVTGeom(
+                   ST_SimplifyPreserveTopology(ST_Transform(i.polygon_geom, 3857), :tolerance),
+                   bounds.geom, :extent, :buffer, true) AS geom
+        FROM impossible i, bounds
+        WHERE i.polygon_geom && bounds.geom_4326
+    ),
+    retailers AS (
+        SELECT a.landlot_address, a.road_name_address,
+               ST_AsMVTGeom(ST_Transform(a.geom, 3857), bounds.geom, :extent, :buffer, true) AS geom
+        FROM address a, bounds
+        WHERE :with_retailers AND a.geom && bounds.geom_4326
+    )
+    SELECT
+        (SELECT COALESCE(ST_AsMVT(z, :zone_layer, :extent, 'geom'), ''::bytea)
+         FROM (SELECT * FROM zones WHERE geom IS NOT NULL) AS z)
+        ||
+        (SELECT COALESCE(ST_AsMVT(r, :retailer_layer, :extent, 'geom'), ''::bytea)
+         FROM (SELECT * FROM retailers WHERE geom IS NOT NULL) AS r)
+""")
+
+
+def is_valid_tile(z: int, x: int, y: int) -> bool:
+    """
+    XYZ 타일 좌표가 유효 범위(0 <= x, y < 2^z, z <= TILE_MAX_ZOOM)인지 여부
+    """
+    if z < 0 or z > settings.TILE_MAX_ZOOM:
+        return False
+    n = 1 << z
+    return 0 <= x < n and 0 <= y < n
+
+
+def simplify_tolerance(z: int) -> float:
+    """
+    줌 레벨 z에서의 단순화 허용 오차 (EPSG:3857 미터)
+    - 화면 1픽셀(256px 타일 기준)이 차지하는 거리 x TILE_SIMPLIFY_PIXELS
+    """
+    pixel_meter = WEB_MERCATOR_WORLD_METER / (256 * (1 << z))
+    return pixel_meter * settings.TILE_SIMPLIFY_PIXELS
+
+
+async def _render_tile(z: int, x: int, y: int) -> bytes:
+    params = {
+        "z": z, "x": x, "y": y,
+        "margin": settings.TILE_BUFFER / settings.TILE_EXTENT,
+        "tolerance": simplify_tolerance(z),
+        "extent": settings.TILE_EXTENT,
+        "buffer": settings.TILE_BUFFER,
+        "with_retailers": z >= settings.TILE_RETAILER_MIN_ZOOM,
+        "zone_layer": ZONE_LAYER,
+        "retailer_layer": RETAILER_LAYER,
+    }
+    async with AsyncSessionLocal() as db:
+        tile = (await db.execute(TILE_QUERY, params)).scalar()
+    return bytes(tile or b"")
+
+
+async def get_tile(z: int, x: int, y: int) -> bytes:
+    """
+    타일(MVT 바이트)을 반환합니다. 비어 있는 타일은 b""
+    """
+    key = (z, x, y)
+    tile = _cache.get(key)
+    if tile is not MISSING:
+        return tile
+
+    future = _inflight.get(key)
+    if future is not None:
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                raise  # 이 요청 자체가 취소됨
+            # 타일을 생성하던 요청이 취소됨 (클라이언트 연결 끊김 등) -> 다시 시도
+            return await get_tile(z, x, y)
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    generation = _generation
+    try:
+        tile = await _render_tile(z, x, y)
+        if generation == _generation:
+            _cache.set(key, tile)
+        future.set_result(tile)
+        return tile
+    except Exception as e:
+        future.set_exception(e)
+        future.exception()  # 기다리는 요청이 없을 때 경고 방지
+        raise
+    finally:
+        _inflight.pop(key, None)
+        # 취소(BaseException)로 빠져나온 경우에도 기다리는 요청이 멈추지 않도록 future를 끝냄
+        if not future.done():
+            future.cancel()
+
+
+def invalidate():
+    """
+    제한 구역/주소 데이터가 바뀌었을 때 캐시된 타일을 모두 버립니다.
+    """
+    global _generation
+    _generation += 1
+    _cache.clear()
+
+
+def get_cache_stats() -> dict:
+    return {**_cache.stats(), "generation": _generation}
@@ -0,0 +1,177 @@
+# app/services/zone_index.py
+import asyncio
+import logging
+import numpy as np
+import shapely
+from shapely import STRtree
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.services import tile_service
+
+logger = logging.getLogger(__name__)
+
+# --- 제한 구역 메모리 공간 인덱스 ---
+# impossible 테이블은 작고 자주 바뀌지 않으므로, 앱 시작/제한 구역 재적재 시 한 번 읽어서
+# STRtree + prepared geometry로 보관하고 좌표 포함 여부는 DB 없이 메모리에서 판단합니다.
+# 지도 표시용 단순화 단계(LOD)도 이때 한 번 계산해 두고, 요청마다 단순화하지 않습니다.
+
+METER_PER_DEGREE = 111_320.0
+# 256px 타일 기준 줌 0에서 1픽셀의 거리 (적도, 미터)
+ZOOM0_PIXEL_METER = 156_543.03392
+
+
+def tolerance_for_zoom(zoom: int, latitude: float = 36.5) -> float:
+    """
+    줌 레벨에서 화면 0.5픽셀에 해당하는 거리(미터) = 그 줌에서 눈에 띄지 않는 단순화 허용 오차
+    """
+    return float(0.5 * ZOOM0_PIXEL_METER * np.cos(np.radians(latitude)) / (1 << zoom))
+
+
+def select_level(tolerance_meter: float | None) -> float:
+    """
+    요청 허용 오차 이하인 가장 거친 단순화 단계(미터), 해당 단계가 없으면 0(원본)
+    """
+    if tolerance_meter is None:
+        return 0.0
+    levels = [t for t in sorted(settings.POLYGON_LOD_TOLERANCES_METER) if t <= tolerance_meter]
+    return levels[-1] if levels else 0.0
+
+
+def _polygon_vertices(geometry) -> list[list[list[float]]]:
+    """
+    Polygon/MultiPolygon의 외곽선 좌표 목록 (impossible.vertices와 같은 [[경도, 위도], ...] 형식)
+    """
+    parts = geometry.geoms if geometry.geom_type == "MultiPolygon" else [geometry]
+    return [np.asarray(part.exterior.coords).tolist() for part in parts if not part.is_empty]
+
+
+class ZoneIndex:
+    def __init__(self, ids, addresses, geometries):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.addresses = list(addresses)
+        self.geometries = np.asarray(geometries, dtype=object)
+        shapely.prepare(self.geometries)
+        self.tree = STRtree(self.geometries)
+
+        # 단순화 단계별 geometry (허용 오차 오름차순, 미터)
+        self.lod_tolerances = sorted(settings.POLYGON_LOD_TOLERANCES_METER)
+        self.lod_geometries = [
+            shapely.simplify(self.geometries, tolerance / METER_PER_DEGREE, preserve_topology=True)
+            for tolerance in self.lod_tolerances
+        ]
+
+    def __len__(self):
+        return len(self.geometries)
+
+    def zones_at(self, x: float, y: float) -> list[int]:
+        """
+        좌표(x:경도, y:위도)를 포함하는 제한 구역 id 목록
+        """
+        candidates = self.tree.query(shapely.points(x, y))
+        if len(candidates) == 0:
+            return []
+        hit = shapely.contains_xy(self.geometries[candidates], x, y)
+        return self.ids[candidates[hit]].tolist()
+
+    def contains(self, x: float, y: float) -> bool:
+        """
+        좌표(x:경도, y:위도)가 제한 구역 중 하나라도 포함되는지 여부
+        """
+        candidates = self.tree.query(shapely.points(x, y))
+        if len(candidates) == 0:
+            return False
+        return bool(shapely.contains_xy(self.geometries[candidates], x, y).any())
+
+    def query_points(self, xs, ys):
+        """
+        여러 좌표를 한 번에 판정 (STRtree 일괄 bbox 조회 + contains_xy 벡터 연산)
+        - return: (포함 여부 bool 배열, 점마다 포함하는 제한 구역 id 목록)
+        """
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        inside = np.zeros(len(xs), dtype=bool)
+        zone_ids = [[] for _ in range(len(xs))]
+        if len(xs) == 0 or len(self) == 0:
+            return inside, zone_ids
+
+        point_idx, zone_idx = self.tree.query(shapely.points(xs, ys))
+        hit = shapely.contains_xy(self.geometries[zone_idx], xs[point_idx], ys[point_idx])
+        point_idx, zone_idx = point_idx[hit], zone_idx[hit]
+        inside[point_idx] = True
+
+        # 점 순서로 정렬한 뒤 점별로 구역 id 묶기
+        order = np.lexsort((zone_idx, point_idx))
+        point_idx, hit_ids = point_idx[order], self.ids[zone_idx[order]]
+        unique_points, starts = np.unique(point_idx, return_index=True)
+        for point, ids in zip(unique_points.tolist(), np.split(hit_ids, starts[1:])):
+            zone_ids[point] = ids.tolist()
+        return inside, zone_ids
+
+    def polygons(self, bbox: tuple[float, float, float, float] | None = None,
+                 tolerance_meter: float | None = None) -> tuple[list[int], list, float]:
+        """
+        bbox(minx, miny, maxx, maxy)와 겹치는 제한 구역의 외곽선 좌표를 단순화 단계에 맞춰 반환
+        - return: (구역 id 목록, 구역별 외곽선 좌표 목록(MultiPolygon이면 조각마다 하나), 사용한 단순화 단계(미터))
+        """
+        if bbox is None:
+            idx = np.arange(len(self))
+        else:
+            area = shapely.box(*bbox)
+            idx = np.sort(self.tree.query(area, predicate="intersects"))
+
+        level = select_level(tolerance_meter)
+        geometries = self.geometries if level == 0.0 else self.lod_geometries[self.lod_tolerances.index(level)]
+
+        idx = idx.tolist()
+        return self.ids[idx].tolist(), [_polygon_vertices(geometries[i]) for i in idx], level
+
+
+_index: ZoneIndex | None = None
+
+
+def get_index() -> ZoneIndex | None:
+    """
+    현재 제한 구역 인덱스 (아직 로드되지 않았으면 None)
+    """
+    return _index
+
+
+def is_loaded() -> bool:
+    return _index is not None
+
+
+async def _load_rows():
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(text("""
+            SELECT id, landlot_address, ST_AsBinary(polygon_geom)
+            FROM impossible
+            WHERE polygon_geom IS NOT NULL
+            ORDER BY id
+        """))
+        return result.fetchall()
+
+
+def build_index(rows) -> ZoneIndex:
+    """
+    (id, landlot_address, WKB) 행 목록으로 인덱스 생성
+    """
+    ids = [row[0] for row in rows]
+    addresses = [row[1] for row in rows]
+    geometries = shapely.from_wkb([bytes(row[2]) for row in rows]) if rows else []
+    return ZoneIndex(ids, addresses, geometries)
+
+
+async def reload():
+    """
+    impossible 테이블을 다시 읽어 인덱스를 재생성합니다. (실패 시 기존 인덱스 유지)
+    """
+    global _index
+    try:
+        rows = await _load_rows()
+        _index = await asyncio.to_thread(build_index, rows)
+        tile_service.invalidate() # 제한 구역이 바뀌었으므로 캐시된 타일 폐기
+        logger.info("제한 구역 인덱스 생성 완료: %s개", len(_index))
+    except Exception as e:
+        logger.error("제한 구역 인덱스 생성 중 오류 발생: %s", e)
@@ -0,0 +1,273 @@
+# app/services/zone_job.py
+import asyncio
+import csv
+import datetime
+import json
+import logging
+import os
+import re
+import uuid
+import shapely
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.services import isochrone_engine, zone_index, coverage_service, eligibility_service, raster_service, dataset_version
+from app.services.ors_api import get_isochrone_polygon
+from app.services.db_service import get_valid_address, zone_row_key
+from app.utils.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# --- 제한 구역 계산 작업 (병렬 + 속도 제한 + 체크포인트/재개) ---
+# - csv 싱크: 완료된 행을 즉시 CSV에 추가 기록 → CSV 파일 자체가 체크포인트 (재실행 시 기록된 주소는 건너뜀)
+# - db 싱크: 완료된 행을 즉시 impossible 테이블에 저장 → impossible 테이블이 체크포인트
+ZONE_CSV_COLUMNS = ["landlot_address", "centroid_x", "centroid_y", "polygon_geom", "vertices"]
+SINKS = ("csv", "db")
+# job_id는 결과 CSV 파일 이름에 들어가므로 경로 구분자/.. 가 들어가지 않도록 제한
+JOB_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]+$")
+
+# job_id -> 진행 상황
+jobs: dict[str, dict] = {}
+_tasks: dict[str, asyncio.Task] = {}
+
+
+def new_job_id() -> str:
+    # 같은 초에 시작한 작업끼리 ID(= CSV 파일)가 겹치지 않도록 무작위 접미사 추가
+    return f"{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+
+
+def validate_job_id(job_id: str) -> str:
+    if not JOB_ID_PATTERN.fullmatch(job_id or ""):
+        raise ValueError(f"job_id는 영문/숫자/_/- 만 사용할 수 있습니다: {job_id!r}")
+    return job_id
+
+
+def job_csv_path(job_id: str) -> str:
+    return os.path.join(settings.ZONE_JOB_DIR, f"restricted_zone_{validate_job_id(job_id)}.csv")
+
+
+def build_zone_row(landlot_address: str, polygon) -> dict:
+    """
+    Shapely Polygon을 restricted_zone.csv / impossible 테이블 형식의 행으로 변환
+    """
+    centroid = polygon.centroid
+    return {
+        "landlot_address": landlot_address,
+        "centroid_x": centroid.x,
+        "centroid_y": centroid.y,
+        "polygon_geom": polygon.wkt,
+        "vertices": json.dumps(list(polygon.exterior.coords)),
+    }
+
+
+def _completed_from_csv(path: str) -> set[str]:
+    if not os.path.exists(path):
+        return set()
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return {row["landlot_address"] for row in csv.DictReader(f) if row.get("landlot_address")}
+
+
+async def _completed_from_db() -> set[str]:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(text("SELECT DISTINCT landlot_address FROM impossible"))
+        return {row[0] for row in result.fetchall()}
+
+
+class _CsvSink:
+    """완료된 행을 CSV 파일 끝에 바로 기록 (중단되어도 기록된 행은 보존)"""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        # UTF-8-SIG(엑셀 한글 깨짐 방지): BOM은 새 파일의 맨 앞에만 기록
+        self._file = open(path, "a", newline="", encoding="utf-8-sig" if is_new else "utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=ZONE_CSV_COLUMNS)
+        if is_new:
+            self._writer.writeheader()
+            self._file.flush()
+
+    async def write(self, row: dict):
+        self._writer.writerow(row)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class _DbSink:
+    """완료된 행을 impossible 테이블에 바로 저장 (제한 구역 합집합에도 바로 반영)"""
+
+    INSERT_QUERY = text("""
+        INSERT INTO impossible (
+            landlot_address, centroid_x, centroid_y,
+            polygon_geom, vertices, row_key)
+        VALUES (
+            :landlot_address, :centroid_x, :centroid_y,
+            ST_SetSRID(ST_GeomFromText(:polygon_geom), 4326),
+            :vertices, :row_key);
+    """)
+
+    async def write(self, row: dict):
+        row_key = zone_row_key(row["landlot_address"], row["centroid_x"], row["centroid_y"],
+                               row["polygon_geom"], row["vertices"])
+        async with AsyncSessionLocal() as db:
+            await db.execute(self.INSERT_QUERY, {**row, "row_key": row_key})
+            await db.commit()
+        await coverage_service.add_zone(shapely.from_wkt(row["polygon_geom"]))
+
+    def close(self):
+        pass
+
+
+async def run_zone_job(job_id: str, sink: str = "csv") -> dict:
+    """
+    address 테이블의 모든 위치에 대해 제한 구역을 계산합니다.
+    이미 완료된 주소(CSV 파일 또는 impossible 테이블 기준)는 건너뛰므로, 같은 job_id로 다시 실행하면 이어서 계산합니다.
+    """
+    if sink not in SINKS:
+        raise ValueError(f"지원하지 않는 sink 입니다: {sink}")
+    validate_job_id(job_id)
+
+    status = jobs.setdefault(job_id, {})
+    status.update({
+        "job_id": job_id,
+        "sink": sink,
+        "state": "running",
+        "total": 0,
+        "skipped": 0,
+        "done": 0,
+        "failed": 0,
+        "failed_addresses": [],
+        "path": job_csv_path(job_id) if sink == "csv" else None,
+        "started_at": datetime.datetime.now().isoformat(),
+        "finished_at": None,
+        "error": None,
+    })
+
+    writer = None
+    try:
+        rows = await get_valid_address()
+
+        if sink == "csv":
+            completed = await asyncio.to_thread(_completed_from_csv, status["path"])
+        else:
+            completed = await _completed_from_db()
+
+        # 같은 주소는 한 번만 계산
+        todo = {}
+        for landlot_addr, longitude, latitude in rows:
+            if landlot_addr not in completed and landlot_addr not in todo:
+                todo[landlot_addr] = (latitude, longitude)
+
+        status["total"] = len(todo)
+        status["skipped"] = len(completed)
+        logger.info("[zone job %s] 계산 대상 %s개 (완료되어 건너뜀: %s개)", job_id, len(todo), len(completed))
+
+        writer = _CsvSink(status["path"]) if sink == "csv" else _DbSink()
+        status["engine"] = settings.ISOCHRONE_ENGINE
+
+        if settings.ISOCHRONE_ENGINE == "local":
+            await _run_local_engine(job_id, status, list(todo.items()), writer)
+        else:
+            await _run_ors_engine(job_id, status, list(todo.items()), writer)
+
+        status["state"] = "completed"
+        logger.info("[zone job %s] 완료: 성공 %s, 실패 %s", job_id, status['done'], status['failed'])
+
+        if sink == "db" and status["done"]:
+            await zone_index.reload()
+            await coverage_service.flush()
+            eligibility_service.invalidate()
+            raster_service.schedule_refresh()
+            await dataset_version.bump(dataset_version.ZONES)
+
+    except asyncio.CancelledError:
+        status["state"] = "cancelled"
+        raise
+    except Exception as e:
+        logger.error("[zone job %s] 제한 구역 계산 중 오류 발생: %s", job_id, e)
+        status["state"] = "failed"
+        status["error"] = str(e)
+    finally:
+        if writer:
+            writer.close()
+        status["finished_at"] = datetime.datetime.now().isoformat()
+
+    return status
+
+
+async def _run_ors_engine(job_id: str, status: dict, todo: list, writer):
+    """
+    ORS API: ORS_RATE_PER_MIN 속도 제한 안에서 ZONE_JOB_CONCURRENCY개 요청을 병렬로 실행
+    """
+    limiter = TokenBucket(settings.ORS_RATE_PER_MIN / 60, capacity=1)
+    queue: asyncio.Queue = asyncio.Queue()
+    for item in todo:
+        queue.put_nowait(item)
+
+    async def worker():
+        while True:
+            try:
+                landlot_addr, (latitude, longitude) = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            await limiter.acquire()
+            # ORS를 사용해 Polygon 계산 (Shapely 객체)
+            shapely_poly = await get_isochrone_polygon(latitude, longitude)
+
+            if shapely_poly is None:
+                logger.warning("[zone job %s] 제한 구역 계산 실패: address=%s", job_id, landlot_addr)
+                status["failed"] += 1
+                status["failed_addresses"].append(landlot_addr)
+                continue
+
+            await writer.write(build_zone_row(landlot_addr, shapely_poly))
+            status["done"] += 1
+
+    workers = [asyncio.create_task(worker())
+               for _ in range(min(settings.ZONE_JOB_CONCURRENCY, len(todo)))]
+    await asyncio.gather(*workers)
+
+
+async def _run_local_engine(job_id: str, status: dict, todo: list, writer):
+    """
+    오프라인 엔진: API 속도 제한 없이 ISOCHRONE_BATCH_SIZE 묶음 단위로 프로세스 풀에서 계산
+    """
+    batch_size = settings.ISOCHRONE_BATCH_SIZE
+    for i in range(0, len(todo), batch_size):
+        batch = todo[i:i + batch_size]
+        polygons = await isochrone_engine.get_isochrone_polygons([origin for _, origin in batch])
+
+        for (landlot_addr, _), (shapely_poly, error) in zip(batch, polygons):
+            if shapely_poly is None:
+                logger.warning("[zone job %s] 제한 구역 계산 실패: address=%s, error=%s", job_id, landlot_addr, error)
+                status["failed"] += 1
+                status["failed_addresses"].append(landlot_addr)
+                continue
+            await writer.write(build_zone_row(landlot_addr, shapely_poly))
+            status["done"] += 1
+
+
+def start_zone_job(job_id: str | None = None, sink: str = "csv") -> dict:
+    """
+    제한 구역 계산 작업을 백그라운드에서 시작합니다. (실행 중인 같은 job_id가 있으면 그 상태를 반환)
+    """
+    job_id = validate_job_id(job_id) if job_id else new_job_id()
+    task = _tasks.get(job_id)
+    if task and not task.done():
+        return jobs[job_id]
+
+    if sink not in SINKS:
+        raise ValueError(f"지원하지 않는 sink 입니다: {sink}")
+
+    jobs[job_id] = {"job_id": job_id, "sink": sink, "state": "pending"}
+    _tasks[job_id] = asyncio.create_task(run_zone_job(job_id, sink))
+    return jobs[job_id]
+
+
+def cancel_all_jobs():
+    for task in _tasks.values():
+        if not task.done():
+            task.cancel()
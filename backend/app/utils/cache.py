@@ -0,0 +1,93 @@
+#app/utils/cache.py
+import time
+from collections import OrderedDict
+
+# 캐시에 값이 없음을 나타내는 표식 (None 자체도 캐시할 수 있도록 별도 객체 사용)
+MISSING = object()
+
+
+class LRUCache:
+    """
+    만료 시간(TTL)을 지원하는 프로세스 내 LRU 캐시
+    - maxsize: 최대 항목 수 (초과 시 가장 오래 사용되지 않은 항목부터 제거)
+    - ttl: 기본 만료 시간(초), None이면 만료되지 않음
+    - max_bytes: 메모리 예산(바이트), sizeof로 계산한 항목 크기 합이 넘으면 LRU 순으로 제거
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float | None = None,
+                 max_bytes: int | None = None, sizeof=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._data: OrderedDict = OrderedDict()  # key -> (value, expires_at, size)
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=MISSING):
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        value, expires_at, _ = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value, ttl: float | None = None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        size = self.sizeof(value) if self.sizeof else 0
+
+        # 단일 항목이 예산 전체보다 크면 캐시하지 않음
+        if self.max_bytes is not None and size > self.max_bytes:
+            self._remove(key)
+            return
+
+        self._remove(key)
+        self._data[key] = (value, expires_at, size)
+        self._bytes += size
+
+        while len(self._data) > self.maxsize or \
+                (self.max_bytes is not None and self._bytes > self.max_bytes):
+            _, (_, _, evicted_size) = self._data.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+    def _remove(self, key):
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+        return entry
+
+    def pop(self, key, default=None):
+        entry = self._remove(key)
+        return default if entry is None else entry[0]
+
+    def clear(self):
+        self._data.clear()
+        self._bytes = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
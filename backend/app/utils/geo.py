@@ -1,57 +1,149 @@
 #app/utils/geo.py
+import logging
 import math
+import numpy as np
+import pandas as pd
 import pyproj
 
+logger = logging.getLogger(__name__)
+
 # --- DB 좌표 변환용 (EPSG:5174 -> WGS84) ---
 proj_katech = pyproj.CRS("EPSG:5174")
 proj_wgs84 = pyproj.CRS("EPSG:4326")
 transformer_epsg_to_wgs = pyproj.Transformer.from_crs(proj_katech, proj_wgs84, always_xy=True)
 
+# --- 미터 단위 계산용 (WGS84 <-> EPSG:5179, 한국 통합 좌표계) ---
+proj_metric = pyproj.CRS("EPSG:5179")
+transformer_wgs_to_metric = pyproj.Transformer.from_crs(proj_wgs84, proj_metric, always_xy=True)
+transformer_metric_to_wgs = pyproj.Transformer.from_crs(proj_metric, proj_wgs84, always_xy=True)
+
+# --- 웹 지도 타일용 (EPSG:3857 -> EPSG:5179) ---
+proj_web_mercator = pyproj.CRS("EPSG:3857")
+transformer_mercator_to_metric = pyproj.Transformer.from_crs(proj_web_mercator, proj_metric, always_xy=True)
+
+EARTH_RADIUS_METER = 6371000  # 지구 반지름 (미터)
+NAVER_MAPCOORD_SCALE = 10_000_000  # 네이버 검색 API 좌표 배율
+
+
+# --- 배열 연산 함수 (NumPy 배열 / pandas Series를 한 번에 처리) ---
+def _to_float_array(values) -> np.ndarray:
+    """
+    숫자/문자열/None이 섞인 입력을 float 배열로 변환 (변환 불가 값은 NaN)
+    """
+    arr = np.asarray(values)
+    if arr.dtype.kind in "fiu":
+        return arr.astype(np.float64).ravel()
+    return pd.to_numeric(pd.Series(arr.ravel(), dtype=object), errors="coerce").to_numpy(dtype=np.float64)
+
+
+def haversine_distance(lat1, lon1, lat2, lon2):
+    """
+    Haversine 거리(미터) 계산. 입력은 스칼라/배열 모두 가능하며 NumPy 브로드캐스팅 규칙을 따릅니다.
+    """
+    phi1, phi2 = np.radians(lat1), np.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = np.radians(np.asarray(lon2, dtype=np.float64) - np.asarray(lon1, dtype=np.float64))
+
+    a = np.sin(dphi / 2)**2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlambda / 2)**2
+    a = np.clip(a, 0.0, 1.0)
+
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    return EARTH_RADIUS_METER * c
+
+
+def distances_from_point(lat, lon, lats, lons):
+    """
+    한 지점에서 여러 지점까지의 거리(미터) 배열
+    """
+    return haversine_distance(lat, lon, np.asarray(lats, dtype=np.float64), np.asarray(lons, dtype=np.float64))
+
+
+def haversine_distance_matrix(lats1, lons1, lats2, lons2):
+    """
+    지점 집합 1(n개)과 지점 집합 2(m개) 사이의 거리 행렬 (n x m, 미터)
+    """
+    lats1 = np.asarray(lats1, dtype=np.float64)[:, None]
+    lons1 = np.asarray(lons1, dtype=np.float64)[:, None]
+    lats2 = np.asarray(lats2, dtype=np.float64)[None, :]
+    lons2 = np.asarray(lons2, dtype=np.float64)[None, :]
+    return haversine_distance(lats1, lons1, lats2, lons2)
+
+
+def convert_epsg5174_to_wgs84_array(xs_5174, ys_5174):
+    """
+    EPSG:5174 좌표 배열을 WGS84(경도, 위도) 배열로 변환합니다.
+    변환할 수 없는 값(None, -1, NaN, inf)은 NaN으로 반환합니다.
+    """
+    xs = _to_float_array(xs_5174)
+    ys = _to_float_array(ys_5174)
+
+    valid = np.isfinite(xs) & np.isfinite(ys) & (xs != -1.0) & (ys != -1.0)
+    lons = np.full(len(xs), np.nan)
+    lats = np.full(len(ys), np.nan)
+    if valid.any():
+        lons[valid], lats[valid] = transformer_epsg_to_wgs.transform(xs[valid], ys[valid])
+
+    invalid = ~(np.isfinite(lons) & np.isfinite(lats))
+    lons[invalid] = np.nan
+    lats[invalid] = np.nan
+    return lons, lats
+
+
+def convert_naver_mapcoords_to_wgs84_array(mapx, mapy):
+    """
+    네이버 검색 API 좌표(문자열) 배열을 WGS84(경도, 위도) 배열로 변환 (1e7 나누기)
+    변환할 수 없는 값은 NaN으로 반환합니다.
+    """
+    xs = _to_float_array(mapx)
+    ys = _to_float_array(mapy)
+
+    invalid = np.isnan(xs) | np.isnan(ys)
+    lons = xs / NAVER_MAPCOORD_SCALE
+    lats = ys / NAVER_MAPCOORD_SCALE
+    lons[invalid] = np.nan
+    lats[invalid] = np.nan
+    return lons, lats
+
+
+# --- 단건 함수 (배열 경로를 거치지 않는 순수 math 구현, 호출당 비용이 작음) ---
 # 거리 계산 함수 (Haversine Formula)
 def calculate_distance(lat1, lon1, lat2, lon2):
-    R = 6371000  # 지구 반지름 (미터)
     phi1, phi2 = math.radians(lat1), math.radians(lat2)
     dphi = math.radians(lat2 - lat1)
     dlambda = math.radians(lon2 - lon1)
-    
+
     a = math.sin(dphi / 2)**2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2)**2
-    
+
     a = max(0.0, min(1.0, a))
 
     c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    return R * c
+    return EARTH_RADIUS_METER * c
 
 # --- 좌표 변환 함수 ---
 def convert_epsg5174_to_wgs84(x_5174, y_5174):
     """
-    EPSG:5174 좌표를 WGS84(위도, 경도)로 변환합니다.
+    EPSG:5174 좌표를 WGS84(경도, 위도)로 변환합니다.
     """
-    # 입력 값 유효성 검사
-    if x_5174 is None or y_5174 is None:
-        return None, None
-    if x_5174 == -1.0 or y_5174 == -1.0:
-        return None, None
-    if math.isnan(x_5174) or math.isnan(y_5174):
-        return None, None
-
     try:
-        crs_5174 = pyproj.CRS("EPSG:5174")
-        crs_4326 = pyproj.CRS("EPSG:4326")
-        
-        transformer = pyproj.Transformer.from_crs(crs_5174, crs_4326, always_xy=True)
+        # 입력 값 유효성 검사 (배열이 아닌 파이썬 float으로 transform에 넘김)
+        if x_5174 is None or y_5174 is None:
+            return None, None
+        x_5174, y_5174 = float(x_5174), float(y_5174)
+        if x_5174 == -1.0 or y_5174 == -1.0 or not (math.isfinite(x_5174) and math.isfinite(y_5174)):
+            return None, None
+
         # transform 결과는 (경도, 위도) 순서입니다 (always_xy=True 덕분)
-        lon_4326, lat_4326 = transformer.transform(x_5174, y_5174)
-        
+        lon_4326, lat_4326 = transformer_epsg_to_wgs.transform(x_5174, y_5174)
+
         # 결과 유효성 검사
-        if math.isnan(lat_4326) or math.isinf(lat_4326) or \
-           math.isnan(lon_4326) or math.isinf(lon_4326):
+        if not (math.isfinite(lon_4326) and math.isfinite(lat_4326)):
             return None, None
 
-        return lon_4326, lat_4326 # (위도, 경도) 반환
+        return float(lon_4326), float(lat_4326) # (경도, 위도) 반환
     except Exception as e:
-        print(f"좌표 변환 오류: {e}")
+        logger.warning("좌표 변환 오류: %s", e)
         return None, None
-    
+
 
 def convert_naver_mapcoord_to_wgs84(mapx_str: str | None, mapy_str: str | None) -> tuple[float | None, float | None]:
     """네이버 검색 API 좌표(문자열)를 WGS84(경도, 위도)로 변환 (1e7 나누기)"""
@@ -59,8 +151,10 @@ def convert_naver_mapcoord_to_wgs84(mapx_str: str | None, mapy_str: str | None)
         return None, None
     try:
         # [중요] 네이버 검색 API 좌표 처리 방식 (1e7로 나누기)
-        lon = float(mapx_str) / 10_000_000
-        lat = float(mapy_str) / 10_000_000
-        return lon, lat
+        lon = float(mapx_str) / NAVER_MAPCOORD_SCALE
+        lat = float(mapy_str) / NAVER_MAPCOORD_SCALE
     except (ValueError, TypeError):
-        return None, None
\ No newline at end of file
+        return None, None
+    if math.isnan(lon) or math.isnan(lat):
+        return None, None
+    return lon, lat
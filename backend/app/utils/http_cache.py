@@ -0,0 +1,96 @@
+#app/utils/http_cache.py
+from fastapi import Request, Response, status
+from fastapi.responses import StreamingResponse
+
+from app.core import metrics
+from app.core.config import settings
+from app.utils import streaming
+from app.utils.cache import LRUCache, MISSING
+
+# --- 조건부 GET(ETag/304) + 직렬화된 응답 바이트 캐시 ---
+# 키에 데이터셋 버전이 들어간 ETag를 쓰므로, 데이터가 바뀌면 예전 항목은 다시 조회되지 않고 LRU로 밀려납니다.
+# 캐시는 압축 방식별로 (압축까지 끝난) 최종 바이트를 보관합니다.
+_cache = LRUCache(
+    maxsize=settings.RESPONSE_CACHE_SIZE,
+    max_bytes=settings.RESPONSE_CACHE_MAX_BYTES,
+    sizeof=len,
+)
+metrics.register_cache("response", _cache)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    If-None-Match 헤더가 ETag와 일치하는지 (약한 비교)
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    target = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == target for tag in header.split(","))
+
+
+def _headers(etag: str) -> dict:
+    return {
+        "ETag": etag,
+        "Cache-Control": settings.DATASET_HTTP_CACHE_CONTROL,
+        "Vary": "Accept-Encoding, Accept",
+    }
+
+
+async def _tee(chunks, key):
+    """
+    스트림을 그대로 내보내면서 모아 두었다가, 끝까지 전송되고 크기 한도 안이면 캐시에 저장
+    """
+    parts, size = [], 0
+    async for chunk in chunks:
+        if parts is not None:
+            size += len(chunk)
+            if size <= settings.RESPONSE_CACHE_MAX_ITEM_BYTES:
+                parts.append(chunk)
+            else:
+                parts = None  # 너무 큰 응답은 캐시하지 않고 스트리밍만
+        yield chunk
+    if parts is not None:
+        _cache.set(key, b"".join(parts))
+
+
+def lookup(request: Request, etag: str, fmt: str) -> Response | None:
+    """
+    ETag로 바로 답할 수 있으면 응답, 아니면 None
+    - If-None-Match 일치: 304 (본문 없음)
+    - 캐시에 같은 (ETag, 형식, 압축 방식) 바이트가 있으면 그대로 반환
+    """
+    headers = _headers(etag)
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    encoding = streaming.negotiate_encoding(request.headers.get("accept-encoding", ""))
+    body = _cache.get((etag, fmt, encoding))
+    if body is MISSING:
+        return None
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=streaming.MEDIA_TYPES[fmt], headers=headers)
+
+
+def caching_response(request: Request, etag: str, fmt: str, chunks) -> StreamingResponse:
+    """
+    본문을 스트리밍하면서 (ETag, 형식, 압축 방식) 키로 캐시에 저장하는 응답
+    """
+    headers = _headers(etag)
+    encoding = streaming.negotiate_encoding(request.headers.get("accept-encoding", ""))
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+        chunks = streaming.compress(chunks, encoding)
+    return StreamingResponse(_tee(chunks, (etag, fmt, encoding)),
+                             media_type=streaming.MEDIA_TYPES[fmt], headers=headers)
+
+
+def clear():
+    _cache.clear()
+
+
+def get_cache_stats() -> dict:
+    return _cache.stats()
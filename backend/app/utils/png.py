@@ -0,0 +1,29 @@
+#app/utils/png.py
+import struct
+import zlib
+import numpy as np
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _chunk(tag: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+
+def encode_png_rgba(pixels: np.ndarray, level: int = 6) -> bytes:
+    """
+    (높이, 너비, 4) uint8 RGBA 배열을 PNG 바이트로 인코딩 (외부 이미지 라이브러리 없이 zlib만 사용)
+    """
+    pixels = np.ascontiguousarray(pixels, dtype=np.uint8)
+    if pixels.ndim != 3 or pixels.shape[2] != 4:
+        raise ValueError("RGBA (높이, 너비, 4) 배열이어야 합니다.")
+    height, width = pixels.shape[:2]
+
+    # 각 행 앞에 필터 타입 0(None) 바이트를 붙여 한 번에 압축
+    raw = np.zeros((height, width * 4 + 1), dtype=np.uint8)
+    raw[:, 1:] = pixels.reshape(height, width * 4)
+    header = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)  # 8bit, RGBA
+    return (PNG_SIGNATURE
+            + _chunk(b"IHDR", header)
+            + _chunk(b"IDAT", zlib.compress(raw.tobytes(), level))
+            + _chunk(b"IEND", b""))
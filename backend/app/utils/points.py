@@ -0,0 +1,92 @@
+#app/utils/points.py
+import json
+import numpy as np
+from fastapi import HTTPException, Request, status
+
+from app.core.config import settings
+
+
+def too_many_points(max_points: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"한 번에 최대 {max_points}개 좌표까지 요청할 수 있습니다.")
+
+
+async def read_points_body(request: Request, max_points: int) -> bytes:
+    """
+    일괄 좌표 요청 본문을 최대 좌표 수에서 정한 바이트 상한까지만 읽음 (넘으면 파싱 전에 413)
+    - Content-Length가 상한을 넘으면 본문을 읽지 않고, 없거나 틀린 경우에도 스트림을 읽는 도중에 끊음
+    """
+    limit = max_points * settings.BATCH_BYTES_PER_POINT
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > limit:
+        raise too_many_points(max_points)
+
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > limit:
+            raise too_many_points(max_points)
+    return bytes(body)
+
+
+def point_from_item(item) -> tuple[float, float]:
+    """
+    [x, y] / {"x", "y"} / GeoJSON Point / GeoJSON Feature(Point) 중 하나를 (경도, 위도)로 변환
+    """
+    if isinstance(item, (list, tuple)):
+        return float(item[0]), float(item[1])
+    if isinstance(item, dict):
+        if item.get("type") == "Feature":
+            return point_from_item(item.get("geometry") or {})
+        if item.get("type") == "Point":
+            return point_from_item(item["coordinates"])
+        if "x" in item and "y" in item:
+            return float(item["x"]), float(item["y"])
+    raise ValueError(f"좌표 형식을 알 수 없습니다: {item}")
+
+
+def parse_points(body: bytes, content_type: str):
+    """
+    일괄 요청 본문을 경도/위도 배열로 변환
+    - JSON: 좌표 배열, {"points": [...]}, GeoJSON FeatureCollection / MultiPoint
+    - NDJSON(application/x-ndjson): 한 줄에 좌표 하나
+    """
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        items = [json.loads(line) for line in body.splitlines() if line.strip()]
+    else:
+        data = json.loads(body)
+        if isinstance(data, dict) and data.get("type") == "FeatureCollection":
+            items = data.get("features", [])
+        elif isinstance(data, dict) and data.get("type") == "MultiPoint":
+            items = data.get("coordinates", [])
+        elif isinstance(data, dict) and "points" in data:
+            items = data["points"]
+        elif isinstance(data, list):
+            items = data
+        else:
+            raise ValueError("points 배열, GeoJSON 또는 NDJSON 형식이어야 합니다.")
+
+    # [[x, y], ...] 형식은 한 번에 배열로 변환
+    try:
+        coords = np.asarray(items, dtype=np.float64)
+        if coords.ndim == 2 and coords.shape[1] >= 2:
+            return coords[:, 0], coords[:, 1]
+    except (ValueError, TypeError):
+        pass
+
+    coords = np.array([point_from_item(item) for item in items], dtype=np.float64).reshape(-1, 2)
+    return coords[:, 0], coords[:, 1]
+
+
+def parse_bbox(bbox: str) -> tuple[float, float, float, float]:
+    """
+    "minx,miny,maxx,maxy" (경도/위도) 문자열을 튜플로 변환
+    """
+    values = [float(v) for v in bbox.split(",")]
+    if len(values) != 4:
+        raise ValueError("bbox는 minx,miny,maxx,maxy 4개 값이어야 합니다.")
+    minx, miny, maxx, maxy = values
+    if minx > maxx or miny > maxy:
+        raise ValueError("bbox의 최소값이 최대값보다 큽니다.")
+    return minx, miny, maxx, maxy
@@ -0,0 +1,36 @@
+#app/utils/rate_limit.py
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    비동기 토큰 버킷 속도 제한기
+    - rate: 초당 보충되는 토큰 수 (= 허용 요청 수/초)
+    - capacity: 버킷 최대 크기 (순간적으로 허용되는 요청 수), 기본값은 rate
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        if rate <= 0:
+            raise ValueError("rate는 0보다 커야 합니다.")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self, tokens: float = 1.0):
+        """
+        토큰을 얻을 때까지 대기합니다. (대기 순서는 호출 순서를 따름)
+        """
+        async with self._lock:
+            self._refill()
+            if self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= tokens
@@ -0,0 +1,168 @@
+#app/utils/streaming.py
+import zlib
+import orjson
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # brotli 패키지가 없으면 gzip만 사용
+    brotli = None
+
+# --- 대용량 응답 스트리밍 ---
+# DB 커서/메모리 인덱스에서 받은 행 묶음(partition)을 바로 직렬화해 내보내므로,
+# 요청당 메모리는 전체 결과가 아니라 한 묶음 크기만큼만 사용합니다.
+# - 형식: JSON 배열(청크 전송) 또는 NDJSON (한 줄에 한 항목)
+# - 압축: Accept-Encoding에 따라 br(brotli 설치 시) / gzip
+JSON = "json"
+NDJSON = "ndjson"
+MEDIA_TYPES = {JSON: "application/json", NDJSON: "application/x-ndjson"}
+
+
+def dumps(obj) -> bytes:
+    """
+    orjson 직렬화 (NumPy 배열/스칼라 포함)
+    """
+    return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def negotiate_format(request: Request, fmt: str | None) -> str:
+    """
+    응답 형식 결정 (format 쿼리 > Accept 헤더 > JSON)
+    """
+    if fmt:
+        return fmt
+    accept = request.headers.get("accept", "")
+    return NDJSON if "ndjson" in accept or "jsonlines" in accept else JSON
+
+
+def _quality_values(header: str) -> dict[str, float]:
+    values = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        values[name.strip().lower()] = q
+    return values
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """
+    Accept-Encoding 헤더에서 사용할 압축 방식 선택 (br > gzip, q=0은 제외, 없으면 None)
+    """
+    values = _quality_values(accept_encoding or "")
+    candidates = (["br"] if brotli is not None else []) + ["gzip"]
+    best, best_q = None, 0.0
+    for name in candidates:
+        q = values.get(name, values.get("*", 0.0))
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def join_items(items: list, fmt: str) -> bytes:
+    """
+    항목 묶음을 한 번에 직렬화 (JSON: 쉼표로 이어진 항목들, NDJSON: 줄 단위)
+    """
+    if not items:
+        return b""
+    if fmt == NDJSON:
+        return b"\n".join(map(dumps, items)) + b"\n"
+    return dumps(items)[1:-1]
+
+
+def join_fragments(fragments: list[bytes], fmt: str) -> bytes:
+    """
+    이미 JSON으로 직렬화된 항목 묶음을 이어 붙임 (DB에서 ::text로 받은 JSON 등)
+    """
+    if not fragments:
+        return b""
+    if fmt == NDJSON:
+        return b"\n".join(fragments) + b"\n"
+    return b",".join(fragments)
+
+
+async def frame(segments, fmt: str, head: bytes = b"[", tail: bytes = b"]"):
+    """
+    join_items/join_fragments 결과 묶음을 하나의 JSON 배열(head ... tail) 또는 NDJSON 스트림으로 내보냄
+    """
+    if fmt == NDJSON:
+        async for segment in segments:
+            if segment:
+                yield segment
+        return
+
+    yield head
+    first = True
+    async for segment in segments:
+        if not segment:
+            continue
+        if not first:
+            yield b","
+        yield segment
+        first = False
+    yield tail
+
+
+async def prefetch(chunks):
+    """
+    첫 조각을 미리 받아 둔 async iterator
+    (DB 연결/쿼리 오류를 응답 상태 코드가 나가기 전에 드러내기 위함)
+    """
+    iterator = chunks.__aiter__()
+    try:
+        first = await iterator.__anext__()
+    except StopAsyncIteration:
+        first = None
+
+    async def chained():
+        if first is None:
+            return
+        yield first
+        async for chunk in iterator:
+            yield chunk
+
+    return chained()
+
+
+async def compress(chunks, encoding: str):
+    """
+    스트림을 조각 단위로 압축 (압축기 내부 버퍼가 찰 때마다 내보냄)
+    """
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=settings.STREAM_BROTLI_QUALITY)
+        async for chunk in chunks:
+            out = compressor.process(chunk)
+            if out:
+                yield out
+        yield compressor.finish()
+        return
+
+    compressor = zlib.compressobj(settings.STREAM_GZIP_LEVEL, zlib.DEFLATED, 31)  # wbits 31: gzip 헤더
+    async for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+def streaming_response(request: Request, chunks, fmt: str, headers: dict | None = None) -> StreamingResponse:
+    """
+    Accept-Encoding에 맞춰 압축한 스트리밍 응답
+    """
+    headers = {"Vary": "Accept-Encoding", **(headers or {})}
+    encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+        chunks = compress(chunks, encoding)
+    return StreamingResponse(chunks, media_type=MEDIA_TYPES[fmt], headers=headers)
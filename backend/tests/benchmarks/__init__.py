@@ -0,0 +1,3 @@
+# tests/benchmarks
+# 마이크로 벤치마크 (pytest 수집 대상 아님, DB/네트워크 없이 실행)
+# 실행: backend 디렉터리에서 python -m tests.benchmarks [--filter geo] [--full] [--update-baseline]
@@ -0,0 +1,6 @@
+# tests/benchmarks/__main__.py
+import sys
+
+from tests.benchmarks.runner import main
+
+sys.exit(main())
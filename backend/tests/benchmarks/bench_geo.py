@@ -0,0 +1,68 @@
+# tests/benchmarks/bench_geo.py
+import numpy as np
+
+from app.utils.geo import (
+    calculate_distance, distances_from_point,
+    convert_epsg5174_to_wgs84, convert_epsg5174_to_wgs84_array,
+    convert_naver_mapcoord_to_wgs84, convert_naver_mapcoords_to_wgs84_array,
+)
+from tests.benchmarks.harness import benchmark
+
+# --- 좌표 유틸 (단건 / 배열) ---
+BATCH_SIZES = (1_000, 100_000)
+
+# 서울 강남 일대
+ORIGIN = (37.498095, 127.027610)
+
+
+def _points(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    lats = ORIGIN[0] + rng.uniform(-0.05, 0.05, n)
+    lons = ORIGIN[1] + rng.uniform(-0.05, 0.05, n)
+    return lats, lons
+
+
+def _epsg5174_points(n: int, seed: int = 0):
+    # address.csv 좌표 범위 (중부원점 EPSG:5174, 미터)
+    rng = np.random.default_rng(seed)
+    return rng.uniform(180_000, 220_000, n), rng.uniform(420_000, 460_000, n)
+
+
+def _naver_points(n: int, seed: int = 0):
+    # 네이버 검색 API mapx/mapy (WGS84 x 1e7 정수 문자열)
+    lats, lons = _points(n, seed)
+    return [str(int(v * 1e7)) for v in lons], [str(int(v * 1e7)) for v in lats]
+
+
+@benchmark("geo.calculate_distance")
+def bench_calculate_distance():
+    lat, lon = ORIGIN
+    return lambda: calculate_distance(lat, lon, 37.5, 127.03)
+
+
+@benchmark("geo.distances_from_point", params=BATCH_SIZES)
+def bench_distances_from_point(n):
+    lats, lons = _points(n)
+    return lambda: distances_from_point(ORIGIN[0], ORIGIN[1], lats, lons)
+
+
+@benchmark("geo.convert_epsg5174_to_wgs84")
+def bench_convert_epsg5174():
+    return lambda: convert_epsg5174_to_wgs84(205071.1185, 415862.7636)
+
+
+@benchmark("geo.convert_epsg5174_to_wgs84_array", params=BATCH_SIZES)
+def bench_convert_epsg5174_array(n):
+    xs, ys = _epsg5174_points(n)
+    return lambda: convert_epsg5174_to_wgs84_array(xs, ys)
+
+
+@benchmark("geo.convert_naver_mapcoord_to_wgs84")
+def bench_convert_naver():
+    return lambda: convert_naver_mapcoord_to_wgs84("1270284390", "374977110")
+
+
+@benchmark("geo.convert_naver_mapcoords_to_wgs84_array", params=BATCH_SIZES)
+def bench_convert_naver_array(n):
+    mapx, mapy = _naver_points(n)
+    return lambda: convert_naver_mapcoords_to_wgs84_array(mapx, mapy)
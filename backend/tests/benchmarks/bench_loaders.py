@@ -0,0 +1,61 @@
+# tests/benchmarks/bench_loaders.py
+import atexit
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from app.services.db_service import prepare_address_frame, _address_records, file_fingerprint
+from tests.benchmarks.harness import benchmark
+
+# --- address.csv 적재 (initialize_address_table에서 DB 쓰기를 뺀 단계) ---
+# 지문 계산 -> CSV 로드 + 좌표 일괄 변환 + 중복 제거 -> COPY용 튜플 생성
+ROW_COUNTS = (10_000, 100_000)
+FULL_ROW_COUNTS = (1_000_000,)
+
+_tmpdir = None
+
+
+def synthetic_address_csv(rows: int, seed: int = 0) -> str:
+    """
+    address.csv 형식의 합성 파일 (중복 행 약 5%, 좌표 결측 약 1%), 크기별로 한 번만 생성
+    """
+    global _tmpdir
+    if _tmpdir is None:
+        _tmpdir = tempfile.mkdtemp(prefix="bench_address_")
+        atexit.register(shutil.rmtree, _tmpdir, ignore_errors=True)
+    path = os.path.join(_tmpdir, f"address_{rows}.csv")
+    if os.path.exists(path):
+        return path
+
+    rng = np.random.default_rng(seed)
+    ids = rng.integers(0, int(rows * 0.95), rows)
+    xs = rng.uniform(180_000, 220_000, rows).round(4)
+    ys = rng.uniform(420_000, 460_000, rows).round(4)
+    missing = rng.random(rows) < 0.01
+    df = pd.DataFrame({
+        "landlot_address": [f"수원시 영통구 영통동 {i}" for i in ids],
+        "road_name_address": [f"영통로{i % 500}번길 {i % 97}" for i in ids],
+        "x": np.where(missing, np.nan, xs),
+        "y": np.where(missing, np.nan, ys),
+    })
+    df.to_csv(path, index=False, encoding="utf-8-sig")
+    return path
+
+
+@benchmark("loaders.address_ingest", params=ROW_COUNTS, full_params=FULL_ROW_COUNTS, threshold=1.5)
+def bench_address_ingest(rows):
+    path = synthetic_address_csv(rows)
+
+    def run():
+        file_fingerprint(path)
+        _address_records(prepare_address_frame(path))
+    return run
+
+
+@benchmark("loaders.prepare_address_frame", params=ROW_COUNTS, full_params=FULL_ROW_COUNTS, threshold=1.5)
+def bench_prepare_address_frame(rows):
+    path = synthetic_address_csv(rows)
+    return lambda: prepare_address_frame(path)
@@ -0,0 +1,47 @@
+# tests/benchmarks/bench_shaping.py
+import numpy as np
+
+from app.core.config import settings
+from app.services.building_service import filter_places, group_buildings
+from tests.benchmarks.harness import benchmark
+from tests.benchmarks.bench_geo import ORIGIN
+
+# --- 상가 검색 결과 가공 (fetch_nearby_buildings의 거리 필터 + 건물 그룹화 단계) ---
+# 카테고리 수 x 카테고리별 검색 결과 수 (네이버 지역 검색은 한 번에 최대 5건)
+RESULTS_PER_CATEGORY = (5, 100, 1_000)
+
+
+def synthetic_search_items(per_category: int, seed: int = 0) -> list[dict]:
+    """
+    네이버 지역 검색 응답 형식의 합성 결과 (약 절반이 검색 반경 안, 건물 주소는 20곳에 몰림)
+    """
+    rng = np.random.default_rng(seed)
+    n = per_category * len(settings.TARGET_CATEGORIES)
+    # 반경 50m ~= 위도 0.00045도
+    lats = ORIGIN[0] + rng.uniform(-0.0006, 0.0006, n)
+    lons = ORIGIN[1] + rng.uniform(-0.0006, 0.0006, n)
+    buildings = rng.integers(0, 20, n)
+    categories = [c for c in settings.TARGET_CATEGORIES for _ in range(per_category)]
+    return [
+        {
+            "title": f"<b>상호</b>{i}",
+            "category": category,
+            "address": f"서울특별시 강남구 역삼동 {building}",
+            "roadAddress": f"서울특별시 강남구 강남대로 {building}" if i % 3 else "",
+            "mapx": str(int(lon * 1e7)),
+            "mapy": str(int(lat * 1e7)),
+        }
+        for i, (category, lat, lon, building) in enumerate(zip(categories, lats, lons, buildings))
+    ]
+
+
+@benchmark("shaping.filter_places", params=RESULTS_PER_CATEGORY)
+def bench_filter_places(per_category):
+    items = synthetic_search_items(per_category)
+    return lambda: filter_places(ORIGIN[0], ORIGIN[1], items)
+
+
+@benchmark("shaping.filter_and_group", params=RESULTS_PER_CATEGORY)
+def bench_filter_and_group(per_category):
+    items = synthetic_search_items(per_category)
+    return lambda: group_buildings(filter_places(ORIGIN[0], ORIGIN[1], items))
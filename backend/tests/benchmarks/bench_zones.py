@@ -0,0 +1,51 @@
+# tests/benchmarks/bench_zones.py
+import numpy as np
+import shapely
+
+from app.services.zone_index import build_index
+from tests.benchmarks.harness import benchmark
+from tests.benchmarks.bench_geo import ORIGIN
+
+# --- 제한 구역 포함 판정 (메모리 STRtree 인덱스) ---
+ZONE_COUNTS = (1_000, 10_000)
+POINT_COUNTS = (1_000, 100_000)
+QUERY_ZONES = 10_000
+
+_indexes = {}
+
+
+def synthetic_zone_rows(n: int, seed: int = 0) -> list:
+    """
+    (id, 지번주소, WKB) 형식의 합성 제한 구역 (반경 약 50m 원형 다각형, 0.2° 범위에 흩뿌림)
+    """
+    rng = np.random.default_rng(seed)
+    centers = shapely.points(ORIGIN[1] + rng.uniform(-0.1, 0.1, n), ORIGIN[0] + rng.uniform(-0.1, 0.1, n))
+    polygons = shapely.buffer(centers, 0.0005, quad_segs=8)
+    return [(i + 1, f"구역{i + 1}", shapely.to_wkb(polygon)) for i, polygon in enumerate(polygons)]
+
+
+def synthetic_index(n: int):
+    if n not in _indexes:
+        _indexes[n] = build_index(synthetic_zone_rows(n))
+    return _indexes[n]
+
+
+@benchmark("zones.build_index", params=ZONE_COUNTS)
+def bench_build_index(n):
+    rows = synthetic_zone_rows(n)
+    return lambda: build_index(rows)
+
+
+@benchmark("zones.contains", params=ZONE_COUNTS)
+def bench_contains(n):
+    index = synthetic_index(n)
+    return lambda: index.contains(ORIGIN[1], ORIGIN[0])
+
+
+@benchmark("zones.query_points", params=POINT_COUNTS)
+def bench_query_points(n):
+    index = synthetic_index(QUERY_ZONES)
+    rng = np.random.default_rng(1)
+    xs = ORIGIN[1] + rng.uniform(-0.1, 0.1, n)
+    ys = ORIGIN[0] + rng.uniform(-0.1, 0.1, n)
+    return lambda: index.query_points(xs, ys)
@@ -0,0 +1,70 @@
+# tests/benchmarks/harness.py
+import statistics
+import time
+
+# --- 벤치마크 등록/측정 ---
+# @benchmark로 등록한 함수는 준비 작업(합성 데이터 생성 등)을 마친 뒤 측정할 인자 없는 함수를 반환합니다.
+# 준비 시간은 측정에서 빠지고, 반환된 함수만 반복 실행해 1회당 시간을 잽니다.
+
+
+class Benchmark:
+    def __init__(self, name: str, setup, params=(None,), full_params=(), threshold: float | None = None):
+        self.name = name
+        self.setup = setup
+        self.params = tuple(params)
+        self.full_params = tuple(full_params)  # --full일 때만 실행하는 큰 입력 (예: 100만 행 CSV)
+        self.threshold = threshold             # 기준값 대비 허용 배율 (None이면 실행기 기본값)
+
+    def cases(self, full: bool = False):
+        """
+        (케이스 이름, 입력 크기) 목록 (예: "geo.distances_from_point[100000]")
+        """
+        for param in self.params + (self.full_params if full else ()):
+            yield (f"{self.name}[{param}]" if param is not None else self.name), param
+
+    def run(self, param, repeat: int = 5, min_time: float = 0.2) -> dict:
+        fn = self.setup(param) if param is not None else self.setup()
+        median, best, loops = measure(fn, repeat=repeat, min_time=min_time)
+        return {"median": median, "best": best, "loops": loops}
+
+
+_registry: list[Benchmark] = []
+
+
+def benchmark(name: str, params=(None,), full_params=(), threshold: float | None = None):
+    """
+    벤치마크 등록 데코레이터
+    - params: 케이스마다 setup(param)에 넘길 입력 크기 (None이면 인자 없이 호출)
+    """
+    def decorator(setup):
+        _registry.append(Benchmark(name, setup, params, full_params, threshold))
+        return setup
+    return decorator
+
+
+def registered() -> list[Benchmark]:
+    return list(_registry)
+
+
+def measure(fn, repeat: int = 5, min_time: float = 0.2) -> tuple[float, float, int]:
+    """
+    한 번 측정이 min_time 이상 걸리도록 반복 횟수를 정한 뒤(timeit.autorange 방식) repeat번 측정
+    - return: (1회당 중앙값, 1회당 최솟값, 반복 횟수)
+    """
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or loops >= 1_000_000:
+            break
+        loops *= 10 if elapsed < min_time / 10 else 2
+
+    samples = [elapsed / loops]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append((time.perf_counter() - start) / loops)
+    return statistics.median(samples), min(samples), loops
@@ -0,0 +1,150 @@
+# tests/benchmarks/runner.py
+import argparse
+import datetime
+import importlib
+import json
+import os
+import pkgutil
+import platform
+import sys
+
+import numpy as np
+
+from tests.benchmarks import harness
+
+# --- 벤치마크 실행기 ---
+# 결과(1회당 최솟값: 다른 프로세스 간섭이 가장 적은 측정)를 baseline.json과 비교해 허용 배율(--threshold, 벤치마크별 threshold)을 넘으면 실패(종료 코드 1)
+# 기준값은 실행한 기기에 따라 다르므로, 같은 기기에서 --update-baseline으로 먼저 저장한 뒤 비교합니다.
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+DEFAULT_THRESHOLD = 1.3
+
+
+def load_benchmarks() -> list[harness.Benchmark]:
+    """
+    tests/benchmarks/bench_*.py 모듈을 불러와 등록된 벤치마크 목록 반환
+    """
+    for module in pkgutil.iter_modules([BENCH_DIR]):
+        if module.name.startswith("bench_"):
+            importlib.import_module(f"tests.benchmarks.{module.name}")
+    return harness.registered()
+
+
+def select_cases(benchmarks, filters=None, full: bool = False):
+    for bench in benchmarks:
+        for name, param in bench.cases(full):
+            if not filters or any(f in name for f in filters):
+                yield bench, name, param
+
+
+def compare(name: str, result: dict, baseline: dict, threshold: float) -> tuple[str, float | None]:
+    """
+    기준값 대비 상태 ("new" / "ok" / "faster" / "REGRESSION")와 배율
+    """
+    base = baseline.get(name)
+    if not base:
+        return "new", None
+    ratio = result["best"] / base["best"]
+    if ratio > threshold:
+        return "REGRESSION", ratio
+    if ratio < 1 / threshold:
+        return "faster", ratio
+    return "ok", ratio
+
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g}{unit}"
+    return f"{seconds / 1e-9:.3g}ns"
+
+
+def _environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "updated_at": datetime.datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def load_baseline(path: str) -> dict:
+    if not os.path.exists(path):
+        return {"environment": {}, "results": {}}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(path: str, baseline: dict, results: dict):
+    baseline["environment"] = _environment()
+    baseline["results"].update({
+        name: {"median": r["median"], "best": r["best"]} for name, r in results.items()
+    })
+    baseline["results"] = dict(sorted(baseline["results"].items()))
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def smoke(filters=None) -> list[str]:
+    """
+    벤치마크마다 가장 작은 입력으로 한 번씩만 실행 (벤치마크 코드가 깨지지 않았는지 확인용, 측정/비교 없음)
+    """
+    names, seen = [], set()
+    for bench, name, param in select_cases(load_benchmarks(), filters):
+        if bench.name in seen:
+            continue
+        seen.add(bench.name)
+        fn = bench.setup(param) if param is not None else bench.setup()
+        fn()
+        names.append(name)
+    return names
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m tests.benchmarks", description="마이크로 벤치마크 실행")
+    parser.add_argument("--filter", action="append", help="이름에 이 문자열이 포함된 케이스만 실행 (여러 번 지정 가능)")
+    parser.add_argument("--full", action="store_true", help="큰 입력(100만 행 CSV 등)까지 실행")
+    parser.add_argument("--repeat", type=int, default=7, help="케이스별 측정 횟수")
+    parser.add_argument("--min-time", type=float, default=0.2, help="측정 1회의 최소 시간(초)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="기준값 대비 허용 배율")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="기준값 JSON 경로")
+    parser.add_argument("--update-baseline", action="store_true", help="이번 결과로 기준값 갱신")
+    parser.add_argument("--output", help="이번 결과를 JSON으로 저장할 경로")
+    parser.add_argument("--smoke", action="store_true", help="측정 없이 벤치마크마다 가장 작은 입력으로 한 번씩만 실행")
+    args = parser.parse_args(argv)
+
+    if args.smoke:
+        names = smoke(args.filter)
+        print(f"smoke: {len(names)}개 케이스 실행 완료")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    results, regressions = {}, []
+    print(f"{'benchmark':<52} {'median':>10} {'best':>10} {'loops':>8} {'vs base':>9}  status")
+    for bench, name, param in select_cases(load_benchmarks(), args.filter, args.full):
+        result = bench.run(param, repeat=args.repeat, min_time=args.min_time)
+        results[name] = result
+        status, ratio = compare(name, result, baseline["results"], bench.threshold or args.threshold)
+        if status == "REGRESSION":
+            regressions.append(name)
+        print(f"{name:<52} {_format_time(result['median']):>10} {_format_time(result['best']):>10} "
+              f"{result['loops']:>8} {(f'{ratio:.2f}x' if ratio else '-'):>9}  {status}", flush=True)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"environment": _environment(), "results": results}, f, indent=2)
+    if args.update_baseline:
+        save_baseline(args.baseline, baseline, results)
+        print(f"기준값 갱신: {args.baseline} ({len(results)}개 케이스)")
+        return 0
+    if regressions:
+        print(f"성능 저하 {len(regressions)}건: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,11 @@
 # tests/test_api.py
+import json
+
 from fastapi.testclient import TestClient
+from shapely.geometry import box, MultiPolygon
+
+from app.core.config import settings
+from app.services import zone_index, dataset_version
 
 def test_read_root(client: TestClient):
     """루트 엔드포인트 테스트"""
@@ -25,4 +31,163 @@ def test_get_nearby_buildings_gangnam(client: TestClient):
     # Mock 데이터가 잘 반영되었는지 확인
     if data["count"] > 0:
         first_building = data["buildings"][0]
-        assert "스타벅스" in first_building["stores"][0]["name"]
\ No newline at end of file
+        assert "스타벅스" in first_building["stores"][0]["name"]
+
+def test_get_polygon_streams_json_and_ndjson(client: TestClient, monkeypatch):
+    """getPolygon이 gzip 압축 JSON과 NDJSON 스트림으로 같은 다각형을 반환"""
+
+    zones = [(i, "주소", box(127.0 + i * 0.01, 37.5, 127.005 + i * 0.01, 37.505).wkb) for i in range(3)]
+    monkeypatch.setattr(zone_index, "_index", zone_index.build_index(zones))
+
+    response = client.get("/getcoordinates/getPolygon", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    data = response.json()
+    assert [zone["id"] for zone in data["zones"]] == [0, 1, 2]
+    assert len(data["zones"][0]["parts"][0]) == 5
+
+    response = client.get("/getcoordinates/getPolygon",
+                          params={"format": "ndjson", "bbox": "127.009,37.5,127.016,37.51"},
+                          headers={"Accept-Encoding": "identity"})
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["id"] for line in lines] == [1]
+    assert lines[0] == data["zones"][1]
+
+def test_get_polygon_etag_and_cached_bytes(client: TestClient, monkeypatch):
+    """같은 데이터 버전이면 304/캐시된 바이트, 버전이 바뀌면 새 ETag"""
+
+    zones = [(1, "주소", box(127.0, 37.5, 127.005, 37.505).wkb)]
+    monkeypatch.setattr(zone_index, "_index", zone_index.build_index(zones))
+    monkeypatch.setitem(dataset_version._versions, dataset_version.ZONES, 7)
+
+    first = client.get("/getcoordinates/getPolygon", params={"zoom": 15})
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"zones-7-')
+
+    # 캐시된 응답은 인덱스를 다시 읽지 않음
+    calls = []
+    original = zone_index.ZoneIndex.polygons
+    monkeypatch.setattr(zone_index.ZoneIndex, "polygons", lambda *args: calls.append(1) or original(*args))
+    again = client.get("/getcoordinates/getPolygon", params={"zoom": 15})
+    assert again.content == first.content and again.headers["etag"] == etag
+    assert calls == []
+
+    not_modified = client.get("/getcoordinates/getPolygon", params={"zoom": 15}, headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304 and not_modified.content == b""
+
+    # 데이터 버전이 바뀌면 예전 ETag로는 304가 아니고 새로 계산
+    monkeypatch.setitem(dataset_version._versions, dataset_version.ZONES, 8)
+    changed = client.get("/getcoordinates/getPolygon", params={"zoom": 15}, headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["etag"] != etag
+    assert calls == [1]
+
+def test_metrics_records_route_template(client: TestClient):
+    """/metrics가 경로 변수 대신 라우트 템플릿 단위로 요청 시간을 기록"""
+    client.get("/")
+    status_code = client.get("/raster/tiles/0/0/0.png").status_code
+    body = client.get("/metrics").text
+    assert 'http_request_duration_seconds_count{method="GET",route="/",status="200"}' in body
+    assert f'route="/raster/tiles/{{z}}/{{x}}/{{y}}.png",status="{status_code}"' in body
+    assert "/raster/tiles/0/0/0.png" not in body
+    assert "cache_hit_ratio" in body
+
+def test_zone_job_rejects_path_traversal_job_id(client: TestClient):
+    """job_id에 경로가 들어간 요청은 400 (ZONE_JOB_DIR 밖에 파일을 만들지 않음)"""
+    response = client.post("/restricted-zone/jobs", params={"job_id": "x/../../../tmp/evil"})
+    assert response.status_code == 400
+    response = client.get("/restricted-zone/jobs/..%2F..%2Fetc/download")
+    assert response.status_code in (400, 404)
+
+def test_batch_check_rejects_oversized_body_before_parsing(client: TestClient, monkeypatch):
+    """최대 좌표 수에서 정한 바이트 상한을 넘는 일괄 요청은 본문을 파싱하기 전에 413"""
+    monkeypatch.setattr(settings, "BATCH_CHECK_MAX_POINTS", 2)
+    monkeypatch.setattr(settings, "BATCH_BYTES_PER_POINT", 16)
+    parsed = []
+    monkeypatch.setattr("app.api.coordinates.parse_points", lambda *args: parsed.append(args))
+    monkeypatch.setattr("app.api.retailers.parse_points", lambda *args: parsed.append(args))
+
+    # Content-Length로 바로 거절
+    response = client.post("/checkImpossible/batch", content=b"[" + b" " * 64 + b"]")
+    assert response.status_code == 413
+    # Content-Length 없이 나눠 보내는 본문(chunked)도 상한에서 끊음
+    response = client.post("/checkImpossible/batch", content=iter([b"[[127.0, 37.5],", b" " * 64, b"]"]))
+    assert response.status_code == 413
+    # 최근접 소매점 일괄 조회도 같은 상한 (RETAILER_BATCH_MAX_POINTS 기준)
+    monkeypatch.setattr(settings, "RETAILER_BATCH_MAX_POINTS", 2)
+    response = client.post("/retailers/nearest/batch", content=iter([b"[[127.0, 37.5],", b" " * 64, b"]"]))
+    assert response.status_code == 413
+    assert parsed == []
+
+def test_batch_check_streams_results(client: TestClient, monkeypatch):
+    """일괄 판정 결과를 묶음 단위로 스트리밍 (JSON / NDJSON 모두 점 순서 유지)"""
+    index = zone_index.build_index([
+        (1, "구역1", box(127.0, 37.0, 127.01, 37.01).wkb),
+        (2, "구역2", box(127.005, 37.005, 127.02, 37.02).wkb),
+    ])
+    monkeypatch.setattr(zone_index, "_index", index)
+    monkeypatch.setattr(settings, "STREAM_FETCH_ROWS", 2)
+    points = [[127.001, 37.001], [127.007, 37.007], [127.015, 37.015], [127.03, 37.03]]
+
+    response = client.post("/checkImpossible/batch", json=points)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["count"] == 4
+    assert data["inside_count"] == 3
+    assert [r["zone_ids"] for r in data["results"]] == [[1], [1, 2], [2], []]
+    assert [r["is_inside"] for r in data["results"]] == [True, True, True, False]
+
+    response = client.post("/checkImpossible/batch", json=points, params={"format": "ndjson"})
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [[r["x"], r["y"]] for r in lines] == points
+    assert [r["zone_ids"] for r in lines] == [[1], [1, 2], [2], []]
+
+def test_get_polygon_db_fallback_skips_null_vertices(client: TestClient, monkeypatch):
+    """인덱스 없이 DB에서 읽을 때 vertices가 NULL인 구역은 건너뛰고 응답을 끝까지 보냄"""
+    async def no_index():
+        pass
+
+    async def fake_partitions(query, params=None):
+        yield [(1, "[[127.0, 37.5]]"), (2, None)]
+        yield [(3, "[[127.1, 37.6]]")]
+
+    monkeypatch.setattr(zone_index, "_index", None)
+    monkeypatch.setattr(zone_index, "reload", no_index)
+    monkeypatch.setattr("app.api.coordinates.stream_partitions", fake_partitions)
+
+    response = client.get("/getcoordinates/getPolygon", params={"format": "ndjson"})
+    assert response.status_code == 200
+    assert [json.loads(line)["id"] for line in response.text.splitlines()] == [1, 3]
+    response = client.get("/getcoordinates/getPolygon", params={"format": "json"})
+    assert response.json()["zones"] == [{"id": 1, "parts": [[[127.0, 37.5]]]}, {"id": 3, "parts": [[[127.1, 37.6]]]}]
+
+def test_get_polygon_same_shape_on_index_and_db_paths(client: TestClient, monkeypatch):
+    """MultiPolygon 구역도 id 하나에 조각(parts)을 묶어 반환하고, 인덱스/DB 경로의 응답 형식이 같음"""
+    square = box(127.0, 37.5, 127.001, 37.501)
+    multi = MultiPolygon([square, box(127.002, 37.5, 127.003, 37.501)])
+    monkeypatch.setattr(zone_index, "_index", zone_index.build_index([(1, "구역1", square.wkb), (2, "구역2", multi.wkb)]))
+    # 다른 테스트가 캐시해 둔 응답을 받지 않도록 이 테스트만의 데이터 버전 사용
+    monkeypatch.setitem(dataset_version._versions, dataset_version.ZONES, 21)
+
+    from_index = client.get("/getcoordinates/getPolygon", params={"format": "json"}).json()
+    assert from_index == {
+        "tolerance_meter": 0.0,
+        "zones": [
+            {"id": 1, "parts": [[list(c) for c in square.exterior.coords]]},
+            {"id": 2, "parts": [[list(c) for c in part.exterior.coords] for part in multi.geoms]},
+        ],
+    }
+
+    async def no_index():
+        pass
+
+    async def fake_partitions(query, params=None):
+        yield [(1, json.dumps([list(c) for c in square.exterior.coords]))]
+
+    monkeypatch.setattr(zone_index, "_index", None)
+    monkeypatch.setattr(zone_index, "reload", no_index)
+    monkeypatch.setattr("app.api.coordinates.stream_partitions", fake_partitions)
+    from_db = client.get("/getcoordinates/getPolygon", params={"format": "json"}).json()
+    assert from_db.keys() == from_index.keys()
+    assert from_db["zones"] == from_index["zones"][:1]
@@ -0,0 +1,116 @@
+# tests/test_isochrone.py
+import asyncio
+from shapely.geometry import Point, Polygon
+
+from app.core.config import settings
+from app.services import isochrone_engine
+from app.services.isochrone_engine import load_graph
+
+# 약 50m 간격 격자형 도로망 (5x5 교차로) + 보행 불가 고속도로 1개
+LAT0, LON0 = 37.2700, 127.0000
+STEP_LAT, STEP_LON = 0.00045, 0.00056
+
+
+def _write_grid_osm(path):
+    nodes, ways = [], []
+    node_id = lambda i, j: 1 + i * 5 + j
+    for i in range(5):
+        for j in range(5):
+            nodes.append(f'<node id="{node_id(i, j)}" lat="{LAT0 + i * STEP_LAT}" lon="{LON0 + j * STEP_LON}"/>')
+    way_id = 1000
+    for i in range(5):
+        refs = "".join(f'<nd ref="{node_id(i, j)}"/>' for j in range(5))
+        ways.append(f'<way id="{way_id}">{refs}<tag k="highway" v="residential"/></way>')
+        way_id += 1
+    for j in range(5):
+        refs = "".join(f'<nd ref="{node_id(i, j)}"/>' for i in range(5))
+        ways.append(f'<way id="{way_id}">{refs}<tag k="highway" v="footway"/></way>')
+        way_id += 1
+    # 격자에서 멀리 떨어진 고속도로 (그래프에 포함되면 안 됨)
+    nodes.append(f'<node id="900" lat="{LAT0 + 0.01}" lon="{LON0 + 0.01}"/>')
+    nodes.append(f'<node id="901" lat="{LAT0 + 0.011}" lon="{LON0 + 0.01}"/>')
+    ways.append('<way id="2000"><nd ref="900"/><nd ref="901"/><tag k="highway" v="motorway"/></way>')
+
+    path.write_text('<?xml version="1.0" encoding="UTF-8"?><osm version="0.6">'
+                    + "".join(nodes) + "".join(ways) + "</osm>", encoding="utf-8")
+
+
+def test_load_graph_excludes_non_walkable(tmp_path):
+    """보행 불가 도로(motorway)는 그래프에서 제외"""
+    osm_path = tmp_path / "grid.osm"
+    _write_grid_osm(osm_path)
+
+    graph = load_graph(str(osm_path))
+    assert graph.node_count == 25
+    # 가로 5개 x 4구간 + 세로 5개 x 4구간 = 40개 간선 (양방향 80)
+    assert len(graph.indices) == 80
+
+
+def test_local_isochrone_polygon(tmp_path, monkeypatch):
+    """오프라인 엔진이 ORS와 같은 형태(경도/위도 Polygon)의 도보 거리 영역을 반환"""
+    osm_path = tmp_path / "grid.osm"
+    _write_grid_osm(osm_path)
+    monkeypatch.setattr(settings, "OSM_EXTRACT_PATH", str(osm_path))
+    monkeypatch.setattr(isochrone_engine, "_graph", None)
+
+    center_lat, center_lon = LAT0 + 2 * STEP_LAT, LON0 + 2 * STEP_LON
+    polygon = asyncio.run(isochrone_engine.get_isochrone_polygon(center_lat, center_lon))
+
+    assert isinstance(polygon, Polygon)
+    assert polygon.contains(Point(center_lon, center_lat))
+    # 100m 도보 거리 → 격자 모서리(대각선 약 140m, 도보 200m)는 포함되지 않음
+    assert not polygon.contains(Point(LON0, LAT0))
+    # 한 방향 끝(도보 100m) 근처는 포함
+    assert polygon.contains(Point(center_lon + 1.9 * STEP_LON, center_lat))
+
+    # 도로망에서 멀리 떨어진 출발점은 계산 실패
+    assert asyncio.run(isochrone_engine.get_isochrone_polygon(LAT0 + 0.05, LON0 + 0.05)) is None
+
+
+def test_walking_distances_on_grid(tmp_path):
+    """격자 도로망에서 도보 거리는 직선 거리가 아니라 도로를 따라간 거리"""
+    osm_path = tmp_path / "grid.osm"
+    _write_grid_osm(osm_path)
+    graph = load_graph(str(osm_path))
+
+    targets = [(LAT0 + STEP_LAT, LON0 + STEP_LON), (LAT0, LON0 + 4 * STEP_LON)]
+    near, far = graph.walking_distances(LAT0, LON0, targets, cutoff=150.0, snap_meter=20.0)
+    # 대각선 한 칸: 직선 약 70m, 도보 약 100m
+    assert 95 < near < 105
+    # 도보 약 200m -> cutoff 밖
+    assert far == float("inf")
+    # 도로망에서 먼 출발점은 계산 불가
+    assert graph.walking_distances(LAT0 + 0.05, LON0, targets, cutoff=150.0, snap_meter=20.0) is None
+
+
+
+def test_load_graph_uses_cache_without_source(tmp_path):
+    """원본 OSM 파일 없이 '<path>.graph.npz' 캐시만 있어도 그래프를 읽음"""
+    osm_path = tmp_path / "grid.osm"
+    _write_grid_osm(osm_path)
+    load_graph(str(osm_path))
+    osm_path.unlink()
+
+    graph = load_graph(str(osm_path))
+    assert graph.node_count == 25
+
+
+def test_compute_isochrones_reports_errors_per_origin(tmp_path, monkeypatch):
+    """한 출발점의 오류는 그 출발점 결과로만 보고하고, 나머지 출발점은 정상 계산"""
+    osm_path = tmp_path / "grid.osm"
+    _write_grid_osm(osm_path)
+    monkeypatch.setattr(settings, "OSM_EXTRACT_PATH", str(osm_path))
+    monkeypatch.setattr(isochrone_engine, "_graph", None)
+
+    center = (LAT0 + 2 * STEP_LAT, LON0 + 2 * STEP_LON)
+    results = isochrone_engine._compute_isochrones([center, (float("nan"), "bad"), (LAT0 + 0.05, LON0 + 0.05)])
+    assert isinstance(results[0][0], Polygon) and results[0][1] is None
+    assert results[1][0] is None and results[1][1]
+    assert results[2][0] is None and results[2][1]
+
+    # 그래프를 로드할 수 없으면 묶음의 모든 출발점을 오류로 보고 (예외로 풀을 깨뜨리지 않음)
+    monkeypatch.setattr(settings, "OSM_EXTRACT_PATH", str(tmp_path / "missing.osm"))
+    monkeypatch.setattr(isochrone_engine, "_graph", None)
+    results = isochrone_engine._compute_isochrones([center, center])
+    assert [polygon for polygon, _ in results] == [None, None]
+    assert all("보행 그래프 로드 실패" in error for _, error in results)
@@ -0,0 +1,82 @@
+# tests/test_raster.py
+import asyncio
+import struct
+import zlib
+import numpy as np
+from shapely.geometry import box
+
+from app.core.config import settings
+from app.services import coverage_service, raster_service, retailer_index
+from app.utils.png import encode_png_rgba
+
+# 약 1km x 1km 범위의 소매점 2곳 + 제한 구역 1곳
+RETAILERS = [("가", None, 127.000, 37.500), ("나", None, 127.008, 37.506)]
+ZONE = box(127.002, 37.502, 127.004, 37.504)
+NEW_ZONE = box(127.006, 37.500, 127.007, 37.501)
+
+
+def _setup(monkeypatch, tmp_path, zones):
+    monkeypatch.setattr(settings, "RASTER_PATH", str(tmp_path / "raster.npz"))
+    monkeypatch.setattr(settings, "RASTER_CELL_METER", 20.0)
+    monkeypatch.setattr(settings, "RASTER_WORKERS", 2)
+    monkeypatch.setattr(settings, "RASTER_CHUNK_ROWS", 16)
+    monkeypatch.setattr(raster_service, "_raster", None)
+    monkeypatch.setattr(retailer_index, "_index", retailer_index.build_index(RETAILERS))
+    monkeypatch.setattr(coverage_service, "_coverage", coverage_service.compute_coverage(zones))
+
+
+def _wait(full):
+    async def run():
+        raster_service.start_build(full=full)
+        await raster_service._task
+    asyncio.run(run())
+
+
+def test_png_encoder_roundtrip():
+    """zlib 기반 PNG 인코더 출력의 헤더와 픽셀 데이터 확인"""
+    pixels = np.zeros((2, 3, 4), dtype=np.uint8)
+    pixels[1, 2] = (1, 2, 3, 4)
+    png = encode_png_rgba(pixels)
+
+    assert png.startswith(b"\x89PNG\r\n\x1a\n")
+    width, height = struct.unpack(">II", png[16:24])
+    assert (width, height) == (3, 2)
+    idat_len = struct.unpack(">I", png[33:37])[0]
+    raw = zlib.decompress(png[41:41 + idat_len])
+    assert raw[0] == 0 and len(raw) == 2 * (3 * 4 + 1)
+    assert raw[-4:] == bytes([1, 2, 3, 4])
+
+
+def test_raster_build_and_incremental_refresh(monkeypatch, tmp_path):
+    """전체 계산 결과 확인 후, 제한 구역이 바뀌면 변경 범위만 다시 계산해도 전체 계산과 같은 결과"""
+    _setup(monkeypatch, tmp_path, [ZONE])
+    _wait(True)
+    raster = raster_service.get_raster()
+    assert raster_service.progress["state"] == "completed"
+    assert raster_service.progress["mode"] == "full"
+
+    counts = raster.counts()
+    assert counts["restricted_zone"] > 0 and counts["too_close_to_retailer"] > 0 and counts["eligible"] > 0
+    assert "no_data" not in counts
+
+    # 제한 구역 추가 → 변경 범위만 계산
+    monkeypatch.setattr(coverage_service, "_coverage", coverage_service.compute_coverage([ZONE, NEW_ZONE]))
+    full_chunks = raster_service.progress["chunks"]
+    _wait(False)
+    assert raster_service.progress["mode"] == "incremental"
+    assert 0 < raster_service.progress["chunks"] < full_chunks
+    incremental = raster_service.get_raster().status.copy()
+
+    monkeypatch.setattr(raster_service, "_raster", None)
+    _wait(True)
+    assert np.array_equal(incremental, raster_service.get_raster().status)
+
+    # 저장된 파일을 다시 읽으면 같은 래스터, 데이터가 그대로면 갱신할 것 없음
+    assert raster_service.load()
+    assert np.array_equal(raster_service.get_raster().status, incremental)
+    _wait(False)
+    assert raster_service.progress["mode"] == "unchanged"
+
+    # 래스터 범위 안 타일은 PNG, 먼 곳은 빈 타일
+    assert raster_service.render_tile(16, 55888, 25393).startswith(b"\x89PNG")
+    assert raster_service.render_tile(16, 0, 0) == b""
@@ -1,6 +1,42 @@
 # tests/test_unit.py
+import asyncio
+import gzip
+import json
+import logging
 import math
-from app.utils.geo import calculate_distance, convert_naver_mapcoord_to_wgs84
+import threading
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+import shapely
+from prometheus_client import REGISTRY
+from shapely.geometry import MultiPoint, Point, box
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.log import JsonFormatter, SamplingFilter
+from app.services import (
+    building_service, coverage_service, db_service, eligibility_service, isochrone_engine,
+    retailer_index, site_finder, tile_service, zone_index, zone_job,
+)
+from app.services.change_service import merge_page
+from app.services.coverage_service import compute_coverage, add_geometry, replace_geometries, _apply_changes
+from app.services.db_service import prepare_address_frame
+from app.services.geocode_cache import normalize_address
+from app.services.zone_index import build_index, tolerance_for_zoom
+from app.utils import streaming
+from app.utils.cache import LRUCache, MISSING
+from app.utils.geo import (
+    calculate_distance, convert_naver_mapcoord_to_wgs84, convert_epsg5174_to_wgs84,
+    distances_from_point, haversine_distance_matrix,
+    convert_epsg5174_to_wgs84_array, convert_naver_mapcoords_to_wgs84_array
+)
+from app.utils.rate_limit import TokenBucket
+from tests.benchmarks import runner
+
 
 def test_calculate_distance():
     """거리 계산 함수 단위 테스트"""
@@ -11,12 +47,14 @@ def test_calculate_distance():
     distance = calculate_distance(lat1, lon1, lat2, lon2)
     assert 8000 < distance < 9000 # 대략적인 범위 확인
 
+
 def test_calculate_distance_same_point():
     """같은 지점 거리 계산 테스트 (Clamping 동작 확인)"""
     lat, lon = 37.5, 127.0
     distance = calculate_distance(lat, lon, lat, lon)
     assert distance == 0.0
 
+
 def test_convert_naver_mapcoord():
     """네이버 좌표 변환 함수 테스트"""
     mapx = "1270284390"
@@ -26,8 +64,702 @@ def test_convert_naver_mapcoord():
     assert lon == 127.0284390
     assert lat == 37.4977110
 
+
 def test_convert_naver_mapcoord_invalid():
     """잘못된 입력에 대한 좌표 변환 테스트"""
     lon, lat = convert_naver_mapcoord_to_wgs84(None, "invalid")
     assert lon is None
-    assert lat is None
\ No newline at end of file
+    assert lat is None
+
+
+def test_lru_cache_eviction_and_negative_value():
+    """LRU 캐시: 최대 크기 초과 시 오래된 항목 제거, None 값(음수 캐시) 저장 확인"""
+    cache = LRUCache(maxsize=2)
+    cache.set("a", (127.0, 37.5))
+    cache.set("b", None)
+    cache.get("a")           # a를 최근 사용으로 갱신
+    cache.set("c", (126.9, 37.4))
+
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == (127.0, 37.5)
+    assert cache.get("c") == (126.9, 37.4)
+
+    cache.set("d", None)
+    assert cache.get("d") is None
+
+
+def test_lru_cache_ttl_expired():
+    """LRU 캐시: TTL이 지난 항목은 미스로 처리"""
+    cache = LRUCache(maxsize=10)
+    cache.set("a", 1, ttl=-1)
+    assert cache.get("a") is MISSING
+    assert cache.stats()["misses"] == 1
+
+
+def test_normalize_address():
+    """지오코딩 캐시 키 정규화 테스트"""
+    assert normalize_address("  경기도  수원시\t팔달구 ") == "경기도 수원시 팔달구"
+
+
+def test_lru_cache_memory_budget():
+    """LRU 캐시: 메모리 예산 초과 시 LRU 순으로 제거"""
+    cache = LRUCache(maxsize=100, max_bytes=10, sizeof=len)
+    cache.set("a", "aaaa")
+    cache.set("b", "bbbb")
+    cache.set("c", "cccc")   # 12바이트 > 10바이트 -> a 제거
+
+    assert cache.get("a") is MISSING
+    assert cache.get("b") == "bbbb"
+    assert cache.stats()["bytes"] == 8
+
+
+def test_nearby_buildings_cache_reuses_upstream_results(mock_naver_api):
+    """같은 동네 재클릭 시 역지오코딩/검색 API를 다시 호출하지 않는지 확인"""
+    mock_geo, mock_search = mock_naver_api
+    building_service.clear_caches()
+
+    first = asyncio.run(building_service.fetch_nearby_buildings(37.498095, 127.027610))
+    second = asyncio.run(building_service.fetch_nearby_buildings(37.498100, 127.027620))
+
+    assert first == second
+    assert mock_geo.await_count == 1
+    assert mock_search.await_count == len(settings.TARGET_CATEGORIES)
+
+
+def test_zone_index_contains():
+    """제한 구역 메모리 인덱스의 좌표 포함 여부 판단"""
+    rows = [
+        (1, "구역1", box(127.0, 37.0, 127.01, 37.01).wkb),
+        (2, "구역2", box(127.005, 37.005, 127.02, 37.02).wkb),
+    ]
+    index = build_index(rows)
+
+    assert index.contains(127.001, 37.001)
+    assert not index.contains(127.03, 37.03)
+    assert index.zones_at(127.007, 37.007) == [1, 2]
+    assert index.zones_at(127.015, 37.015) == [2]
+
+
+def test_zone_index_query_points():
+    """여러 좌표 일괄 판정 결과가 단건 판정과 일치"""
+    rows = [
+        (1, "구역1", box(127.0, 37.0, 127.01, 37.01).wkb),
+        (2, "구역2", box(127.005, 37.005, 127.02, 37.02).wkb),
+    ]
+    index = build_index(rows)
+    xs = [127.001, 127.007, 127.015, 127.03]
+    ys = [37.001, 37.007, 37.015, 37.03]
+
+    inside, zone_ids = index.query_points(xs, ys)
+    assert inside.tolist() == [True, True, True, False]
+    assert zone_ids == [[1], [1, 2], [2], []]
+
+
+def test_batch_distance_matches_scalar():
+    """배열 거리 계산 결과가 스칼라 함수와 일치"""
+    lats = np.array([37.4979, 37.5665, 37.5])
+    lons = np.array([127.0276, 126.9780, 127.0])
+
+    distances = distances_from_point(37.5665, 126.9780, lats, lons)
+    matrix = haversine_distance_matrix(lats, lons, lats, lons)
+
+    for i in range(len(lats)):
+        assert math.isclose(distances[i], calculate_distance(37.5665, 126.9780, lats[i], lons[i]))
+    assert matrix.shape == (3, 3)
+    assert np.allclose(np.diag(matrix), 0.0)
+    assert np.allclose(matrix, matrix.T)
+
+
+def test_convert_epsg5174_array_invalid_values():
+    """EPSG:5174 배열 변환: 유효하지 않은 값은 NaN, 유효한 값은 스칼라 함수와 일치"""
+    xs = [205071.1185, -1.0, None, float("nan")]
+    ys = [415862.7636, 415862.7636, 1.0, 1.0]
+    lons, lats = convert_epsg5174_to_wgs84_array(xs, ys)
+
+    assert (lons[0], lats[0]) == convert_epsg5174_to_wgs84(xs[0], ys[0])
+    assert 126 < lons[0] < 128 and 37 < lats[0] < 38
+    assert np.isnan(lons[1:]).all() and np.isnan(lats[1:]).all()
+    assert convert_epsg5174_to_wgs84(-1.0, -1.0) == (None, None)
+
+    # 단건 변환은 파이썬 float으로 transform을 호출 (NumPy 경고를 오류로 바꿔도 정상 변환)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        lon, lat = convert_epsg5174_to_wgs84(np.float64(xs[0]), np.float64(ys[0]))
+    assert (lon, lat) == (lons[0], lats[0]) and type(lon) is float
+
+
+def test_convert_naver_mapcoords_array():
+    """네이버 좌표 배열 변환: 잘못된 값은 NaN"""
+    lons, lats = convert_naver_mapcoords_to_wgs84_array(["1270284390", "", None], ["374977110", "1", "2"])
+    assert lons[0] == 127.0284390 and lats[0] == 37.4977110
+    assert np.isnan(lons[1]) and np.isnan(lons[2])
+
+
+def test_stream_nearby_buildings_summary_matches(mock_naver_api):
+    """스트리밍 응답의 마지막 요약이 일반 응답과 같은지 확인"""
+    building_service.clear_caches()
+
+    async def collect():
+        return [event async for event in building_service.stream_nearby_buildings(37.498095, 127.027610)]
+
+    events = asyncio.run(collect())
+    expected = asyncio.run(building_service.fetch_nearby_buildings(37.498095, 127.027610))
+
+    assert events[0]["event"] == "address"
+    assert [e["event"] for e in events[1:-1]] == ["category"] * len(settings.TARGET_CATEGORIES)
+    summary = events[-1]
+    assert summary.pop("event") == "summary"
+    assert summary == expected
+
+
+def test_prepare_address_frame(tmp_path):
+    """address CSV 전처리: 결측치 처리, 일괄 좌표 변환, (지번, 도로명) 중복 제거"""
+    csv_path = tmp_path / "address.csv"
+    csv_path.write_text(
+        "landlot_address,road_name_address,x,y\n"
+        "수원시 영통동 1106,영통로200번길 21,205071.1185,415862.7636\n"
+        "수원시 영통동 1106,영통로200번길 21,205071.1185,415862.7636\n"
+        "수원시 서둔동,,,\n",
+        encoding="utf-8-sig")
+
+    df = prepare_address_frame(str(csv_path))
+    assert list(df.columns) == ["landlot_address", "road_name_address", "x", "y"]
+    assert len(df) == 2
+    assert 126 < df.iloc[0]["x"] < 128 and 37 < df.iloc[0]["y"] < 38
+    assert df.iloc[1]["road_name_address"] == "비어있음"
+    assert (df.iloc[1]["x"], df.iloc[1]["y"]) == (-1.0, -1.0)
+
+
+def test_token_bucket_allows_burst_then_limits_rate():
+    """버킷 크기만큼은 바로 통과하고, 그 뒤로는 rate(초당 토큰)에 맞춰 대기"""
+    with pytest.raises(ValueError):
+        TokenBucket(0)
+
+    async def run():
+        bucket = TokenBucket(rate=20, capacity=2)
+        started = time.monotonic()
+        await bucket.acquire()
+        await bucket.acquire()
+        burst = time.monotonic() - started
+        await asyncio.gather(*(bucket.acquire() for _ in range(2)))
+        return burst, time.monotonic() - started
+
+    burst, total = asyncio.run(run())
+    assert burst < 0.02
+    # 토큰 2개를 더 얻으려면 2 / 20 = 0.1초
+    assert 0.09 <= total < 0.5
+
+
+def _mock_backfill(monkeypatch, rows, geocode, write):
+    monkeypatch.setattr(settings, "BACKFILL_BATCH_SIZE", 2)
+    monkeypatch.setattr(settings, "BACKFILL_CONCURRENCY", 4)
+
+    async def fake_rows():
+        return rows
+
+    async def fake_changed():
+        pass
+
+    monkeypatch.setattr(db_service, "_missing_coordinate_rows", fake_rows)
+    monkeypatch.setattr(db_service, "get_coordinates_from_address", geocode)
+    monkeypatch.setattr(db_service, "_write_backfill_batch", write)
+    monkeypatch.setattr(db_service, "_on_address_changed", fake_changed)
+
+
+def test_fill_missing_coordinates_writes_geocoded_batches(monkeypatch):
+    """병렬로 지오코딩한 결과를 BACKFILL_BATCH_SIZE 묶음으로 모두 반영하고, 실패한 주소는 제외"""
+    rows = [(f"주소{i}", f"도로명{i}") for i in range(9)]
+    written = []
+
+    async def fake_geocode(address):
+        await asyncio.sleep(0)
+        return None if address == "주소4" else (127.0, 37.0)
+
+    async def fake_write(batch):
+        assert len(batch) <= 2
+        written.extend(batch)
+
+    _mock_backfill(monkeypatch, rows, fake_geocode, fake_write)
+    asyncio.run(db_service.fill_missing_coordinates())
+
+    assert sorted(item[0] for item in written) == sorted(f"주소{i}" for i in range(9) if i != 4)
+    progress = db_service.backfill_progress
+    assert (progress["done"], progress["updated"], progress["failed"]) == (9, 8, 1)
+    assert not progress["running"]
+
+
+def test_fill_missing_coordinates_stops_workers_on_write_failure(monkeypatch):
+    """UPDATE가 실패하면 나머지 작업을 취소해 지오코딩을 멈추고, 실패한 묶음은 버리지 않고 다시 반영 시도"""
+    rows = [(f"주소{i}", None) for i in range(100)]
+    geocoded, attempts = [], []
+
+    async def fake_geocode(address):
+        geocoded.append(address)
+        await asyncio.sleep(0.001)
+        return (127.0, 37.0)
+
+    async def fake_write(batch):
+        attempts.append(list(batch))
+        raise RuntimeError("DB 연결 끊김")
+
+    _mock_backfill(monkeypatch, rows, fake_geocode, fake_write)
+    asyncio.run(db_service.fill_missing_coordinates())
+
+    assert len(geocoded) < len(rows)
+    # 마지막 재시도에는 앞에서 반영하지 못한 묶음이 모두 포함
+    failed = {tuple(item) for batch in attempts[:-1] for item in batch}
+    assert failed and failed <= {tuple(item) for item in attempts[-1]}
+    assert not db_service.backfill_progress["running"]
+
+
+def test_tile_validation_and_tolerance():
+    """타일 좌표 범위 검사 및 줌 레벨별 단순화 오차"""
+    assert tile_service.is_valid_tile(0, 0, 0)
+    assert tile_service.is_valid_tile(14, 13970, 6344)
+    assert not tile_service.is_valid_tile(1, 2, 0)
+    assert not tile_service.is_valid_tile(-1, 0, 0)
+    assert not tile_service.is_valid_tile(settings.TILE_MAX_ZOOM + 1, 0, 0)
+    # 줌이 1 올라가면 허용 오차는 절반
+    assert math.isclose(tile_service.simplify_tolerance(15) * 2, tile_service.simplify_tolerance(14))
+
+
+def test_tile_cache_coalesces_and_invalidates(monkeypatch):
+    """같은 타일 동시 요청은 한 번만 생성하고, 무효화 후에는 다시 생성"""
+    calls = []
+
+    async def fake_render(z, x, y):
+        calls.append((z, x, y))
+        await asyncio.sleep(0.01)
+        return b"tile"
+
+    monkeypatch.setattr(tile_service, "_render_tile", fake_render)
+    tile_service.invalidate()
+
+    async def run():
+        tiles = await asyncio.gather(*[tile_service.get_tile(14, 1, 2) for _ in range(5)])
+        assert tiles == [b"tile"] * 5
+        assert len(calls) == 1
+        await tile_service.get_tile(14, 1, 2)
+        assert len(calls) == 1
+        tile_service.invalidate()
+        await tile_service.get_tile(14, 1, 2)
+        assert len(calls) == 2
+
+    asyncio.run(run())
+
+
+def test_tile_follower_survives_cancelled_leader(monkeypatch):
+    """타일을 생성하던 요청이 취소되어도 같은 타일을 기다리던 요청은 멈추지 않고 다시 생성"""
+    calls = []
+
+    async def fake_render(z, x, y):
+        calls.append((z, x, y))
+        if len(calls) == 1:
+            await asyncio.Event().wait()  # 첫 요청은 취소될 때까지 대기
+        return b"tile"
+
+    monkeypatch.setattr(tile_service, "_render_tile", fake_render)
+    tile_service.invalidate()
+
+    async def run():
+        leader = asyncio.create_task(tile_service.get_tile(14, 3, 4))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(tile_service.get_tile(14, 3, 4))
+        await asyncio.sleep(0)
+        leader.cancel()
+        assert await asyncio.wait_for(follower, timeout=1) == b"tile"
+        assert leader.cancelled()
+        assert len(calls) == 2
+
+    asyncio.run(run())
+
+
+def test_zone_index_polygons_bbox_and_lod():
+    """bbox와 겹치는 구역만 반환하고, 허용 오차에 맞는 단순화 단계를 선택"""
+    # 꼭짓점이 많은 원형 구역(반경 약 100m)과 멀리 떨어진 사각형 구역
+    circle = Point(127.0, 37.5).buffer(0.001, quad_segs=64)
+    rows = [(1, "원형", shapely.to_wkb(circle)), (2, "사각형", shapely.to_wkb(box(127.1, 37.6, 127.101, 37.601)))]
+    index = build_index(rows)
+
+    ids, polygons, level = index.polygons(bbox=(126.99, 37.49, 127.01, 37.51))
+    assert ids == [1]
+    assert level == 0.0
+    assert len(polygons[0]) == 1
+    assert len(polygons[0][0]) == len(circle.exterior.coords)
+
+    # 허용 오차가 커질수록 꼭짓점 수가 줄어듦
+    _, coarse, coarse_level = index.polygons(bbox=(126.99, 37.49, 127.01, 37.51), tolerance_meter=20.0)
+    assert coarse_level == 16.0
+    assert 4 <= len(coarse[0][0]) < len(polygons[0][0])
+
+    ids, _, _ = index.polygons()
+    assert ids == [1, 2]
+    assert tolerance_for_zoom(12) > tolerance_for_zoom(16)
+
+
+def test_coverage_incremental_matches_full_union():
+    """구역 추가/삭제로 갱신한 합집합이 전체 재계산 결과와 같음"""
+    zones = [box(0, 0, 2, 2), box(1, 1, 3, 3), box(2.5, 0, 4, 1), box(10, 10, 11, 11)]
+
+    coverage = compute_coverage(zones[:3])
+    assert coverage.geom_type == "MultiPolygon"
+    assert len(coverage.geoms) == 1
+
+    added = add_geometry(coverage, zones[3])
+    assert added.equals(compute_coverage(zones))
+    assert len(added.geoms) == 2
+
+    # 겹치는 구역(1번)을 빼도 나머지 구역과 겹치던 부분은 유지
+    removed = replace_geometries(added, [], [zones[1]], [zones[0], zones[2], zones[3]])
+    expected = compute_coverage([zones[0], zones[2], zones[3]])
+    assert removed.symmetric_difference(expected).area < 1e-9
+
+    # CSV 변경분: 1번 구역을 다른 다각형으로 교체 (남은 구역은 변경 후 인덱스에서 조회)
+    replacement = box(1.5, 1.5, 2.5, 2.5)
+    after = [zones[0], zones[2], zones[3], replacement]
+    index = build_index([(i, "구역", g.wkb) for i, g in enumerate(after)])
+    updated = _apply_changes(added, index, [replacement], [zones[1]])
+    assert updated.symmetric_difference(compute_coverage(after)).area < 1e-9
+
+
+def test_coverage_load_checks_zone_hash_not_count(monkeypatch):
+    """저장된 합집합은 구역 수가 아니라 구역 geometry 해시가 같을 때만 사용"""
+    zones = [box(0, 0, 1, 1), box(2, 2, 3, 3)]
+    stored_hash = coverage_service.zone_hash(zones)
+    rebuilt = []
+
+    async def fake_load_from_db():
+        return (coverage_service.compute_coverage(zones).wkb, len(zones), stored_hash)
+
+    async def fake_rebuild():
+        rebuilt.append(1)
+
+    for name in ("_coverage", "_zone_count", "_zone_hash", "_updated_at"):
+        monkeypatch.setattr(coverage_service, name, getattr(coverage_service, name))
+    monkeypatch.setattr(coverage_service, "_load_from_db", fake_load_from_db)
+    monkeypatch.setattr(coverage_service, "rebuild", fake_rebuild)
+    # 해시는 순서와 무관하고, 더하고 빼서 갱신한 값이 전체 계산과 같음
+    assert coverage_service.zone_hash(zones[::-1]) == stored_hash
+    assert coverage_service.zone_hash([zones[1]], coverage_service.zone_hash(zones[:1])) == stored_hash
+
+    monkeypatch.setattr(zone_index, "_index", build_index([(i, "구역", g.wkb) for i, g in enumerate(zones)]))
+    asyncio.run(coverage_service.load())
+    assert rebuilt == [] and coverage_service.contains(0.5, 0.5)
+
+    # 구역 수는 같지만 한 구역이 바뀐 경우
+    moved = [zones[0], box(5, 5, 6, 6)]
+    monkeypatch.setattr(zone_index, "_index", build_index([(i, "구역", g.wkb) for i, g in enumerate(moved)]))
+    asyncio.run(coverage_service.load())
+    assert rebuilt == [1]
+
+
+def test_eligibility_verdict_and_cell_cache(monkeypatch):
+    """제한 구역/최소 거리 판정 이유를 구조화해서 반환하고, 같은 격자 셀은 소매점 후보만 캐시 재사용 (판정은 요청 좌표 기준)"""
+    calls = []
+
+    async def fake_zones(latitude, longitude):
+        return [7] if longitude < 126.99992 else []
+
+    async def fake_candidates(latitude, longitude, radius_meter=None):
+        calls.append((latitude, longitude, radius_meter))
+        return [
+            {"landlot_address": "가까운 곳", "road_name_address": None, "x": 126.9999, "y": 37.5002,
+             "distance_meter": 0.0},
+            {"landlot_address": "먼 곳", "road_name_address": None, "x": 126.9999, "y": 37.502,
+             "distance_meter": 0.0},
+        ]
+
+    monkeypatch.setattr(eligibility_service, "_zones_at", fake_zones)
+    monkeypatch.setattr(eligibility_service, "_candidate_retailers", fake_candidates)
+    eligibility_service.invalidate()
+
+    verdict = asyncio.run(eligibility_service.check_location(37.50001, 126.99991))
+    assert not verdict["eligible"]
+    assert [reason["code"] for reason in verdict["reasons"]] == ["RESTRICTED_ZONE", "TOO_CLOSE_TO_RETAILER"]
+    assert verdict["reasons"][0]["zone_ids"] == [7]
+    assert [item["landlot_address"] for item in verdict["reasons"][1]["retailers"]] == ["가까운 곳"]
+    assert verdict["distance_mode"] == "straight"
+    # 요청 좌표를 그대로 돌려주고, 거리도 요청 좌표 기준
+    assert (verdict["latitude"], verdict["longitude"]) == (37.50001, 126.99991)
+    expected = distances_from_point(37.50001, 126.99991, 37.5002, 126.9999)
+    assert verdict["nearest_retailers"][0]["distance_meter"] == round(float(expected), 1)
+    # 후보는 셀 안 어느 좌표든 덮도록 최소 거리보다 넓은 반경으로 조회
+    assert calls[0][2] > settings.ELIGIBILITY_MIN_DISTANCE_METER
+
+    # 같은 셀의 다른 좌표는 후보를 다시 조회하지 않지만, 구역 판정은 그 좌표 기준
+    other = asyncio.run(eligibility_service.check_location(37.50008, 126.99998))
+    assert len(calls) == 1
+    assert [reason["code"] for reason in other["reasons"]] == ["TOO_CLOSE_TO_RETAILER"]
+    assert (other["latitude"], other["longitude"]) == (37.50008, 126.99998)
+    assert other["nearest_retailers"][0]["distance_meter"] < verdict["nearest_retailers"][0]["distance_meter"]
+
+
+def test_eligibility_distance_mode_without_nearby_retailers(monkeypatch):
+    """최소 거리 안쪽에 소매점이 없으면 도보 거리를 계산하지 않으므로 distance_mode는 walking이 아님"""
+    async def no_zones(latitude, longitude):
+        return []
+
+    async def no_candidates(latitude, longitude, radius_meter=None):
+        return []
+
+    monkeypatch.setattr(eligibility_service, "_zones_at", no_zones)
+    monkeypatch.setattr(isochrone_engine, "is_graph_loaded", lambda: True)
+
+    far_candidates = [{"landlot_address": "먼 곳", "road_name_address": None, "x": 127.0, "y": 37.51,
+                       "distance_meter": 0.0}]
+    far = asyncio.run(eligibility_service.evaluate(37.5, 127.0, far_candidates))
+    assert far["eligible"] and far["distance_mode"] == "straight"
+
+    monkeypatch.setattr(eligibility_service, "_candidate_retailers", no_candidates)
+    empty = asyncio.run(eligibility_service.evaluate(37.5, 127.0))
+    assert empty["eligible"] and empty["distance_mode"] is None
+    assert empty["nearest_retailers"] == []
+
+
+def test_retailer_index_knn_matches_brute_force():
+    """KD-tree 최근접 조회 결과가 전체 거리 계산 결과와 같음"""
+    rng = np.random.default_rng(0)
+    lons = 127.0 + rng.random(500) * 0.05
+    lats = 37.5 + rng.random(500) * 0.05
+    rows = [(f"주소{i}", None, lon, lat) for i, (lon, lat) in enumerate(zip(lons, lats))]
+    index = retailer_index.build_index(rows)
+
+    nearest = index.nearest(127.02, 37.52, k=3)
+    brute = np.argsort(distances_from_point(37.52, 127.02, lats, lons))[:3]
+    assert [item["landlot_address"] for item in nearest] == [f"주소{i}" for i in brute]
+    # EPSG:5179 거리와 Haversine 거리 차이는 1% 미만
+    expected = distances_from_point(37.52, 127.02, lats[brute[0]], lons[brute[0]])
+    assert abs(nearest[0]["distance_meter"] - expected) / expected < 0.01
+
+    # 일괄 조회는 단건 조회와 같은 결과, max_distance 밖은 제외
+    distances, indices = index.query_many([127.02, 127.03], [37.52, 37.53], k=3)
+    assert indices[0].tolist() == brute.tolist()
+    assert index.nearest(127.5, 37.9, k=3, max_distance=100.0) == []
+
+    # 반경 안의 모든 소매점 + 최근접 k개
+    candidates = index.candidates(127.02, 37.52, k=1, radius=300.0)
+    within = int((distances_from_point(37.52, 127.02, lats, lons) < 299.0).sum())
+    assert len(candidates) >= max(within, 1)
+    assert candidates == sorted(candidates, key=lambda item: item["distance_meter"])
+
+
+def test_retailer_index_first_load_is_shared(monkeypatch):
+    """인덱스가 없을 때 동시에 들어온 요청은 소매점 전체 로드를 한 번만 실행"""
+    calls = []
+
+    async def fake_load_rows():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return [("주소", None, 127.0, 37.5)]
+
+    monkeypatch.setattr(retailer_index, "_load_rows", fake_load_rows)
+    monkeypatch.setattr(retailer_index, "_index", None)
+
+    async def run():
+        await asyncio.gather(*(retailer_index.ensure_loaded() for _ in range(5)))
+        await retailer_index.ensure_loaded()
+
+    asyncio.run(run())
+    assert len(calls) == 1
+    assert len(retailer_index.get_index()) == 1
+    assert retailer_index._loading is None
+
+
+def test_site_finder_matches_grid_search():
+    """quadtree 탐색 1위가 최소 셀 중심 전체를 계산한 최고 점수와 같고, 후보는 모두 입점 가능"""
+    rng = np.random.default_rng(1)
+    lons = 127.0 + rng.random(200) * 0.02
+    lats = 37.5 + rng.random(200) * 0.02
+    index = retailer_index.build_index([(f"주소{i}", None, x, y) for i, (x, y) in enumerate(zip(lons, lats))])
+    coverage = coverage_service.compute_coverage([box(127.005, 37.505, 127.012, 37.512)])
+    region = box(127.0, 37.5, 127.02, 37.52)
+
+    search = site_finder.SiteSearch(region, coverage, index, limit=5, resolution=20.0, min_separation=100.0,
+                                    distance_weight=0.5, density_weight=0.5)
+    results = search.run()
+    evaluated = search.points_evaluated
+    assert len(results) == 5
+    assert [item["score"] for item in results] == sorted((item["score"] for item in results), reverse=True)
+
+    # 같은 최소 셀 격자(영역 왼쪽 아래 모서리 기준) 전체를 직접 평가
+    minx, miny, maxx, maxy = search.region_metric.bounds
+    grid_x, grid_y = (a.ravel() for a in np.meshgrid(np.arange(minx + 10.0, maxx, 20.0),
+                                                     np.arange(miny + 10.0, maxy, 20.0)))
+    _, _, scores, _, _ = search._evaluate(grid_x, grid_y)
+    assert results[0]["score"] == round(float(scores.max()), 4)
+    assert evaluated < len(grid_x) / 10
+
+    for item in results:
+        assert not coverage.contains(Point(item["x"], item["y"]))
+        assert item["nearest_retailer_meter"] >= 50.0
+    metric = site_finder.to_metric(MultiPoint([(item["x"], item["y"]) for item in results]))
+    points = np.array([(p.x, p.y) for p in metric.geoms])
+    gaps = np.hypot(*(points[:, None, :] - points[None, :, :]).transpose(2, 0, 1))
+    assert gaps[np.triu_indices(len(points), 1)].min() >= 99.0
+
+
+def test_streaming_encoding_and_framing():
+    """Accept-Encoding 협상과 JSON 배열/NDJSON 조립, gzip 스트림 압축"""
+    assert streaming.negotiate_encoding("gzip, deflate") == "gzip"
+    assert streaming.negotiate_encoding("gzip;q=0, identity") is None
+    assert streaming.negotiate_encoding("") is None
+
+    async def segments(fmt):
+        for batch in ([{"x": 1}], [], [{"x": 2}, {"x": 3}]):
+            yield streaming.join_items(batch, fmt)
+
+    async def collect(chunks):
+        return b"".join([chunk async for chunk in chunks])
+
+    body = asyncio.run(collect(streaming.frame(segments("json"), "json")))
+    assert json.loads(body) == [{"x": 1}, {"x": 2}, {"x": 3}]
+    lines = asyncio.run(collect(streaming.frame(segments("ndjson"), "ndjson"))).splitlines()
+    assert [json.loads(line) for line in lines] == [{"x": 1}, {"x": 2}, {"x": 3}]
+
+    compressed = asyncio.run(collect(streaming.compress(streaming.frame(segments("json"), "json"), "gzip")))
+    assert gzip.decompress(compressed) == body
+    assert json.loads(asyncio.run(collect(streaming.frame(segments("json"), "json", b'{"a":[', b"]}")))) == {
+        "a": [{"x": 1}, {"x": 2}, {"x": 3}]}
+
+
+def test_change_page_merge_does_not_skip_revisions():
+    """데이터셋별 변경 목록이 limit에서 잘릴 때, 가장 이른 잘린 지점까지만 한 페이지로 반환"""
+    sources = {
+        "zones": [(r, 0, None) for r in (3, 5, 9)],
+        "addresses": [(r, 0, None) for r in (4, 6, 7)],
+        "zones:deleted": [(8, {"id": 1})],
+    }
+    revision, has_more = merge_page(2, sources, limit=3, current=20)
+    assert (revision, has_more) == (7, True)
+    assert [row[0] for row in sources["zones"]] == [3, 5]
+    assert [row[0] for row in sources["addresses"]] == [4, 6, 7]
+    assert sources["zones:deleted"] == []
+
+    # 잘린 목록이 없으면 현재 최대 revision까지 받은 것
+    assert merge_page(7, {"zones": [(9, 0, None)]}, limit=3, current=12) == (12, False)
+    assert merge_page(7, {"zones": []}, limit=3, current=None) == (7, False)
+
+
+def test_metrics_cache_collector_and_tracked_executor():
+    """캐시 적중률은 수집 시점에 읽고, 앱이 만든 실행기는 끝나지 않은 작업 수를 직접 셈"""
+    cache = LRUCache(maxsize=2)
+    cache.set("k", 1)
+    cache.get("k")
+    cache.get("missing")
+    metrics.register_cache("test_cache", cache)
+
+    lines = metrics.render().decode().splitlines()
+    assert 'cache_hit_ratio{cache="test_cache"} 0.5' in lines
+    assert 'cache_hits_total{cache="test_cache"} 1.0' in lines
+
+    release = threading.Event()
+    def pending():
+        return REGISTRY.get_sample_value("executor_pending_tasks", {"executor": "test_pool"})
+
+    with metrics.TrackedThreadPoolExecutor("test_pool", max_workers=1) as executor:
+        futures = [executor.submit(release.wait) for _ in range(3)]
+        assert pending() == 3
+        release.set()
+        for future in futures:
+            future.result()
+    assert pending() == 0
+    assert 'executor_workers{executor="test_pool"} 1.0' in metrics.render().decode().splitlines()
+
+
+def test_log_json_format_and_debug_sampling():
+    """JSON 로그에 extra 필드 포함, DEBUG 로그는 모듈별 비율로 솎아냄 (INFO 이상은 그대로)"""
+    record = logging.LogRecord("app.services.naver_api", logging.INFO, __file__, 10,
+                               "검색 성공: %s건", (3,), None)
+    record.query = "역삼동 카페"
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "app.services.naver_api"
+    assert entry["message"] == "검색 성공: 3건"
+    assert entry["query"] == "역삼동 카페"
+
+    sampler = SamplingFilter({"app.services": 0.25, "app.services.zone_job": 0.0}, default=1.0)
+    def passed(name, level, n=8):
+        return sum(sampler.filter(logging.LogRecord(name, level, __file__, 20, "m", (), None)) for _ in range(n))
+
+    assert passed("app.services.naver_api", logging.DEBUG) == 2
+    assert passed("app.services.naver_api", logging.INFO) == 8
+    assert passed("app.services.zone_job", logging.DEBUG) == 0
+    assert passed("app.api.building", logging.DEBUG) == 8
+
+
+def test_benchmarks_smoke_and_regression_check():
+    """벤치마크가 모두 실행되고(가장 작은 입력), 기준값 대비 배율로 성능 저하를 판정"""
+    names = runner.smoke()
+    assert "geo.calculate_distance" in names
+    assert any(name.startswith("loaders.address_ingest") for name in names)
+
+    baseline = {"a": {"median": 1.2, "best": 1.0}}
+    assert runner.compare("a", {"median": 1.5, "best": 1.2}, baseline, 1.3) == ("ok", 1.2)
+    assert runner.compare("a", {"median": 2.0, "best": 1.5}, baseline, 1.3)[0] == "REGRESSION"
+    assert runner.compare("a", {"median": 0.5, "best": 0.5}, baseline, 1.3)[0] == "faster"
+    assert runner.compare("b", {"median": 1.0, "best": 1.0}, baseline, 1.3) == ("new", None)
+
+
+def test_zone_diff_keeps_polygons_sharing_an_address():
+    """한 지번주소의 제한 구역 둘이 모두 유지되고, 그중 하나만 바뀌면 그 행만 삭제 + 추가"""
+    def zone_row(address, polygon):
+        return {
+            "landlot_address": address,
+            "centroid_x": polygon.centroid.x,
+            "centroid_y": polygon.centroid.y,
+            "polygon_geom": polygon.wkt,
+            "vertices": json.dumps(list(polygon.exterior.coords)),
+        }
+
+    address = "경기도 수원시 권선구 권선동"
+    west = box(127.0280, 37.2525, 127.0290, 37.2535)
+    east = box(127.0300, 37.2525, 127.0310, 37.2535)
+    other = box(127.1, 37.3, 127.101, 37.301)
+    rows = [zone_row(address, west), zone_row(address, east), zone_row("다른 주소", other)]
+    keys = [record[5] for record in db_service._zone_records(pd.DataFrame(rows, columns=db_service.ZONE_COLUMNS))]
+    assert len(set(keys)) == 3
+
+    # 빈 테이블: 같은 주소의 두 구역 모두 추가
+    assert db_service.diff_zone_rows([], keys) == ([], [0, 1, 2])
+    # 그대로 다시 적재: 변경 없음
+    current = [(10, keys[0]), (11, keys[1]), (12, keys[2])]
+    assert db_service.diff_zone_rows(current, keys) == ([], [])
+
+    # 같은 주소의 동쪽 구역만 바뀜: 그 행만 삭제(id 11) + 새 행 추가(위치 1), 서쪽 구역(id 10)은 유지
+    moved = box(127.0300, 37.2540, 127.0310, 37.2550)
+    rows[1] = zone_row(address, moved)
+    new_keys = [record[5] for record in
+                db_service._zone_records(pd.DataFrame(rows, columns=db_service.ZONE_COLUMNS))]
+    assert new_keys[0] == keys[0] and new_keys[1] != keys[1]
+    assert db_service.diff_zone_rows(current, new_keys) == ([11], [1])
+
+    # 완전히 같은 행이 두 번 있으면 두 행 모두 유지
+    assert db_service.diff_zone_rows([(10, keys[0])], [keys[0], keys[0]]) == ([], [1])
+    assert db_service.diff_zone_rows([(10, keys[0]), (13, keys[0])], [keys[0]]) == ([13], [])
+
+
+def test_zone_row_key_matches_db_values():
+    """DB에서 읽은 값(WKB, JSONB 텍스트)으로 만든 키가 CSV 값으로 만든 키와 같음 (예전 행 키 채우기)"""
+    polygon = box(127.0280, 37.2525, 127.0290, 37.2535)
+    vertices = list(polygon.exterior.coords)
+    from_csv = db_service.zone_row_key("주소", polygon.centroid.x, polygon.centroid.y,
+                                       polygon.wkt, json.dumps(vertices))
+    from_db = db_service.zone_row_key("주소", polygon.centroid.x, polygon.centroid.y,
+                                      shapely.to_wkb(polygon), json.dumps(vertices, indent=1))
+    assert from_csv == from_db
+    assert from_csv != db_service.zone_row_key("다른 주소", polygon.centroid.x, polygon.centroid.y,
+                                               polygon.wkt, json.dumps(vertices))
+
+
+def test_zone_job_id_rejects_paths_and_is_unique():
+    """job_id에 경로 문자가 들어가면 거부, 새 job_id는 같은 초에 만들어도 겹치지 않음"""
+    for job_id in ("x/../../../tmp/evil", "..", "a b"):
+        with pytest.raises(ValueError):
+            zone_job.job_csv_path(job_id)
+        with pytest.raises(ValueError):
+            zone_job.start_zone_job(job_id)
+    assert zone_job.job_csv_path("20240101_120000_ab12").endswith("restricted_zone_20240101_120000_ab12.csv")
+
+    ids = {zone_job.new_job_id() for _ in range(100)}
+    assert len(ids) == 100
+    assert all(zone_job.JOB_ID_PATTERN.fullmatch(job_id) for job_id in ids)
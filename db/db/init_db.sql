@@ -15,13 +15,119 @@ CREATE INDEX IF NOT EXISTS idx_address_geom ON public.address USING GIST (geom);
 
 -- 3. impossible 테이블 생성
 CREATE TABLE IF NOT EXISTS public.impossible (
+  id BIGSERIAL PRIMARY KEY,
   landlot_address VARCHAR(500) NOT NULL,
   centroid_x DOUBLE PRECISION,
   centroid_y DOUBLE PRECISION,
   polygon_geom geometry(Polygon, 4326),
-  vertices JSONB
+  vertices JSONB,
+  row_key TEXT                            -- 행 식별 키: 주소 + 구역 내용 해시 (같은 주소의 구역 구분)
 );
 
 CREATE INDEX IF NOT EXISTS idx_impossible_geom ON public.impossible USING GIST (polygon_geom);
+CREATE INDEX IF NOT EXISTS idx_impossible_row_key ON public.impossible (row_key);
 
+-- 4. 지오코딩 캐시 테이블 (정규화된 주소 -> 좌표, found=false는 결과 없음 캐시)
+CREATE TABLE IF NOT EXISTS public.geocode_cache (
+  address_key TEXT PRIMARY KEY,
+  found BOOLEAN NOT NULL,
+  x DOUBLE PRECISION,
+  y DOUBLE PRECISION,
+  expires_at TIMESTAMPTZ NOT NULL,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- 5. 데이터 적재 이력 (원본 CSV 지문이 같으면 앱 시작 시 적재를 건너뜀)
+CREATE TABLE IF NOT EXISTS public.dataset_meta (
+  name TEXT PRIMARY KEY,
+  fingerprint TEXT NOT NULL,
+  row_count BIGINT,
+  loaded_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- 6. 제한 구역 전체 합집합 (겹치는 구역을 하나로 합친 MultiPolygon, 단일 행)
+CREATE TABLE IF NOT EXISTS public.impossible_coverage (
+  id SMALLINT PRIMARY KEY CHECK (id = 1),
+  geom geometry(MultiPolygon, 4326) NOT NULL,
+  zone_count INTEGER NOT NULL,
+  zone_hash TEXT,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- 7. 데이터셋 버전 (제한 구역/소매점 데이터가 바뀔 때마다 증가, 응답 ETag에 사용)
+CREATE TABLE IF NOT EXISTS public.dataset_version (
+  name TEXT PRIMARY KEY,
+  version BIGINT NOT NULL,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- 8. 행 단위 변경 추적 (/changes 델타 동기화)
+-- INSERT/UPDATE마다 전역 시퀀스에서 revision을 받고, DELETE는 deleted_rows에 키를 남김
+-- 쓰기 문장마다 advisory lock을 먼저 잡아 revision 순서와 커밋 순서를 맞춤
+CREATE SEQUENCE IF NOT EXISTS public.data_revision_seq;
+
+CREATE TABLE IF NOT EXISTS public.deleted_rows (
+  table_name TEXT NOT NULL,
+  row_key JSONB NOT NULL,
+  revision BIGINT NOT NULL DEFAULT nextval('data_revision_seq'),
+  deleted_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_deleted_rows_revision ON public.deleted_rows (table_name, revision);
+
+-- 이 revision 이전의 변경 이력은 남아 있지 않음 (삭제 기록 정리, 테이블 재생성)
+CREATE TABLE IF NOT EXISTS public.change_horizon (
+  id SMALLINT PRIMARY KEY CHECK (id = 1),
+  revision BIGINT NOT NULL,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE OR REPLACE FUNCTION lock_data_revision() RETURNS trigger AS $$
+BEGIN
+  PERFORM pg_advisory_xact_lock(hashtext('data_revision_seq'));
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION set_row_revision() RETURNS trigger AS $$
+BEGIN
+  NEW.revision := nextval('data_revision_seq');
+  IF TG_OP = 'INSERT' THEN
+    NEW.created_revision := NEW.revision;
+  END IF;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION record_row_deletion() RETURNS trigger AS $$
+DECLARE
+  row_key JSONB := '{}'::jsonb;
+  col TEXT;
+BEGIN
+  FOREACH col IN ARRAY TG_ARGV LOOP
+    row_key := row_key || jsonb_build_object(col, to_jsonb(OLD) -> col);
+  END LOOP;
+  INSERT INTO deleted_rows (table_name, row_key) VALUES (TG_TABLE_NAME, row_key);
+  RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+ALTER TABLE public.address ADD COLUMN IF NOT EXISTS revision BIGINT NOT NULL DEFAULT nextval('data_revision_seq');
+ALTER TABLE public.address ADD COLUMN IF NOT EXISTS created_revision BIGINT NOT NULL DEFAULT 0;
+CREATE INDEX IF NOT EXISTS idx_address_revision ON public.address (revision);
+CREATE OR REPLACE TRIGGER address_revision_lock BEFORE INSERT OR UPDATE OR DELETE ON public.address
+  FOR EACH STATEMENT EXECUTE FUNCTION lock_data_revision();
+CREATE OR REPLACE TRIGGER address_revision BEFORE INSERT OR UPDATE ON public.address
+  FOR EACH ROW EXECUTE FUNCTION set_row_revision();
+CREATE OR REPLACE TRIGGER address_tombstone AFTER DELETE ON public.address
+  FOR EACH ROW EXECUTE FUNCTION record_row_deletion('landlot_address', 'road_name_address');
 
+ALTER TABLE public.impossible ADD COLUMN IF NOT EXISTS revision BIGINT NOT NULL DEFAULT nextval('data_revision_seq');
+ALTER TABLE public.impossible ADD COLUMN IF NOT EXISTS created_revision BIGINT NOT NULL DEFAULT 0;
+CREATE INDEX IF NOT EXISTS idx_impossible_revision ON public.impossible (revision);
+CREATE OR REPLACE TRIGGER impossible_revision_lock BEFORE INSERT OR UPDATE OR DELETE ON public.impossible
+  FOR EACH STATEMENT EXECUTE FUNCTION lock_data_revision();
+CREATE OR REPLACE TRIGGER impossible_revision BEFORE INSERT OR UPDATE ON public.impossible
+  FOR EACH ROW EXECUTE FUNCTION set_row_revision();
+CREATE OR REPLACE TRIGGER impossible_tombstone AFTER DELETE ON public.impossible
+  FOR EACH ROW EXECUTE FUNCTION record_row_deletion('id', 'row_key');
@@ -236,14 +236,11 @@ async function loadPolygons() {
         if (!response.ok) return;
         const data = await response.json();
         
-        if (data.polygons && Array.isArray(data.polygons)) {
+        if (data.zones && Array.isArray(data.zones)) {
             let allPaths = []; // 모든 경로를 여기에 모음 (하나의 배열로 합치기)
 
-            data.polygons.forEach(rawData => {
-                let pathData = rawData;
-                if (typeof rawData === 'string') {
-                    try { pathData = JSON.parse(rawData); } catch (e) { return; }
-                }
+            // 구역 하나에 외곽선(parts)이 여러 개일 수 있음 (MultiPolygon)
+            data.zones.forEach(zone => (zone.parts || []).forEach(pathData => {
                 if (!Array.isArray(pathData)) return;
                 
                 // 좌표 변환
@@ -256,7 +253,7 @@ async function loadPolygons() {
                 if (path.length >= 3) {
                     allPaths.push(path); // 개별 다각형 경로를 전체 배열에 추가
                 }
-            });
+            }));
 
             // 네이버 지도 공식 기능: paths에 '배열의 배열'을 넣으면 멀티 폴리곤이 됨
             // 중요: window.onload에서 주입한 'fill-rule: nonzero' CSS 덕분에 구멍이 안 뚫림